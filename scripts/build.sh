@@ -4,6 +4,9 @@ pyinstaller \
     -c -F \
     -i "../assets/icon.ico" \
     -n "pfg" \
+    --paths "src" \
+    --collect-submodules "commands" \
+    --collect-submodules "handlers" \
     --specpath "build" \
     --distpath "build" \
     --workpath "build" \
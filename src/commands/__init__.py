@@ -1,16 +1,17 @@
-"""Contains all commands that can be executed by this tool."""
-from typing import Callable
-from . import help, generate, update, path, clean, watch, publish
-from .generate import NAME as DEFAULT_COMMAND_NAME
+"""Contains all commands that can be executed by this tool.
+Commands are only imported once they're requested, so running one doesn't load the dependencies of the rest."""
+import importlib
+from typing import Callable, Mapping
+from utils import LazyMapping
 
-type Command = Callable[[str, list[str]], None]
+type Command = Callable[[list[str]], None]
 
-COMMANDS: dict[str, Command] = {
-    generate.NAME: generate.execute,
-    help.NAME: help.execute,
-    update.NAME: update.execute,
-    path.NAME: path.execute,
-    clean.NAME: clean.execute,
-    watch.NAME: watch.execute,
-    publish.NAME: publish.execute,
-}
\ No newline at end of file
+DEFAULT_COMMAND_NAME = "generate"
+
+def _get_command(module_name: str):
+    return lambda: importlib.import_module(f".{module_name}", __name__).execute
+
+# every command is named after the module it's implemented in
+COMMANDS: Mapping[str, Command] = LazyMapping({
+    name: _get_command(name)
+    for name in [ "generate", "help", "update", "path", "clean", "watch", "publish", "serve", "client" ] })
\ No newline at end of file
@@ -0,0 +1,12 @@
+import sys, server
+
+NAME = "client"
+
+def execute(args: list[str]):
+    """Sends the arguments of a `-generate` command to a process running the `-serve` command, and writes its output.
+    A port can be passed first via `--port N`, which must be the same one passed to `-serve`."""
+    (port, args) = server.split_port(args)
+    (output, exit_code) = server.send(port, args)
+    sys.stdout.write(output)
+    if exit_code != 0:
+        sys.exit(exit_code)
@@ -1,6 +1,8 @@
-import console
-from core import Delimiter, ExpectedError, Filter, Block
-from handlers import HANDLERS
+import console, os, json, web, memo, profiler, utils
+from typing import Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core import Delimiter, ExpectedError, Filter, Block, FILE_ENCODING
+from handlers import HANDLERS, Handler, Context
 
 NAME = "generate"
 
@@ -8,10 +10,44 @@ _APPLYING_HANDLER_MESSAGE = "Applying {0}..."
 _SAVING_FILTER_MESSAGE = "Saving filter..."
 _READING_FILTER_MESSAGE = "Reading filter file from '{0}'..."
 _FILTER_SAVED_MESSAGE = "Filter saved to '{0}'."
+_FILTER_UNCHANGED_MESSAGE = "Filter at '{0}' is unchanged, so it wasn't rewritten."
+
+_FILTER_CACHE_DIRS = ("cache", "filters")
+
+_MANIFEST_OPTION = "--manifest"
+_JOBS_OPTION = "--jobs"
+_PROFILE_OPTION = "--profile"
+_REPORT_EXTENSION = ".json"
+_MANIFEST_INPUT_FIELD = "input"
+_MANIFEST_OUTPUTS_FIELD = "outputs"
+_MANIFEST_PATH_FIELD = "path"
+_MANIFEST_HANDLERS_FIELD = "handlers"
+
+_PARSE_STEP = "parse"
+_SAVE_STEP = "save"
+_EXTRACT_STEP = "Block.extract"
+_CONTEXT_STEP = Delimiter.HANDLER_START + "{0} initialize_context"
+_HANDLE_STEP = Delimiter.HANDLER_START + "{0} handle"
+_BLOCKS_COUNTER = "blocks read"
+_LINES_COUNTER = "lines read"
+_MEMO_HITS_COUNTER = "memo hits"
 
 _HANDLER_NOT_FOUND_ERROR = "Handler '{0}' was not found."
 _HANDLER_NOT_PROVIDED_ERROR = "No handlers were provided. You must provide at least one handler to modify your filter file."
 _TOO_LITTLE_ARGUMENTS_ERROR = "Too little arguments were provided. At least a path to a filter file and a handler to use are expected."
+_MANIFEST_ARGUMENT_COUNT_ERROR = "The " + _MANIFEST_OPTION + " option expects the path to the manifest file, optionally followed by " + _JOBS_OPTION + " and the amount of processes to use."
+_INVALID_JOBS_ERROR = "The " + _JOBS_OPTION + " option expects a positive whole number, but '{0}' was provided."
+_MANIFEST_NOT_FOUND_ERROR = "The manifest file '{0}' was not found."
+_INVALID_MANIFEST_ERROR = """The manifest file '{0}' is not valid. It must be a JSON object with the following format:
+
+{{
+    "input": "path/to/input.filter",
+    "outputs": [
+        {{ "path": "path/to/output.filter", "handlers": [ ".handler1", "option1", ".handler2" ] }}
+    ]
+}}"""
+
+_worker_filter: Filter = None
 
 class _HandlerInvocation:
     def __init__(self, handler_name: str):
@@ -27,6 +63,12 @@ class _Params:
         self.output_filepath = output_filepath
         self.invocations = invocations
 
+class _InvocationNode:
+    def __init__(self, invocation: _HandlerInvocation = None):
+        self.invocation = invocation
+        self.output_filepaths: list[str] = []
+        self.children: dict[str, _InvocationNode] = {}
+
 def execute(args: list[str]):
     """Applies handlers to `.filter` files and writes the output to a new file.
     Arguments, listed in the order expected:
@@ -34,20 +76,50 @@ def execute(args: list[str]):
     - the path where the output should be placed. If none, then the input filepath is used instead.
     - a list of handlers with their respective options (i.e. `.handler1 option1 option2 .handler2 option3 ...`).
         These handlers will be applied to the input filter in regular reading order.
+    
+    Alternatively, `--manifest path/to/manifest.json` generates every output listed in the manifest in a single run.
+    Handler chains that start the same way are only applied once, before branching out to each output.
+    Adding `--jobs N` afterwards generates the branches in up to `N` processes at the same time.
+
+    Starting with `--profile`, optionally followed by the path to a `.json` file, reports the time spent on each step
+    of the generation as a table, and saves the same report to that file if provided.
     """
-    params = _create_params(args)
+    if len(args) == 0 or args[0] != _PROFILE_OPTION:
+        return _generate(args)
     
-    console.write(_READING_FILTER_MESSAGE.format(params.input_filepath))
-    filter = Filter.load(params.input_filepath)
+    (report_filepath, args) = _split_report_filepath(args[1:])
+    profiler.start()
+    try:
+        _generate(args)
+        profiler.stop()
+        profiler.write_report()
+        if report_filepath != None:
+            profiler.save_report(report_filepath)
+    finally:
+        profiler.stop()
 
-    for invocation in params.invocations:
-        console.write(_APPLYING_HANDLER_MESSAGE.format(invocation))
-        filter = _generate_filter(filter, invocation.handler_name, invocation.options)
+def _split_report_filepath(args: list[str]):
+    if len(args) > 0 and args[0].endswith(_REPORT_EXTENSION):
+        return (args[0], args[1:])
+    return (None, args)
+
+def _generate(args: list[str]):
+    if len(args) > 0 and args[0] == _MANIFEST_OPTION:
+        _generate_from_manifest(args[1:])
+        memo.save()
+        return
+
+    params = _create_params(args)
+    groups = _group_invocations(params.invocations)
     
-    console.write(_SAVING_FILTER_MESSAGE)
-    filter.save(params.output_filepath)
+    console.write(_READING_FILTER_MESSAGE.format(params.input_filepath))
+    if _can_stream(groups):
+        changed = _stream_filter(params, groups[0])
+    else:
+        changed = _generate_and_save_filter(params, groups)
+    memo.save()
 
-    console.write(_FILTER_SAVED_MESSAGE.format(params.output_filepath), done=True)
+    _write_saved_message(params.output_filepath, changed)
 
 def _create_params(args: list[str]):
     if len(args) < 2:
@@ -64,6 +136,153 @@ def _create_params(args: list[str]):
     
     return _Params(input_filepath, output_filepath, invocations)
 
+def _generate_from_manifest(args: list[str]):
+    (manifest_filepath, jobs) = _get_manifest_args(args)
+    params = _create_manifest_params(manifest_filepath)
+    tree = _create_invocation_tree(params)
+
+    console.write(_READING_FILTER_MESSAGE.format(params[0].input_filepath))
+    filter = _load_filter(params[0].input_filepath)
+    if jobs > 1:
+        _generate_tree_in_parallel(filter, tree, jobs)
+    else:
+        _generate_tree(filter, tree)
+
+def _get_manifest_args(args: list[str]):
+    if len(args) == 1:
+        return (args[0], 1)
+    if len(args) != 3 or args[1] != _JOBS_OPTION:
+        raise ExpectedError(_MANIFEST_ARGUMENT_COUNT_ERROR)
+    if not args[2].isdecimal() or int(args[2]) == 0:
+        raise ExpectedError(_INVALID_JOBS_ERROR.format(args[2]))
+    return (args[0], int(args[2]))
+
+def _create_manifest_params(manifest_filepath: str):
+    try:
+        with open(manifest_filepath, "r", encoding=FILE_ENCODING) as file:
+            manifest = json.load(file)
+    except FileNotFoundError as error:
+        raise ExpectedError(_MANIFEST_NOT_FOUND_ERROR.format(manifest_filepath)) from error
+    except ValueError as error:
+        raise ExpectedError(_INVALID_MANIFEST_ERROR.format(manifest_filepath)) from error
+    
+    try:
+        # paths in the manifest are relative to the manifest itself
+        directory = os.path.dirname(manifest_filepath)
+        input_filepath = os.path.join(directory, manifest[_MANIFEST_INPUT_FIELD])
+        params = [ _create_params([
+                input_filepath,
+                os.path.join(directory, output[_MANIFEST_PATH_FIELD]) ] + output[_MANIFEST_HANDLERS_FIELD])
+            for output in manifest[_MANIFEST_OUTPUTS_FIELD] ]
+    except (KeyError, TypeError, AttributeError) as error:
+        raise ExpectedError(_INVALID_MANIFEST_ERROR.format(manifest_filepath)) from error
+    
+    if len(params) == 0:
+        raise ExpectedError(_INVALID_MANIFEST_ERROR.format(manifest_filepath))
+    return params
+
+def _create_invocation_tree(params: list[_Params]):
+    root = _InvocationNode()
+    for param in params:
+        node = root
+        for invocation in param.invocations:
+            _ = _get_handler(invocation.handler_name)
+            node = node.children.setdefault(str(invocation), _InvocationNode(invocation))
+        node.output_filepaths += [ param.output_filepath ]
+    return root
+
+def _generate_tree(filter: Filter, node: _InvocationNode, quiet: bool = False) -> dict[str, bool]:
+    changes_by_filepath = _save_outputs(filter, node, quiet)
+    children = list(node.children.values())
+    for index, child in enumerate(children):
+        # handlers modify the lines they receive, so every branch but the last works on its own copy
+        branch_filter = filter if index == len(children) - 1 else filter.copy()
+        (branch_filter, child) = _generate_branch(branch_filter, child, quiet)
+        changes_by_filepath.update(_generate_tree(branch_filter, child, quiet))
+    return changes_by_filepath
+
+def _generate_tree_in_parallel(filter: Filter, node: _InvocationNode, jobs: int):
+    # the part of the tree shared by every output is generated here, and every branch after it by a worker
+    _save_outputs(filter, node)
+    children = list(node.children.values())
+    if len(children) == 0:
+        return
+    if len(children) == 1:
+        (filter, child) = _generate_branch(filter, children[0])
+        return _generate_tree_in_parallel(filter, child, jobs)
+    
+    _initialize_branch_contexts(filter, node)
+    initargs = (filter, web.get_memory_cache())
+    with ProcessPoolExecutor(min(jobs, len(children)), initializer=_initialize_worker, initargs=initargs) as executor:
+        futures = [ executor.submit(_generate_tree_in_worker, child) for child in children ]
+        try:
+            for future in as_completed(futures):
+                (changes_by_filepath, memo_entries) = future.result()
+                memo.add_entries(memo_entries)
+                for output_filepath, changed in changes_by_filepath.items():
+                    _write_saved_message(output_filepath, changed)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+def _initialize_branch_contexts(filter: Filter, node: _InvocationNode):
+    # contexts of per-block handlers only look at the rules of the filter, and request the web data those need while
+    # initializing (.econ does so), so it's requested once here and shared with every worker through the memory cache
+    invocations = { str(invocation): invocation for invocation in _get_descendant_invocations(node) }
+    for invocation in invocations.values():
+        handler = _get_handler(invocation.handler_name)
+        if handler.is_per_block:
+            with profiler.measure(_CONTEXT_STEP.format(invocation.handler_name)):
+                _ = handler.initialize_context(filter, invocation.options)
+
+def _get_descendant_invocations(node: _InvocationNode) -> Iterable[_HandlerInvocation]:
+    for child in node.children.values():
+        yield child.invocation
+        yield from _get_descendant_invocations(child)
+
+def _initialize_worker(filter: Filter, memory_cache: dict[str, str | dict | list]):
+    global _worker_filter
+    _worker_filter = filter
+    web.load_memory_cache(memory_cache)
+
+def _generate_tree_in_worker(node: _InvocationNode):
+    # a worker can generate many branches, so each one starts from a copy of the filter
+    (filter, child) = _generate_branch(_worker_filter.copy(), node, quiet=True)
+    changes_by_filepath = _generate_tree(filter, child, quiet=True)
+    return (changes_by_filepath, memo.get_added_entries())
+
+def _save_outputs(filter: Filter, node: _InvocationNode, quiet: bool = False):
+    changes_by_filepath: dict[str, bool] = {}
+    for output_filepath in node.output_filepaths:
+        if not quiet:
+            console.write(_SAVING_FILTER_MESSAGE)
+        with profiler.measure(_SAVE_STEP):
+            changes_by_filepath[output_filepath] = filter.save(output_filepath)
+        if not quiet:
+            _write_saved_message(output_filepath, changes_by_filepath[output_filepath])
+    return changes_by_filepath
+
+def _write_saved_message(output_filepath: str, changed: bool):
+    message = _FILTER_SAVED_MESSAGE if changed else _FILTER_UNCHANGED_MESSAGE
+    console.write(message.format(output_filepath), done=True)
+
+def _generate_branch(filter: Filter, node: _InvocationNode, quiet: bool = False):
+    (invocations, node) = _get_invocation_chain(node)
+    for group in _group_invocations(invocations):
+        if not quiet:
+            for invocation in group:
+                console.write(_APPLYING_HANDLER_MESSAGE.format(invocation))
+        filter = _generate_filter(filter, group)
+    return (filter, node)
+
+def _get_invocation_chain(node: _InvocationNode):
+    invocations = [ node.invocation ]
+    while len(node.children) == 1 and len(node.output_filepaths) == 0:
+        node = next(iter(node.children.values()))
+        invocations += [ node.invocation ]
+    return (invocations, node)
+
 def _create_invocations(raw_args: list[str]):
     invocations: list[_HandlerInvocation] = []
     for arg in raw_args:
@@ -73,14 +292,109 @@ def _create_invocations(raw_args: list[str]):
             invocations[-1].options += [ arg ]
     return invocations
 
-def _generate_filter(filter: Filter, handler_name: str, options: list[str]):
+def _group_invocations(invocations: list[_HandlerInvocation]):
+    groups: list[list[_HandlerInvocation]] = []
+    for invocation in invocations:
+        if _is_per_block(invocation) and len(groups) > 0 and _is_per_block(groups[-1][-1]):
+            groups[-1] += [ invocation ]
+        else:
+            groups += [ [ invocation ] ]
+    return groups
+
+def _is_per_block(invocation: _HandlerInvocation):
+    return _get_handler(invocation.handler_name).is_per_block
+
+def _get_handler(handler_name: str):
     if handler_name not in HANDLERS:
         raise ExpectedError(_HANDLER_NOT_FOUND_ERROR.format(handler_name))
+    return HANDLERS[handler_name]
+
+def _can_stream(groups: list[list[_HandlerInvocation]]):
+    # outputs replace their file once fully written, so the input can be read while its own output is written
+    return len(groups) == 1 and _is_per_block(groups[0][0])
+
+def _stream_filter(params: _Params, invocations: list[_HandlerInvocation]):
+    # per-block handlers never look at the filter's blocks, at most at their own rules while initializing their context,
+    # so only the lines with those rules are read up front and the rest is read and written one block at a time
+    with profiler.measure(_PARSE_STEP):
+        filter = Filter.load_rules(params.input_filepath, [ invocation.handler_name for invocation in invocations ])
+    blocks = profiler.measure_iterator(_PARSE_STEP, Filter.read_blocks(params.input_filepath))
+    if profiler.is_started():
+        blocks = _count_blocks(blocks)
+
+    for invocation in invocations:
+        console.write(_APPLYING_HANDLER_MESSAGE.format(invocation))
+    blocks = _generate_blocks(filter, invocations, blocks)
+
+    console.write(_SAVING_FILTER_MESSAGE)
+    with profiler.measure(_SAVE_STEP):
+        return Filter.write_blocks(params.output_filepath, blocks)
+
+def _count_blocks(blocks: Iterable[Block]):
+    for block in blocks:
+        profiler.count(_BLOCKS_COUNTER)
+        profiler.count(_LINES_COUNTER, len(block.lines))
+        yield block
+
+def _load_filter(filepath: str):
+    with profiler.measure(_PARSE_STEP):
+        filter = Filter.load(filepath, utils.get_execution_dir(*_FILTER_CACHE_DIRS))
+    if profiler.is_started():
+        for _ in _count_blocks(filter.blocks):
+            pass
+    return filter
+
+def _generate_and_save_filter(params: _Params, groups: list[list[_HandlerInvocation]]):
+    filter = _load_filter(params.input_filepath)
+
+    for invocations in groups:
+        for invocation in invocations:
+            console.write(_APPLYING_HANDLER_MESSAGE.format(invocation))
+        filter = _generate_filter(filter, invocations)
+    
+    console.write(_SAVING_FILTER_MESSAGE)
+    with profiler.measure(_SAVE_STEP):
+        return filter.save(params.output_filepath)
+
+def _generate_filter(filter: Filter, invocations: list[_HandlerInvocation]):
+    blocks = _generate_blocks(filter, invocations, filter.blocks)
+    return Filter(filter.filepath, list(blocks))
+
+def _generate_blocks(filter: Filter, invocations: list[_HandlerInvocation], blocks: Iterable[Block]):
+    for invocation in invocations:
+        handler = _get_handler(invocation.handler_name)
+        with profiler.measure(_CONTEXT_STEP.format(invocation.handler_name)):
+            context = handler.initialize_context(filter, invocation.options)
+        blocks = _apply_handler(invocation, handler, context, blocks)
+    return blocks
+
+def _apply_handler(invocation: _HandlerInvocation, handler: Handler, context: Context, blocks: Iterable[Block]):
+    handle_step = _HANDLE_STEP.format(invocation.handler_name)
+    generated_raw_lines = ( line
+        for block in blocks
+        for line in _measure_handle(handle_step, invocation, handler, context, block) )
+    return profiler.measure_iterator(_EXTRACT_STEP, Block.stream(generated_raw_lines))
+
+def _measure_handle(step: str, invocation: _HandlerInvocation, handler: Handler, context: Context, block: Block):
+    with profiler.measure(step):
+        return _handle(invocation, handler, context, block)
+
+def _handle(invocation: _HandlerInvocation, handler: Handler, context: Context, block: Block):
+    if not handler.is_memoized or invocation.handler_name not in block.get_rule_names():
+        return handler.handle(block, context)
+    
+    key = memo.get_key(str(invocation), block, context.get_memo_key())
+    if (lines := memo.try_get(key)) != None:
+        profiler.count(_MEMO_HITS_COUNTER)
+        return lines
     
-    handler = HANDLERS[handler_name]
-    context = handler.initialize_context(filter, options)
-    generated_raw_lines = [ line
-        for block in filter.blocks
-        for line in handler.handle(block, context) ]
+    web.start_tracking()
+    try:
+        lines = handler.handle(block, context)
+    finally:
+        versions = web.stop_tracking()
 
-    return Filter(filter.filepath, Block.extract(generated_raw_lines))
\ No newline at end of file
+    # output generated from web items which aren't cached on disk can't be checked for changes later on
+    if None not in versions.values():
+        memo.add(key, [ str(line) for line in lines ], versions)
+    return lines
\ No newline at end of file
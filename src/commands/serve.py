@@ -0,0 +1,32 @@
+import console, server, web
+from . import generate
+from core import ERROR_EXIT_CODE, Delimiter, ExpectedError
+
+NAME = "serve"
+
+_SERVING_MESSAGE = "Serving " + Delimiter.COMMAND_START + generate.NAME + " requests on port {0}. Press [cyan]CTRL+C[/] to stop."
+_STOPPED_MESSAGE = "Server stopped."
+
+_TOO_MANY_ARGS_ERROR = "The " + Delimiter.COMMAND_START + NAME + " command only accepts a port via --port N. You've also provided '{0}'."
+
+def execute(args: list[str]):
+    """Keeps a process running which executes the `-generate` requests sent by the `-client` command.
+    Data downloaded from the web and parsed files are kept in memory between requests.
+    A port can be passed via `--port N`, which must be the same one passed to `-client`."""
+    (port, args) = server.split_port(args)
+    if len(args) > 0:
+        raise ExpectedError(_TOO_MANY_ARGS_ERROR.format(" ".join(args)))
+    console.write(_SERVING_MESSAGE.format(port))
+    server.serve(port, _generate)
+    console.write(_STOPPED_MESSAGE, done=True)
+
+def _generate(args: list[str]):
+    web.remove_stale_items()
+    with console.capture() as capture:
+        try:
+            generate.execute(args)
+            exit_code = 0
+        except Exception as error:
+            console.err(error)
+            exit_code = ERROR_EXIT_CODE
+    return (capture.get(), exit_code)
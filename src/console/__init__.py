@@ -1,2 +1,2 @@
 """Exposes functions related to interacting with the console."""
-from .functions import write, err
\ No newline at end of file
+from .functions import write, write_table, err, capture
\ No newline at end of file
@@ -1,7 +1,6 @@
 import traceback, re
 from core import ExpectedError, Delimiter, DEFAULT_WIKI_PAGE_NAME as _DEFAULT_HINT_TERM
 from rich.console import Console
-from rich.markdown import Markdown
 
 _DONE_MESSAGE = "[green]Done![/]"
 _EXPECTED_ERROR_TEMPLATE = "[red]ERROR[/]: {0}"
@@ -35,6 +34,19 @@ def write(*values, markdown: bool = False, done: bool = False):
         values = (_DONE_MESSAGE, ) + values
     _CONSOLE.print(*values, end="\n\n")
 
+def write_table(headers: list[str], rows: list[list[str]]):
+    """Writes a table to the stdout with the `headers` as its columns and a row for each list of values in `rows`."""
+    from rich.table import Table # imported here because it's only needed when profiling
+    table = Table(*headers)
+    for row in rows:
+        table.add_row(*row)
+    write(table)
+
+def capture():
+    """Returns a context manager that captures everything written to the console while it's active instead of writing it.
+    The text captured can be obtained by calling `get` on the object it returns when entered."""
+    return _CONSOLE.capture()
+
 def err(exception: Exception):
     """Writes the `exception` passed in to the console.
     - If `exception` is NOT an `ExpectedError` then a preamble is written
@@ -50,6 +62,7 @@ def err(exception: Exception):
     write(_create_hint(exception))
 
 def _create_markdown(*values):
+    from rich.markdown import Markdown # imported here because it's slow to import and seldom used
     text = "".join(str(value) for value in values)
     return Markdown(text)
 
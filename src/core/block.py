@@ -1,31 +1,46 @@
+from typing import Generator, Iterable
 from .line import Line
+from .rule import Rule
 from .sieve import Sieve
 from .constants import Operand, Operator
 
 class Block:
     """A block is a collection of lines (strings) in a filter, which may include rules in them."""
+    __slots__ = ("line_number", "lines", "_filter", "_rules", "_rules_by_name", "_sieve")
 
     def __init__(self, line_number: int):
         self.line_number: int = line_number
         self.lines: list[Line] = []
+        self._filter = None
+        self._invalidate_rules()
+        self._invalidate_sieve()
 
     @classmethod
-    def extract(cls, raw_lines: list[str], line_number: int = 1):
-        """Returns all blocks in a from a list of textual lines."""
-        if len(raw_lines) == 0:
-            return []
-        
-        blocks: list[Block] = [ Block(line_number) ]
+    def extract(cls, raw_lines: list[str | Line], line_number: int = 1):
+        """Returns all blocks in a from a list of textual lines.
+        `Line`s in the list are reused and renumbered instead of being parsed again,
+        so only lines passed in as text are parsed."""
+        return list(cls.stream(raw_lines, line_number))
+
+    @classmethod
+    def stream(cls, raw_lines: Iterable[str | Line], line_number: int = 1) -> Generator['Block', None, None]:
+        """Lazy version of `extract`, which yields every block as soon as it's complete.
+        A block is complete once the next block starter or the end of `raw_lines` is reached."""
+        block = Block(line_number)
+        block_ids = { id(block) }
         for raw_line in raw_lines:
         
-            line = Line(raw_line, line_number)
-            if line.is_block_starter() and len(blocks[-1].lines) > 0:
-                blocks.append(Block(line_number))
+            line = _get_line(raw_line, line_number, block_ids)
+            if line.is_block_starter() and len(block.lines) > 0:
+                yield block
+                block = Block(line_number)
+                block_ids.add(id(block))
 
-            blocks[-1].lines.append(line)
+            block._insert(len(block.lines), line)
             line_number += 1
         
-        return blocks
+        if len(block.lines) > 0:
+            yield block
 
     def hide(self):
         """Attempts to hide a block by setting every 'Show' operand in it to 'Hide'."""
@@ -61,18 +76,40 @@ class Block:
             line.values = values
 
     def get_rules(self, name_or_names: str | list[str]):
-        """Gets all the rules in the block with the `name_or_names` specified."""
-        return [ rule for line in self.lines for rule in line.get_rules(name_or_names) ]
+        """Gets all the rules in the block with the `name_or_names` specified.
+        Rules are indexed by name the first time they are requested, and the index is
+        updated whenever lines are inserted into the block or have their rules changed."""
+        if self._rules_by_name is None:
+            self._index_rules()
+        
+        if isinstance(name_or_names, str):
+            return list(self._rules_by_name.get(name_or_names, []))
+        return [ rule for rule in self._rules if rule.name in name_or_names ]
+
+    def get_rule_names(self):
+        """Gets the names of every rule in the block."""
+        if self._rules_by_name is None:
+            self._index_rules()
+        return self._rules_by_name.keys()
     
     def get_raw_lines(self):
         """Gets all lines listed within this block as raw strings."""
         return [ str(line) for line in self.lines ]
     
+    def copy(self):
+        """Returns a copy of the block and its lines which can be modified without affecting the original."""
+        block = Block(self.line_number)
+        for line in self.lines:
+            block._insert(len(block.lines), line.copy())
+        return block
+
     def get_sieve(self):
-        """Creates a `Sieve` from the lines within the block.
-        Lines without operands are excluded from it."""
-        sieveable_lines = [ line for line in self.lines if line.operand != "" ]
-        return Sieve(sieveable_lines)
+        """Gets a `Sieve` for the lines within the block. Lines without operands are excluded from it.
+        The sieve is reused until any of the lines in the block change or new ones are inserted."""
+        if self._sieve is None:
+            sieveable_lines = [ line for line in self.lines if line.operand != "" ]
+            self._sieve = Sieve(sieveable_lines)
+        return self._sieve
 
     def _find_lines(self, operand: Operand = None, operator: Operator = None) -> list[Line]:
         return [ line
@@ -83,7 +120,39 @@ class Block:
     def _insert_after_filter_info_lines(self, line: Line):
         filter_info_lines = (i + 1 for i, line in enumerate(self.lines) if line.has_filter_info())
         index = max(filter_info_lines, default=len(self.lines))
+        self._insert(index, line)
+
+    def _insert(self, index: int, line: Line):
+        line._block = self
         self.lines.insert(index, line)
+        self._invalidate_sieve()
+        if self._rules_by_name is not None and line.has_rules():
+            self._invalidate_rules()
+
+    def _index_rules(self):
+        self._rules: list[Rule] = [ rule for line in self.lines for rule in line.rules ]
+        self._rules_by_name: dict[str, list[Rule]] = {}
+        for rule in self._rules:
+            self._rules_by_name.setdefault(rule.name, []).append(rule)
+
+    def _invalidate_sieve(self):
+        self._sieve: Sieve | None = None
+
+    def _invalidate_rules(self):
+        self._rules: list[Rule] | None = None
+        self._rules_by_name: dict[str, list[Rule]] | None = None
+        if self._filter is not None:
+            self._filter._invalidate_rules()
 
     def __str__(self):
-        return '\n'.join(self.get_raw_lines())
\ No newline at end of file
+        return '\n'.join(self.get_raw_lines())
+
+def _get_line(raw_line: str | Line, line_number: int, block_ids: set[int]):
+    if not isinstance(raw_line, Line):
+        return Line(raw_line, line_number)
+    
+    # lines already placed in a block created alongside this one are copied, so blocks never share lines
+    is_line_placed = raw_line._block is not None and id(raw_line._block) in block_ids
+    line = raw_line.copy() if is_line_placed else raw_line
+    line.renumber(line_number)
+    return line
\ No newline at end of file
@@ -13,6 +13,10 @@ class ExpectedError(Exception):
         self.filepath = filepath
         self.line_number = line_number
     
+    def __reduce__(self):
+        # allows errors raised in other processes to be sent back with every field intact
+        return (ExpectedError, (self.message, self.line_number, self.filepath))
+
     def __str__(self):
         result = self.message
         result += "\n" if self.line_number or self.filepath else ""
@@ -1,50 +1,152 @@
-import os
+import os, hashlib, shutil
+from contextlib import contextmanager
+from typing import Generator, Iterable, TextIO
+from . import filter_cache
 from .expected_error import ExpectedError
 from .block import Block
-from .constants import FILE_ENCODING
+from .constants import FILE_ENCODING, Delimiter
 
 _FILE_EXISTS_ERROR = "The file path corresponds to an already existing file"
 _FILE_NOT_FOUND_ERROR = "The input file was not found"
 _PERMISSION_ERROR = "You don't have permission to read or write on this directory or file"
 
+_BLOCK_SEPARATOR = "\n"
+_WRITE_BUFFER_SIZE = 1024 * 1024
+_READ_CHUNK_SIZE = 1024 * 1024
+_TEMP_FILEPATH_TEMPLATE = "{0}.{1}.tmp" # the process id keeps workers writing the same file from clashing
+
 class Filter:
     """The Filter class is a representation of a .filter file."""
     def __init__(self, filepath: str, blocks: list[Block]):
         self.filepath: str = filepath
         self.blocks: list[Block] = blocks
+        self._block_indices_by_rule_name: dict[str, list[int]] | None = None
+        for block in blocks:
+            block._filter = self
 
     @classmethod
-    def load(cls, filepath: str):
-        """Creates a new Filter objects from a `.filter` file."""
-        blocks = _get_blocks(filepath)
-        return Filter(filepath, blocks)
+    def load(cls, filepath: str, cache_dir: str = None):
+        """Creates a new Filter objects from a `.filter` file.
+        If a `cache_dir` is provided, the parsed lines are cached in it and reused instead of parsing the file again until it changes."""
+        if cache_dir is None:
+            return Filter(filepath, list(Filter.read_blocks(filepath)))
+        with _reading_file(filepath):
+            return Filter(filepath, filter_cache.load(filepath, cache_dir))
 
-    def save(self, filepath: str):
-        """Saves the filter to the filepath received."""
-        self._create_directory(filepath)
-        block_texts = [ str(block) for block in self.blocks ]
-        self._write_filter(filepath, "\n".join(block_texts))
+    @classmethod
+    def load_rules(cls, filepath: str, rule_name_or_names: str | list[str]):
+        """Creates a new Filter from a `.filter` file with only the lines that have rules named as or included in
+        `rule_name_or_names`, each in a block of its own and with its line number in the file.
+        Every other line is skipped without being parsed, so this is much cheaper than `load` when only those rules are needed."""
+        names = [ rule_name_or_names ] if isinstance(rule_name_or_names, str) else rule_name_or_names
+        markers = [ Delimiter.RULE_SEPARATOR + name for name in names ]
+        with _reading_file(filepath):
+            with open(filepath, "r", encoding=FILE_ENCODING) as file:
+                blocks = [ block
+                    for line_number, raw_line in enumerate(file, 1) if any(marker in raw_line for marker in markers)
+                    for block in Block.stream([ raw_line ], line_number) ]
+        return Filter(filepath, blocks)
 
-    def _create_directory(self, filepath: str):
-        directory = os.path.dirname(filepath)
-        if directory != "":
-            os.makedirs(directory, exist_ok=True)
+    @staticmethod
+    def read_blocks(filepath: str) -> Generator[Block, None, None]:
+        """Lazily reads the blocks in a `.filter` file, yielding each one as soon as it's complete.
+        Only the block being read is kept in memory, and the file stays open until every block is read."""
+        with _reading_file(filepath):
+            with open(filepath, "r", encoding=FILE_ENCODING) as file:
+                yield from Block.stream(file)
 
-    def _write_filter(self, filepath: str, text: str):
+    @staticmethod
+    def write_blocks(filepath: str, blocks: Iterable[Block]):
+        """Writes the blocks to the filepath received one by one through a buffered writer, and returns whether the file changed.
+        `blocks` can be a generator, in which case only the block being written is kept in memory.
+        The blocks are written to a temporary file next to it, which then replaces it in a single step so it's never seen
+        partially written. If it already had the same contents it's left untouched, so programs watching it aren't notified needlessly."""
+        _create_directory(filepath)
+        temp_filepath = _TEMP_FILEPATH_TEMPLATE.format(filepath, os.getpid())
         try:
-            with open(filepath, "w", encoding=FILE_ENCODING) as file:
-                file.write(text)
+            with open(temp_filepath, "w", encoding=FILE_ENCODING, buffering=_WRITE_BUFFER_SIZE) as file:
+                (size, digest) = _write_blocks(file, blocks)
+            if _has_contents(filepath, size, digest):
+                return False
+            if os.path.isfile(filepath):
+                shutil.copymode(filepath, temp_filepath) # otherwise the file would lose its permissions once replaced
+            os.replace(temp_filepath, filepath)
+            return True
         except FileExistsError as error:
             raise ExpectedError(_FILE_EXISTS_ERROR, filepath=filepath) from error
         except PermissionError as error:
             raise ExpectedError(_PERMISSION_ERROR, filepath=filepath) from error
+        finally:
+            if os.path.isfile(temp_filepath):
+                os.remove(temp_filepath)
+
+    def get_rules(self, name_or_names: str | list[str]):
+        """Gets all the rules in the filter with the `name_or_names` specified, in the order they appear."""
+        return [ rule
+            for block in self.get_blocks(name_or_names)
+            for rule in block.get_rules(name_or_names) ]
+
+    def get_blocks(self, rule_name_or_names: str | list[str]):
+        """Gets every block in the filter with at least one rule named as or included in `rule_name_or_names`.
+        Blocks are indexed by the names of their rules the first time this is called,
+        so only the blocks which contain the rules are visited."""
+        if self._block_indices_by_rule_name is None:
+            self._index_rules()
+
+        names = [ rule_name_or_names ] if isinstance(rule_name_or_names, str) else rule_name_or_names
+        block_indices = { index for name in names for index in self._block_indices_by_rule_name.get(name, []) }
+        return [ self.blocks[index] for index in sorted(block_indices) ]
 
-def _get_blocks(filepath: str):
+    def copy(self):
+        """Returns a deep copy of the filter, whose blocks and lines can be modified without affecting the original."""
+        return Filter(self.filepath, [ block.copy() for block in self.blocks ])
+
+    def save(self, filepath: str):
+        """Saves the filter to the filepath received, unless it already has the same contents.
+        Returns whether the file changed."""
+        return Filter.write_blocks(filepath, self.blocks)
+
+    def _index_rules(self):
+        self._block_indices_by_rule_name: dict[str, list[int]] = {}
+        for index, block in enumerate(self.blocks):
+            for name in block.get_rule_names():
+                self._block_indices_by_rule_name.setdefault(name, []).append(index)
+
+    def _invalidate_rules(self):
+        self._block_indices_by_rule_name = None
+
+@contextmanager
+def _reading_file(filepath: str):
     try:
-        with open(filepath, "r", encoding=FILE_ENCODING) as file:
-            raw_lines = file.readlines()
-            return Block.extract(raw_lines)
+        yield
     except FileNotFoundError as error:
         raise ExpectedError(_FILE_NOT_FOUND_ERROR, filepath=filepath) from error
     except PermissionError as error:
-        raise ExpectedError(_PERMISSION_ERROR, filepath=filepath) from error
\ No newline at end of file
+        raise ExpectedError(_PERMISSION_ERROR, filepath=filepath) from error
+
+def _create_directory(filepath: str):
+    directory = os.path.dirname(filepath)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+
+def _has_contents(filepath: str, size: int, digest: bytes):
+    # sizes are compared first so files which obviously changed are never read
+    if not os.path.isfile(filepath) or os.path.getsize(filepath) != size:
+        return False
+    
+    file_digest = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        while chunk := file.read(_READ_CHUNK_SIZE):
+            file_digest.update(chunk)
+    return file_digest.digest() == digest
+
+def _write_blocks(file: TextIO, blocks: Iterable[Block]):
+    # the size and digest of the bytes written, after newlines are translated as the file does
+    (size, digest) = (0, hashlib.sha256())
+    for index, block in enumerate(blocks):
+        text = str(block) if index == 0 else _BLOCK_SEPARATOR + str(block)
+        file.write(text)
+        data = text.replace("\n", os.linesep).encode(FILE_ENCODING)
+        size += len(data)
+        digest.update(data)
+    return (size, digest.digest())
@@ -0,0 +1,73 @@
+import os, io, hashlib, marshal
+from .block import Block
+from .line import Line
+from .constants import FILE_ENCODING
+
+_FORMAT_VERSION = 1 # increase whenever the format of the cached rows changes
+_CACHE_FILE_EXTENSION = ".marshal"
+_TEMP_FILEPATH_TEMPLATE = "{0}.{1}.tmp" # the process id keeps workers writing the same file from clashing
+
+type _Row = tuple[str, str, str, tuple[str, ...], str]
+type _CacheEntry = tuple[int, int, int, bytes, list[list[_Row]]]
+
+def load(filepath: str, directory: str):
+    """Loads the blocks in the `.filter` file at `filepath`, reusing the parsed lines cached in `directory` if the file didn't change.
+    The file is considered unchanged if its size and modification time are the same, or if its contents hash the same."""
+    cache_filepath = _get_cache_filepath(filepath, directory)
+    stat = os.stat(filepath)
+    entry = _try_read_entry(cache_filepath)
+
+    if entry != None and entry[1:3] == (stat.st_size, stat.st_mtime_ns):
+        return _create_blocks(entry[4])
+    
+    with open(filepath, "rb") as file:
+        content = file.read()
+    digest = hashlib.sha256(content).digest()
+
+    if entry != None and entry[3] == digest:
+        rows = entry[4]
+        blocks = _create_blocks(rows)
+    else:
+        blocks = list(Block.stream(io.TextIOWrapper(io.BytesIO(content), encoding=FILE_ENCODING)))
+        rows = [ [ line._get_parts() for line in block.lines ] for block in blocks ]
+
+    _try_write_entry(cache_filepath, (_FORMAT_VERSION, stat.st_size, stat.st_mtime_ns, digest, rows))
+    return blocks
+
+def _get_cache_filepath(filepath: str, directory: str):
+    absolute_filepath = os.path.abspath(filepath)
+    filename = hashlib.sha256(absolute_filepath.encode()).hexdigest() + _CACHE_FILE_EXTENSION
+    return os.path.join(directory, filename)
+
+def _try_read_entry(cache_filepath: str) -> _CacheEntry | None:
+    try:
+        with open(cache_filepath, "rb") as file:
+            entry = marshal.loads(file.read()) # much faster than reading it with marshal.load
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return entry if isinstance(entry, tuple) and entry[0] == _FORMAT_VERSION else None
+
+def _try_write_entry(cache_filepath: str, entry: _CacheEntry):
+    # the cache only saves time, so failing to write it shouldn't stop the filter from loading
+    # it's written to a temporary file which then replaces it, so processes loading the same filter never read it partially written
+    temp_filepath = _TEMP_FILEPATH_TEMPLATE.format(cache_filepath, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache_filepath), exist_ok=True)
+        with open(temp_filepath, "wb") as file:
+            marshal.dump(entry, file)
+        os.replace(temp_filepath, cache_filepath)
+    except OSError:
+        pass
+    finally:
+        if os.path.isfile(temp_filepath):
+            os.remove(temp_filepath)
+
+def _create_blocks(rows: list[list[_Row]]):
+    blocks: list[Block] = []
+    line_number = 1
+    for block_rows in rows:
+        block = Block(line_number)
+        block.lines = [ Line._from_parts(row, line_number + index, block) for index, row in enumerate(block_rows) ]
+        line_number += len(block_rows)
+        blocks += [ block ]
+    return blocks
@@ -1,34 +1,89 @@
-import re
+import copy, sys
 from .rule import Rule
 from .expected_error import ExpectedError
 from .constants import Delimiter, BLOCK_STARTERS
 
 _MULTILINE_STRING_ERROR = "Multiline string"
 
-_INDENTATION_REGEX = "\\s*"
-_OPERAND_REGEX = f"[^\\s{Delimiter.COMMENT_START}]*"
-_VALUES_REGEX = f"[^{Delimiter.COMMENT_START}]+"
-_COMMENT_REGEX = f"{Delimiter.COMMENT_START}.*"
-_OPERATOR_REGEX = "[<|>|=|!]=?\\d*"
-_LINE_REGEX = f"^({_INDENTATION_REGEX})({_OPERAND_REGEX})\\s*({_OPERATOR_REGEX})?\\s*({_VALUES_REGEX})?({_COMMENT_REGEX})?$"
-_SINGLE_VALUE_REGEX = '"[^"]*"|-?\\w+'
+_OPERATOR_STARTS = "<|>=!"
+_OPERATOR_SUFFIX = "="
+_QUOTE = '"'
+_VALUE_PREFIX = "-"
+_WORD_SEPARATOR = "_"
+_NEW_LINE = "\n"
 
 class Line:
     """
     A Line represents a line of text inside a Block, which may include rules in it.
-    Rules are extracted upon creation.
+    Lines are parsed lazily: the parts of the line are extracted the first time any of them is accessed,
+    and rules are only extracted the first time they are needed.
     Multiline strings are not allowed as text.
     """
+    __slots__ = ("number", "_block", "_text", "_rules", "_indentation", "_operand", "_operator", "_values", "_comment")
+
     def __init__(self, text: str, number: int):
         """
         * `text`: the text in the line. Passing in a string with a new-line character raisesan error.
         * `number`: The line's number in a filter file.
         """
         text = text.rstrip()
-        if '\n' in text:
+        if _NEW_LINE in text:
             raise ExpectedError(_MULTILINE_STRING_ERROR, number)
         self.number: int = number
-        self._set_parts(text)
+        self._block = None
+        self._set_text(text)
+
+    @property
+    def indentation(self) -> str:
+        self._parse()
+        return self._indentation
+
+    @property
+    def operand(self) -> str:
+        self._parse()
+        return self._operand
+    
+    @operand.setter
+    def operand(self, operand: str):
+        self._parse()
+        self._operand = operand
+        self._notify_block()
+
+    @property
+    def operator(self) -> str:
+        self._parse()
+        return self._operator
+    
+    @operator.setter
+    def operator(self, operator: str):
+        self._parse()
+        self._operator = operator
+        self._notify_block()
+
+    @property
+    def values(self) -> list[str]:
+        self._parse()
+        return self._values
+    
+    @values.setter
+    def values(self, values: list[str]):
+        self._parse()
+        self._values = values
+        self._notify_block()
+
+    @property
+    def comment(self) -> str:
+        self._parse()
+        return self._comment
+
+    @property
+    def rules(self) -> list[Rule]:
+        if self._rules is None:
+            # rules can only be found in the comment, so the raw text can be checked without parsing it
+            text = self._text if self._text is not None else self.comment
+            self._rules = Rule.extract(self.number, self.comment) \
+                if Delimiter.RULE_START in text else []
+        return self._rules
 
     def is_block_starter(self):
         """Returns whether or not this line should start a new Block."""
@@ -58,23 +113,159 @@ class Line:
     
     def comment_out(self):
         """Comments the line out by prepending a `#.#` to the line's text."""
-        self._set_parts(Delimiter.COMMENT_RULE_START + " " + str(self))
+        self._set_text(Delimiter.COMMENT_RULE_START + " " + str(self))
+
+    def renumber(self, number: int):
+        """Sets the line's `number`, updating the line number of every rule in it as well."""
+        self.number = number
+        for rule in self._rules or []:
+            rule.line_number = number
+
+    def copy(self):
+        """Returns a copy of the line which can be modified without affecting the original."""
+        line = copy.copy(self)
+        if self._text is None:
+            line._values = list(self._values)
+        if self._rules is not None:
+            line._rules = [ copy.copy(rule) for rule in self._rules ]
+        return line
+
+    @classmethod
+    def _from_parts(cls, parts: tuple[str, str, str, tuple[str, ...], str], number: int, block):
+        line = cls.__new__(cls)
+        line.number = number
+        line._block = block
+        line._text = None
+        line._rules = None
+        (line._indentation, line._operand, line._operator, values, line._comment) = parts
+        line._values = list(values)
+        return line
+
+    def _get_parts(self):
+        self._parse()
+        return (self._indentation, self._operand, self._operator, tuple(self._values), self._comment)
 
     def __contains__(self, string: str):
         """Returns whether or not this line contains the string."""
         return string in str(self)
 
     def __str__(self):
+        if self._text is not None and _is_comment_or_empty(self._text):
+            return self._text
         values = " ".join(self.values)
         parts = [ self.operand, self.operator, values, self.comment ]
         parts = [ part for part in parts if part != "" ]
         return self.indentation + " ".join(parts)
     
+    def _set_text(self, text: str):
+        self._text: str | None = text
+        self._rules: list[Rule] | None = None
+        self._notify_block(rules_changed=True)
+
+    def _notify_block(self, rules_changed: bool = False):
+        if self._block is None:
+            return
+        self._block._invalidate_sieve()
+        if rules_changed:
+            self._block._invalidate_rules()
+
+    def _parse(self):
+        if self._text is None:
+            return
+        
+        if _is_comment_or_empty(self._text):
+            self._set_comment_parts(self._text)
+        else:
+            self._set_parts(self._text)
+        self._text = None
+
+    def _set_comment_parts(self, text: str):
+        self._comment: str = text.lstrip()
+        self._indentation: str = sys.intern(text[:len(text) - len(self._comment)])
+        self._operand: str = ""
+        self._operator: str = ""
+        self._values: list[str] = []
+
     def _set_parts(self, text: str):
-        parts = re.search(_LINE_REGEX, text).groups()
-        self.indentation: str = parts[0] or ""
-        self.operand: str = parts[1] or ""
-        self.operator: str = parts[2] or ""
-        self.values: list[str] = re.findall(_SINGLE_VALUE_REGEX, parts[3] or "")
-        self.comment: str = parts[4] or ""
-        self.rules: list[Rule] = Rule.extract(self.number, self.comment)
+        content = text.lstrip()
+        self._indentation: str = sys.intern(text[:len(text) - len(content)])
+
+        self._operand: str = sys.intern(content.split(maxsplit=1)[0].partition(Delimiter.COMMENT_START)[0])
+        content = content[len(self._operand):].lstrip()
+
+        operator_end = _get_operator_end(content)
+        self._operator: str = sys.intern(content[:operator_end])
+        content = content[operator_end:].lstrip()
+
+        values_text, comment_start, comment = content.partition(Delimiter.COMMENT_START)
+        self._values: list[str] = list(map(sys.intern, _get_values(values_text)))
+        self._comment: str = comment_start + comment
+
+def _is_comment_or_empty(text: str):
+    stripped_text = text.lstrip()
+    return stripped_text == "" or stripped_text.startswith(Delimiter.COMMENT_START)
+
+def _get_operator_end(text: str):
+    if text == "" or text[0] not in _OPERATOR_STARTS:
+        return 0
+    
+    index = 2 if text[1:2] == _OPERATOR_SUFFIX else 1
+    while index < len(text) and text[index].isdecimal():
+        index += 1
+    return index
+
+def _get_values(text: str):
+    """Splits the text into quoted strings and words (optionally prefixed by a `-`).
+    Any other characters are ignored. A quote which is never closed is ignored as well."""
+    if _QUOTE not in text:
+        return _get_words(text)
+    
+    segments = text.split(_QUOTE)
+    unquoted_tail = segments.pop() if len(segments) % 2 == 0 else ""
+    quoted_segments = segments[1::2]
+    unquoted_segments = segments[2::2]
+    values = _get_words(segments[0])
+
+    unquoted_text = "".join(unquoted_segments)
+    if unquoted_text == "" or unquoted_text.isspace():
+        values += _quote(quoted_segments)
+    else:
+        for quoted_segment, unquoted_segment in zip(quoted_segments, unquoted_segments):
+            values.append(_QUOTE + quoted_segment + _QUOTE)
+            values += _get_words(unquoted_segment)
+    
+    return values + _get_words(unquoted_tail)
+
+def _quote(segments: list[str]):
+    # lines never contain new-line characters, so they're safe to use as a separator
+    if len(segments) == 0:
+        return []
+    separator = _QUOTE + _NEW_LINE + _QUOTE
+    return (_QUOTE + separator.join(segments) + _QUOTE).split(_NEW_LINE)
+
+def _get_words(text: str):
+    words: list[str] = []
+    for word in text.split():
+        if _is_word(word.removeprefix(_VALUE_PREFIX)):
+            words.append(word)
+        else:
+            words += _get_subwords(word)
+    return words
+
+def _get_subwords(text: str):
+    subwords: list[str] = []
+    start = None
+    for index, character in enumerate(text):
+        if _is_word(character):
+            if start is None:
+                start = index - 1 if index > 0 and text[index - 1] == _VALUE_PREFIX else index
+        elif start is not None:
+            subwords.append(text[start:index])
+            start = None
+    
+    if start is not None:
+        subwords.append(text[start:])
+    return subwords
+
+def _is_word(text: str):
+    return text.replace(_WORD_SEPARATOR, "a").isalnum()
@@ -1,3 +1,4 @@
+import sys
 from .expected_error import ExpectedError
 from .constants import Delimiter
 
@@ -13,10 +14,12 @@ class Rule:
         * name: the name which identifies the rule.
         * description: any extra data needed for the rule. Can be omitted.
     """
+    __slots__ = ("line_number", "name", "description")
+
     def __init__(self, line_number: int, name: str, description: str):
         """Rule constructor which receives the line_number where the rule is found, the name which identifies the rule and its description optionally for any additional data."""
         self.line_number: int = line_number
-        self.name: str = name
+        self.name: str = sys.intern(name)
         self.description: str = description
     
     @classmethod
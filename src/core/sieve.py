@@ -1,4 +1,6 @@
-import builtins
+import operator
+from functools import partial
+from typing import Any, Callable
 from .constants import Operator
 from .expected_error import ExpectedError
 from .line import Line
@@ -10,55 +12,126 @@ _STR_OPERATOR_ERROR = "The operator '{0}' cannot be used to compare text."
 _INT_OPERATOR_ERROR = "The operator '{0}' cannot be used to compare numbers."
 _BOOL_OPERATOR_ERROR = "The operator '{0}' cannot be used to compare boolean values."
 
+# the line's value is passed in as the first argument, so the comparisons are flipped
+_INT_COMPARISONS: dict[str, Callable[[int, int], bool]] = {
+    Operator.GREATER_EQUALS: operator.le,
+    Operator.GREATER: operator.lt,
+    Operator.LESS_EQUALS: operator.ge,
+    Operator.LESS: operator.gt,
+    Operator.CONTAINS: operator.eq,
+    Operator.EQUALS: operator.eq,
+    "": operator.eq,
+    Operator.NOT_CONTAINS: operator.ne,
+    Operator.NOT_EQUALS: operator.ne,
+}
+
+type _Predicate = Callable[[Any], bool]
+type Pattern = dict[str, str | bool | int | None]
+type PatternColumns = dict[str, list[str | bool | int | None]]
+
+_MISSING_VALUE = object()
+
 class Sieve:
     """A Sieve receives a list of lines and allows checking if patterns are contained within them."""
     
     def __init__(self, lines: list[Line]):
-        self._lines_by_operand: dict[str, list[Line]] = {}
+        self._conditions_by_operand: dict[str, list[_Condition]] = {}
         for line in lines:
-            if line.operand not in self._lines_by_operand:
-                self._lines_by_operand[line.operand] = [ line ]
-            else:
-                self._lines_by_operand[line.operand].append(line)
+            self._conditions_by_operand.setdefault(line.operand, []).append(_Condition(line))
     
-    def __contains__(self, pattern: dict[str, str | bool | int | None]):
+    def filter(self, patterns: list[Pattern] | PatternColumns):
+        """Checks many patterns at once, returning a list which states whether or not each pattern is contained in the sieve.
+        Patterns can either be passed in as a list of dictionaries, or as columns: a dictionary of operands to equally long
+        lists of values, where the values at the same index in every list form a pattern.
+        Patterns are checked one operand at a time, so each line is compared against all values in bulk."""
+        columns = patterns if isinstance(patterns, dict) else self._get_columns(patterns)
+        pattern_count = len(patterns) if isinstance(patterns, list) else \
+            len(next(iter(columns.values()), []))
+        
+        # only the patterns which are still valid are checked against the next line
+        indices = range(pattern_count)
+        for operand, column in columns.items():
+            for condition in self._conditions_by_operand.get(operand, []):
+                results = condition.matches_all([ column[index] for index in indices ])
+                indices = [ index for index, is_valid in zip(indices, results) if is_valid ]
+        
+        mask = [ False ] * pattern_count
+        for index in indices:
+            mask[index] = True
+        return mask
+
+    def __contains__(self, pattern: Pattern):
         """Checks if a pattern, represented as a dictionary, is contained within the lines of this sieve."""
         for operand, value in pattern.items():
             if not self._is_value_valid(operand, value):
                 return False
         return True
 
+    def _get_columns(self, patterns: list[Pattern]):
+        operands = { operand: None
+            for pattern in patterns
+            for operand in pattern
+            if operand in self._conditions_by_operand }
+        return { operand: [ pattern.get(operand, _MISSING_VALUE) for pattern in patterns ]
+            for operand in operands }
+
     def _is_value_valid(self, operand: str, value: str | bool | int | None):
-        if operand not in self._lines_by_operand:
+        conditions = self._conditions_by_operand.get(operand)
+        if conditions is None:
             return True
 
-        for line in self._lines_by_operand[operand]:
+        return all(condition.matches(value) for condition in conditions)
 
-            if value is not None and line.values == []:
-                continue
-            if value is None and line.values != []:
-                return False
+class _Condition:
+    """A line compiled into predicates, one for each type of value it's checked against.
+    The line itself isn't kept, so sieves don't keep the blocks their lines belong to alive."""
+    __slots__ = ("has_values", "_predicates")
 
-            match type(value):
-                case builtins.bool if not _is_bool_value_valid(value, line):
-                    return False
-                case builtins.int if not _is_int_value_valid(value, line):
-                    return False
-                case builtins.str if not _is_str_value_valid(value, line):
-                    return False
+    def __init__(self, line: Line):
+        self.has_values = len(line.values) > 0
+        self._predicates = { value_type: _try_compile_predicate(compiler, line)
+            for value_type, compiler in _PREDICATE_COMPILERS.items() }
+    
+    def matches(self, value: str | bool | int | None):
+        if value is None:
+            return not self.has_values
+        if not self.has_values:
+            return True
+        
+        predicate = self._get_predicate(type(value))
+        return predicate is None or predicate(value)
 
-        return True
+    def matches_all(self, values: list[str | bool | int | None]):
+        value_types = set(map(type, values))
+        if self.has_values and len(value_types) == 1:
+            predicate = self._get_predicate(value_types.pop())
+            if predicate is not None:
+                return list(map(predicate, values))
+        return list(map(self.matches, values))
 
-def _is_bool_value_valid(value: bool, line: Line):
+    def _get_predicate(self, value_type: type) -> _Predicate | None:
+        return self._predicates.get(value_type)
+
+def _try_compile_predicate(compiler: Callable[[Line], _Predicate], line: Line) -> _Predicate:
+    try:
+        return compiler(line)
+    except ExpectedError as error:
+        # a line is only invalid for the type of value it's checked against, so the error is raised once it's checked
+        return partial(_raise_error, error.message, error.line_number)
+
+def _raise_error(message: str, line_number: int, _):
+    raise ExpectedError(message, line_number)
+
+def _compile_bool_predicate(line: Line) -> _Predicate:
     if len(line.values) != 1 or (line_value := _try_get_bool(line.values[0])) is None:
         error_message = _BOOL_VALUE_ERROR.format(line.operand, " ".join(line.values))
         raise ExpectedError(error_message, line.number)
     
     match line.operator:
         case Operator.EQUALS | Operator.CONTAINS | "":
-            return value == line_value
+            return partial(operator.eq, line_value)
         case Operator.NOT_CONTAINS | Operator.NOT_EQUALS:
-            return value != line_value
+            return partial(operator.ne, line_value)
         case _:
             raise ExpectedError(_BOOL_OPERATOR_ERROR.format(line.operator), line.number)
 
@@ -71,37 +144,31 @@ def _try_get_bool(text: str):
         case _:
             return None
 
-def _is_int_value_valid(value: int, line: Line):
+def _compile_int_predicate(line: Line) -> _Predicate:
     if len(line.values) != 1 or not line.values[0].isdigit():
         error_message = _INT_VALUE_ERROR.format(line.operand, " ".join(line.values))
         raise ExpectedError(error_message, line.number)
 
-    line_value = int(line.values[0])
-    match line.operator:
-        case Operator.GREATER_EQUALS:
-            return value >= line_value
-        case Operator.GREATER:
-            return value > line_value
-        case Operator.LESS_EQUALS:
-            return value <= line_value
-        case Operator.LESS:
-            return value < line_value
-        case Operator.CONTAINS | Operator.EQUALS | "":
-            return value == line_value
-        case Operator.NOT_CONTAINS | Operator.NOT_EQUALS:
-            return value != line_value
-        case _:
-            raise ExpectedError(_INT_OPERATOR_ERROR.format(line.operator), line.number)
+    if line.operator not in _INT_COMPARISONS:
+        raise ExpectedError(_INT_OPERATOR_ERROR.format(line.operator), line.number)
+    
+    return partial(_INT_COMPARISONS[line.operator], int(line.values[0]))
 
-def _is_str_value_valid(value: str, line: Line):
-    value = value.lower()
-    line_values = [ value.replace('"', "").lower() for value in line.values ]
+def _compile_str_predicate(line: Line) -> _Predicate:
+    line_values = tuple(value.replace('"', "").lower() for value in line.values)
+    line_value_set = frozenset(line_values)
     match line.operator:
         case Operator.EQUALS:
-            return value in line_values
+            return lambda value: value.lower() in line_value_set
         case Operator.CONTAINS | "":
-            return any(line_value in value for line_value in line_values)
+            return lambda value: any(line_value in value.lower() for line_value in line_values)
         case Operator.NOT_CONTAINS | Operator.NOT_EQUALS:
-            return value not in line_values
+            return lambda value: value.lower() not in line_value_set
         case _:
-            raise ExpectedError(_STR_OPERATOR_ERROR.format(line.operator), line.number)
\ No newline at end of file
+            raise ExpectedError(_STR_OPERATOR_ERROR.format(line.operator), line.number)
+
+_PREDICATE_COMPILERS: dict[type, Callable[[Line], _Predicate]] = {
+    bool: _compile_bool_predicate,
+    int: _compile_int_predicate,
+    str: _compile_str_predicate,
+}
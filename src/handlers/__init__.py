@@ -1,27 +1,38 @@
 """Contains all handlers used to modify filters and their respective context initializers."""
+import importlib
 from dataclasses import dataclass
-from typing import Callable
-from core import Filter, Block
+from typing import Callable, Mapping
+from core import Filter, Block, Line
+from utils import LazyMapping
 from .context import Context
-from . import econ, format, if_, import_, index, strict, tag, alias, game, multi
 
 type ContextInitializer = Callable[[Filter, list[str]], Context]
-type HandleFunction = Callable[[Block, Context], list[str]]
+type HandleFunction = Callable[[Block, Context], list[str | Line]]
 
 @dataclass
 class Handler:
     handle: HandleFunction
     initialize_context: ContextInitializer
+    is_per_block: bool = False
+    """Per-block handlers only look at the block they're handling and never at the rest of the filter.
+    This allows them to be applied one after the other on each block in a single pass over the filter."""
+    is_memoized: bool = False
+    """The output of memoized handlers is stored on disk by block, so blocks that didn't change can reuse it in later runs.
+    Only per-block handlers which don't change blocks without rules named after them can be memoized."""
 
-HANDLERS: dict[str, Handler] = {
-    econ.NAME: Handler(econ.handle, Context),
-    format.NAME: Handler(format.handle, Context),
-    import_.NAME: Handler(import_.handle, import_.ImportContext),
-    index.NAME: Handler(index.handle, index.IndexContext),
-    strict.NAME: Handler(strict.handle, Context),
-    tag.NAME: Handler(tag.handle, Context),
-    if_.NAME: Handler(if_.handle, Context),
-    alias.NAME: Handler(alias.handle, alias.AliasContext),
-    game.NAME: Handler(game.handle, Context),
-    multi.NAME: Handler(multi.handle, Context),
-}
\ No newline at end of file
+def _import(module_name: str):
+    return importlib.import_module(f".{module_name}", __name__)
+
+# handlers are only imported once they're requested, so using one doesn't load the dependencies of the rest
+HANDLERS: Mapping[str, Handler] = LazyMapping({
+    "econ": lambda: Handler(_import("econ").handle, _import("econ").EconContext, is_per_block=True, is_memoized=True),
+    "format": lambda: Handler(_import("format").handle, Context),
+    "import": lambda: Handler(_import("import_").handle, _import("import_").ImportContext),
+    "index": lambda: Handler(_import("index").handle, _import("index").IndexContext),
+    "strict": lambda: Handler(_import("strict").handle, Context, is_per_block=True),
+    "tag": lambda: Handler(_import("tag").handle, Context, is_per_block=True),
+    "if": lambda: Handler(_import("if_").handle, Context, is_per_block=True),
+    "alias": lambda: Handler(_import("alias").handle, _import("alias").AliasContext),
+    "game": lambda: Handler(_import("game").handle, Context, is_per_block=True, is_memoized=True),
+    "multi": lambda: Handler(_import("multi").handle, Context, is_per_block=True),
+})
\ No newline at end of file
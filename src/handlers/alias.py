@@ -1,6 +1,6 @@
 import re, utils
 from dataclasses import dataclass, field
-from core import Delimiter, Block, Filter, ExpectedError
+from core import Delimiter, Block, Line, Filter, ExpectedError
 from .context import Context
 
 NAME = "alias"
@@ -37,8 +37,8 @@ def handle(block: Block, context: AliasContext):
     """Finds and replaces aliased text for a replacement.
     Text within `.alias` rules is excempt from replacement.
     Additional aliases can be passed in via the options and are interpreted as any other alias rule."""
-    return [ _get_aliased_line(raw_line, context.aliases)
-        for raw_line in block.get_raw_lines() ]
+    return [ _get_aliased_line(line, context.aliases)
+        for line in block.lines ]
 
 def _get_aliases(filter: Filter, options: list[str]):
     options_source = _Source(_OPTIONS_SOURCE_NAME)
@@ -47,8 +47,7 @@ def _get_aliases(filter: Filter, options: list[str]):
         for name, replacement in utils.parse_key_value_list(" ".join(options)) ]
     
     aliases += [ _Alias(name, replacement, _Source(_RULE_SOURCE_NAME.format(rule.line_number), rule.line_number))
-        for block in filter.blocks
-        for rule in block.get_rules(NAME)
+        for rule in filter.get_rules(NAME)
         for name, replacement in utils.parse_key_value_list(rule.description, rule.line_number) ]
     
     _validate_aliases(aliases)
@@ -78,7 +77,11 @@ def _validate_duplicate_aliases(first: _Alias, second: _Alias):
             second.name, _CONTAINS_ERROR_DESCRIPTOR, first.name, first.source.name)
         raise ExpectedError(error, second.source.line_number)
 
-def _get_aliased_line(raw_line: str, aliases: list[_Alias]):
+def _get_aliased_line(line: Line, aliases: list[_Alias]):
+    raw_line = str(line)
+    if not any(alias.name in raw_line for alias in aliases):
+        return line
+    
     temp_aliases = _get_temp_aliases(raw_line)
 
     for temp_alias, raw_rule in temp_aliases.items():
@@ -5,4 +5,9 @@ from core import Filter
 class Context:
     """A container for several contextual clues passed to Handlers."""
     filter: Filter
-    options: list[str]
\ No newline at end of file
+    options: list[str]
+
+    def get_memo_key(self) -> str:
+        """Returns whatever the output of memoized handlers depends on besides the block and the options,
+        which isn't obtained from the web while handling it. Output memoized with a different key is never reused."""
+        return ""
\ No newline at end of file
@@ -1,7 +1,7 @@
 import ggg, ninja
-from dataclasses import dataclass
-from core import ExpectedError, Block, Rule, Sieve, Operand
-from ninja import BaseQueryType, ValueRange
+from dataclasses import dataclass, field
+from core import ExpectedError, Block, Filter, Rule, Sieve, Operand
+from ninja import BaseQueryType, MiscQueryType, ValueRange
 from .context import Context
 
 NAME = "econ"
@@ -63,15 +63,28 @@ class _Params:
     value_range: ValueRange
     line_number: int
 
-def handle(block: Block, context: Context):
+@dataclass
+class EconContext(Context):
+    """Represents a Context used by the .econ handler.
+    Every poe.ninja query used by the filter's rules is requested while it's initialized, all at once."""
+    league_name: str = field(init=False)
+
+    def __post_init__(self):
+        self.league_name = _get_league_name(self.options)
+        ninja.prefetch(_get_query_types(self.filter), self.league_name)
+    
+    def get_memo_key(self):
+        # the league is resolved before handling, so its output isn't invalidated when a new league starts
+        return self.league_name
+
+def handle(block: Block, context: EconContext):
     """Handles creation of economy adjusted filters.
     Options:
     - if `hc` is passed hardcore leagues will be queried, otherwise softcore is queried instead.
     - if `std` is passed then standard leagues will be queried, otherwise the temp league is queried instead.
     - if `rth` is passed then ruthless leagues will be queried."""
     sieve = block.get_sieve()
-    league_name = _get_league_name(context.options)
-    params_list = [ _get_params(rule, league_name) for rule in block.get_rules(NAME) ]
+    params_list = [ _get_params(rule, context.league_name) for rule in block.get_rules(NAME) ]
 
     operands_and_values = [ _get_operand_and_values(params, sieve) for params in params_list ]
     operands_and_values = _aggregate_operands_and_values(operands_and_values)
@@ -81,7 +94,7 @@ def handle(block: Block, context: Context):
     if any(len(values) == 0 for (_, values) in operands_and_values):
         block.comment_out()
 
-    return block.get_raw_lines()
+    return block.lines
 
 def _get_operand_and_values(params: _Params, sieve: Sieve):    
     if params.mnemonic in _BASE_QUERY_TYPES_BY_MNEMONIC:
@@ -109,6 +122,16 @@ def _get_base_types(params: _Params, sieve: Sieve):
         for base in ninja.get_base_types(
             query_type, params.league_name, sieve, params.value_range) }
 
+def _get_query_types(filter: Filter):
+    # invalid rules are skipped here, so they're reported by the block they're in while handling it
+    mnemonics = { rule.description.split()[0] for rule in filter.get_rules(NAME) if rule.description != "" }
+    query_types = { query_type
+        for mnemonic in mnemonics if mnemonic in _BASE_QUERY_TYPES_BY_MNEMONIC
+        for query_type in _BASE_QUERY_TYPES_BY_MNEMONIC[mnemonic] }
+    if _CLUSTER_JEWEL_ENCHANT_MNEMONIC in mnemonics:
+        query_types.add(MiscQueryType.CLUSTER_JEWEL)
+    return query_types
+
 def _get_league_name(options: list[str]):
     standard = _STANDARD_OPTION in options
     hardcore = _HARDCORE_OPTION in options
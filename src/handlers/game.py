@@ -19,7 +19,7 @@ def handle(block: Block, _):
         operand, values = _get_operand_and_values(param, block.get_sieve(), line_number)
         block.upsert(operand, [ f'"{value}"' for value in values ])
 
-    return block.get_raw_lines()
+    return block.lines
 
 def _get_operand_and_values(param: str, sieve: Sieve, line_number: int):
     if param == _MOD_PARAM:
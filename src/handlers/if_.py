@@ -22,7 +22,7 @@ def handle(block: Block, _):
         elif remove_type == _RemoveType.MUTLI:
             block.comment_out(start=line)
             break
-    return block.get_raw_lines()
+    return block.lines
 
 def _get_block_text(block: Block):
     raw_lines = [ re.sub(_IF_RULE_PATTERN, "", raw_line) for raw_line in block.get_raw_lines() ]
@@ -1,4 +1,4 @@
-import os
+import os, utils
 from typing import Generator
 from core import Filter, Block, Line, Rule, ExpectedError
 from .import_context import ImportContext
@@ -6,6 +6,8 @@ from .import_ import Import
 from .constants import RuleName
 from . import parse
 
+_FILTER_CACHE_DIRS = ("cache", "filters")
+
 _BLOCK_NOT_FOUND_ERROR = "The block with name '{0}' was not found."
 
 def handle(block: Block, context: ImportContext):
@@ -59,12 +61,12 @@ def _get_filter(filepath: str, context: ImportContext):
     absolute_filepath = os.path.abspath(filepath)
 
     if absolute_filepath not in context.cache:
-        context.cache[absolute_filepath] = Filter.load(filepath)
+        context.cache[absolute_filepath] = Filter.load(filepath, utils.get_execution_dir(*_FILTER_CACHE_DIRS))
 
     return context.cache[absolute_filepath]
 
 def _get_block(filter: Filter, blockname: str):
-    for block in filter.blocks:
+    for block in filter.get_blocks(RuleName.NAME):
         if blockname == _get_blockname(block):
             return block
     error = _BLOCK_NOT_FOUND_ERROR.format(blockname)
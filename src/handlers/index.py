@@ -80,8 +80,7 @@ class _Index:
         id = _Id()
 
         self._sections = [ self._get_section(rule, id)
-            for block in filter.blocks
-            for rule in block.get_rules(_SECTION_RULE_NAMES) ]
+            for rule in filter.get_rules(_SECTION_RULE_NAMES) ]
         
         for section in self._sections:
             section.id.length = id.length
@@ -137,7 +136,7 @@ def _get_raw_lines_from_line(line: Line, index: _Index):
     if len(raw_lines) > 0:
         raw_lines = [ "\n" ] + raw_lines + [ "\n" ]
 
-    return [ str(line) ] + raw_lines
+    return [ line ] + raw_lines
 
 def _render_line(left_text: str, center_text: str, right_text: str, padding_token: str = " "):
     padding = padding_token * (_MAX_LINE_LENGTH  - len(left_text) - len(center_text) - len(right_text))
@@ -16,10 +16,10 @@ def handle(block: Block, context: Context):
     """Generates multiple block from a single one."""
     rules = block.get_rules(NAME)
     if len(rules) in [0, 1]:
-        return [ str(line) for line in block.lines ]
+        return block.lines
     
     parts = _get_block_parts(rules, block, context.filter.filepath)
-    return [ str(line)
+    return [ line
         for multi in parts.multis
         for line in parts.prefix + multi + parts.suffix ]
 
@@ -24,7 +24,7 @@ def handle(block: Block, context: Context):
         else:
             block.hide()
 
-    return block.get_raw_lines()
+    return block.lines
 
 def _get_handler_strictness(options: list[str]):
     if len(options) != 1:
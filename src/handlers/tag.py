@@ -27,7 +27,7 @@ def handle(block: Block, context: Context):
         else:
             block.hide()
     
-    return block.get_raw_lines()
+    return block.lines
 
 def _is_text_equivalent(first: str, second: str):
     return first == second or _WILDCARD in [ first, second ]
@@ -0,0 +1,2 @@
+"""Contains functions used to reuse the output of handlers on blocks that didn't change since they were last handled."""
+from .functions import get_key, try_get, add, get_added_entries, add_entries, save
@@ -0,0 +1,78 @@
+import os, json, hashlib, utils, web
+from core import Block, FILE_ENCODING
+
+_MEMO_DIR = "cache" # shared with the web cache so both are deleted together
+_MEMO_FILENAME = "_memo.json"
+_KEY_SEPARATOR = "\n"
+_LINES_FIELD = "lines"
+_VERSIONS_FIELD = "versions"
+
+type MemoEntry = dict[str, list[str] | dict[str, str]]
+
+_entries: dict[str, MemoEntry] = None
+_added_entries: dict[str, MemoEntry] = {}
+
+def get_key(invocation: str, block: Block, context_key: str = ""):
+    """Returns a fingerprint of the `block`'s text and the handler `invocation` (its name and options) applied to it.
+    `context_key` is whatever else the handler's output depends on, as returned by its context's `get_memo_key`."""
+    text = invocation + _KEY_SEPARATOR + context_key + _KEY_SEPARATOR + str(block)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def try_get(key: str) -> list[str] | None:
+    """Gets the lines previously added with the `key`, as long as every web item they were generated
+    from is still cached with the same version. If they can't be reused, `None` is returned instead."""
+    entries = _get_entries()
+    if key not in entries or not _is_current(entries[key], {}):
+        return None
+    return entries[key][_LINES_FIELD]
+
+def add(key: str, lines: list[str], versions: dict[str, str]):
+    """Adds the `lines` a handler returned for the block with the `key`.
+    `versions` are the versions of the web items used to generate them by URL, as returned by `web.stop_tracking`."""
+    add_entries({ key: { _LINES_FIELD: lines, _VERSIONS_FIELD: versions } })
+
+def get_added_entries():
+    """Returns every entry added since the last time the memo was saved, so they can be added from other processes."""
+    return dict(_added_entries)
+
+def add_entries(entries: dict[str, MemoEntry]):
+    """Adds the `entries` returned by `get_added_entries`."""
+    _get_entries().update(entries)
+    _added_entries.update(entries)
+
+def save():
+    """Writes the memo to disk if entries were added to it. Entries which can no longer be reused are dropped."""
+    if len(_added_entries) == 0:
+        return
+    
+    versions: dict[str, str | None] = {}
+    entries = { key: entry for key, entry in _get_entries().items() if _is_current(entry, versions) }
+    directory = utils.get_execution_dir(_MEMO_DIR)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, _MEMO_FILENAME), "w", encoding=FILE_ENCODING) as file:
+        json.dump(entries, file)
+    _added_entries.clear()
+
+def _get_entries():
+    global _entries
+    if _entries == None:
+        _entries = _load_entries()
+    return _entries
+
+def _load_entries() -> dict[str, MemoEntry]:
+    filepath = utils.get_execution_dir(_MEMO_DIR, _MEMO_FILENAME)
+    if not os.path.isfile(filepath):
+        return {}
+    try:
+        with open(filepath, "r", encoding=FILE_ENCODING) as file:
+            return json.load(file)
+    except ValueError:
+        return {} # a corrupted memo is rebuilt from scratch
+
+def _is_current(entry: MemoEntry, versions: dict[str, str | None]):
+    for url, version in entry[_VERSIONS_FIELD].items():
+        if url not in versions:
+            versions[url] = web.get_version(url)
+        if versions[url] != version:
+            return False
+    return True
@@ -1,4 +1,4 @@
 """Contains all the functionality used to comunicate with the poe.ninja API."""
-from .functions import get_base_types, get_cluster_enchants
-from .constants import BaseQueryType
+from .functions import get_base_types, get_cluster_enchants, prefetch
+from .constants import BaseQueryType, MiscQueryType
 from .value_range import ValueRange
\ No newline at end of file
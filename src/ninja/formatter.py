@@ -3,20 +3,23 @@ from dataclasses import dataclass
 from core import Sieve
 from .constants import Field, Record, RecordsJSON
 from .value_range import ValueRange
-from .utils import TargetGetter, ValueGetter, Validator
+from .utils import TargetGetter, ValueGetter, PatternGetter
 
 @dataclass
 class Formatter:
     _url: str
     _target_getter: TargetGetter
     _value_getter: ValueGetter
-    _validator: Validator
+    _pattern_getter: PatternGetter
 
     def get_url(self, target: str, league_name: str):
         return self._url.format(league_name, target)
 
-    def validate(self, record: Record, range: ValueRange, sieve: Sieve):
-        return self._validator(record, range, sieve)
+    def validate(self, records: list[Record], range: ValueRange, sieve: Sieve):
+        """Returns whether or not each of the `records` matches the `sieve` and has a value within the `range`."""
+        patterns = [ self._pattern_getter(record) for record in records ]
+        return [ is_sieved and record[Field.CHAOS_VALUE] in range
+            for record, is_sieved in zip(records, sieve.filter(patterns)) ]
 
     def __call__(self, records_json: RecordsJSON):
         return [ self._get_formatted_record(record, records_json)
@@ -1,4 +1,5 @@
 import web
+from typing import Iterable
 from core import Sieve
 from .constants import Field, BaseQueryType, MiscQueryType
 from .value_range import ValueRange
@@ -8,9 +9,9 @@ from . import utils
 _EXCHANGE_URL = "https://poe.ninja/poe1/api/economy/exchange/current/overview?league={0}&type={1}"
 _STASH_URL = "https://poe.ninja/poe1/api/economy/stash/current/item/overview?league={0}&type={1}"
 
-_DEFAULT_EXCHANGE_FORMATTER = Formatter(_EXCHANGE_URL, utils.get_target_from_items, utils.get_value_by_primary, utils.is_item_valid)
-_DEFAULT_STASH_FORMATTER = Formatter(_STASH_URL, utils.get_target_by_name, utils.get_value_by_chaos, utils.is_item_valid)
-_UNIQUE_FORMATTER = Formatter(_STASH_URL, utils.get_target_by_base_type, utils.get_value_by_chaos, utils.is_unique_valid)
+_DEFAULT_EXCHANGE_FORMATTER = Formatter(_EXCHANGE_URL, utils.get_target_from_items, utils.get_value_by_primary, utils.get_item_pattern)
+_DEFAULT_STASH_FORMATTER = Formatter(_STASH_URL, utils.get_target_by_name, utils.get_value_by_chaos, utils.get_item_pattern)
+_UNIQUE_FORMATTER = Formatter(_STASH_URL, utils.get_target_by_base_type, utils.get_value_by_chaos, utils.get_unique_pattern)
 _BASE_QUERY_FORMATTERS = {
     BaseQueryType.CURRENCY: _DEFAULT_EXCHANGE_FORMATTER,
     BaseQueryType.FRAGMENT: _DEFAULT_EXCHANGE_FORMATTER,
@@ -44,9 +45,12 @@ _BASE_QUERY_FORMATTERS = {
     BaseQueryType.INVITATION: _DEFAULT_STASH_FORMATTER,
     BaseQueryType.VIAL: _DEFAULT_STASH_FORMATTER,
     
-    BaseQueryType.GEM: Formatter(_STASH_URL, utils.get_target_by_name, utils.get_value_by_chaos, utils.is_gem_valid),
-    BaseQueryType.WOMBGIFT: Formatter(_STASH_URL, utils.get_target_by_name, utils.get_value_by_chaos, utils.is_wombgift_valid),
+    BaseQueryType.GEM: Formatter(_STASH_URL, utils.get_target_by_name, utils.get_value_by_chaos, utils.get_gem_pattern),
+    BaseQueryType.WOMBGIFT: Formatter(_STASH_URL, utils.get_target_by_name, utils.get_value_by_chaos, utils.get_wombgift_pattern),
 }
+_CLUSTER_JEWEL_FORMATTER = Formatter(_STASH_URL, utils.get_target_for_cluster, utils.get_value_by_chaos, utils.get_cluster_jewel_pattern)
+_FORMATTERS: dict[BaseQueryType | MiscQueryType, Formatter] = \
+    _BASE_QUERY_FORMATTERS | { MiscQueryType.CLUSTER_JEWEL: _CLUSTER_JEWEL_FORMATTER }
 
 def get_base_types(query_type: BaseQueryType, league_name: str, sieve: Sieve, value_range: ValueRange) -> set[str]:
     """Returns a set of base types for a `QueryType` and `league_name`.
@@ -56,15 +60,18 @@ def get_base_types(query_type: BaseQueryType, league_name: str, sieve: Sieve, va
     return _get_records(url, sieve, value_range, formatter)
 
 def get_cluster_enchants(league_name: str, sieve: Sieve, value_range: ValueRange) -> set[str]:
-    formatter = Formatter(
-        _STASH_URL,
-        utils.get_target_for_cluster,
-        utils.get_value_by_chaos,
-        utils.is_cluster_jewel_valid)
-    url = formatter.get_url(MiscQueryType.CLUSTER_JEWEL, league_name)
-    return _get_records(url, sieve, value_range, formatter)
+    url = _CLUSTER_JEWEL_FORMATTER.get_url(MiscQueryType.CLUSTER_JEWEL, league_name)
+    return _get_records(url, sieve, value_range, _CLUSTER_JEWEL_FORMATTER)
+
+def prefetch(query_types: Iterable[BaseQueryType | MiscQueryType], league_name: str):
+    """Requests the records for all of the `query_types` in the `league_name` at once, instead of one at a time
+    the first time each of them is needed."""
+    formatters_by_url = { _FORMATTERS[query_type].get_url(query_type, league_name): _FORMATTERS[query_type]
+        for query_type in query_types }
+    web.prefetch(formatters_by_url, web.Expiration.DAILY)
 
 def _get_records(url: str, sieve: Sieve, value_range: ValueRange, formatter: Formatter):
+    records = web.get(url, web.Expiration.DAILY, formatter)
     return { record[Field.TARGET]
-        for record in web.get(url, web.Expiration.DAILY, formatter)
-        if formatter.validate(record, value_range, sieve) }
\ No newline at end of file
+        for record, is_valid in zip(records, formatter.validate(records, value_range, sieve))
+        if is_valid }
\ No newline at end of file
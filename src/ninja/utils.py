@@ -1,7 +1,6 @@
 import repoe
 from typing import Callable
-from core import Sieve, Operand
-from .value_range import ValueRange
+from core import Operand, Pattern
 from .constants import Field, Record, RecordsJSON
 
 _REPLICA_ITEM_NAME_EXCEPTIONS = [ "Replica Dragonfang's Flight" ]
@@ -41,46 +40,42 @@ def get_value_by_primary(record: Record) -> float:
     """Gets the `record`'s value via it's primary value."""
     return record[Field.PRIMARY_VALUE]
 
-type Validator = Callable[[Record, ValueRange, Sieve], bool]
-"""Validates that a `record` is within the `ValueRange` and meets the `Sieve`'s criteria if applicable."""
+type PatternGetter = Callable[[Record], Pattern]
+"""Gets the pattern a `Record` must match in a `Sieve` to be valid."""
 
-def is_item_valid(record: Record, range: ValueRange, _):
-    """Checks if any `record` is valid."""
-    return record[Field.CHAOS_VALUE] in range
+def get_item_pattern(_):
+    """Gets the pattern for any `record`, which matches every sieve."""
+    return {}
 
-def is_unique_valid(record: Record, range: ValueRange, sieve: Sieve):
-    """Checks if a unique item's `record` is valid."""
+def get_unique_pattern(record: Record):
+    """Gets the pattern for a unique item's `record`."""
     name: str = record[Field.NAME]
     is_foulborn = name.startswith(f"{Operand.FOULBORN} ")
     is_replica = name.startswith(f"{Operand.REPLICA} ") and name not in _REPLICA_ITEM_NAME_EXCEPTIONS
     links = record[Field.LINKS] if Field.LINKS in record else 0
-    pattern = {
+    return {
         Operand.CLASS: record[Field.CLASS],
         Operand.REPLICA: is_replica,
         Operand.FOULBORN: is_foulborn,
         Operand.LINKED_SOCKETS: links }
-    return pattern in sieve and is_item_valid(record, range, sieve)
 
-def is_gem_valid(record: Record, range: ValueRange, sieve: Sieve):
-    """Checks if a gem's `record` is valid."""
-    pattern = {
+def get_gem_pattern(record: Record):
+    """Gets the pattern for a gem's `record`."""
+    return {
         Operand.GEM_LEVEL: record[Field.GEM_LEVEL],
         Operand.QUALITY: record[Field.GEM_QUALITY] \
             if Field.GEM_QUALITY in record else 0,
         Operand.CORRUPTED: record[Field.CORRUPTED] \
             if Field.CORRUPTED in record else False }
-    return pattern in sieve and is_item_valid(record, range, sieve)
 
-def is_cluster_jewel_valid(record: Record, range: ValueRange, sieve: Sieve):
-    """Checks if a cluster jewel's `record` is valid."""
+def get_cluster_jewel_pattern(record: Record):
+    """Gets the pattern for a cluster jewel's `record`."""
     variant: str = record[Field.VARIANT]
-    pattern = {
+    return {
         Operand.BASE_TYPE: record[Field.BASE_TYPE],
         Operand.ITEM_LEVEL: record[Field.LEVEL_REQUIRED],
         Operand.ENCHANTMENT_PASSIVE_NUM: int(variant.split()[0]) }
-    return pattern in sieve and is_item_valid(record, range, sieve)
 
-def is_wombgift_valid(record: Record, range: ValueRange, sieve: Sieve):
-    """Checks if a wombgift's `record` is valid."""
-    pattern = { Operand.ITEM_LEVEL: record[Field.LEVEL_REQUIRED] }
-    return pattern in sieve and is_item_valid(record, range, sieve)
\ No newline at end of file
+def get_wombgift_pattern(record: Record):
+    """Gets the pattern for a wombgift's `record`."""
+    return { Operand.ITEM_LEVEL: record[Field.LEVEL_REQUIRED] }
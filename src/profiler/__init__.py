@@ -0,0 +1,2 @@
+"""Contains functions used to measure where the time of a run is spent, and to report it."""
+from .functions import start, stop, is_started, measure, measure_iterator, count, get_report, write_report, save_report
@@ -0,0 +1,149 @@
+import time, json, console
+from contextlib import contextmanager, nullcontext
+from typing import Iterable, TypeVar
+from core import ExpectedError, FILE_ENCODING
+
+_STEP_HEADER = "Step"
+_CALLS_HEADER = "Calls"
+_WALL_TIME_HEADER = "Wall (ms)"
+_CPU_TIME_HEADER = "CPU (ms)"
+_COUNTER_HEADER = "Counter"
+_AMOUNT_HEADER = "Amount"
+_TOTAL_STEP = "total"
+_OTHER_STEP = "other"
+
+_TOTAL_FIELD = "total"
+_TIMINGS_FIELD = "timings"
+_COUNTERS_FIELD = "counters"
+_CALLS_FIELD = "calls"
+_WALL_TIME_FIELD = "wall_seconds"
+_CPU_TIME_FIELD = "cpu_seconds"
+
+_REPORT_SAVED_MESSAGE = "Profiling report saved to '{0}'."
+_PERMISSION_ERROR = "Could not write the profiling report to '{0}' because the permission to do so was denied."
+
+_NULL_CONTEXT = nullcontext()
+_END = object()
+
+T = TypeVar("T")
+
+class _Timing:
+    def __init__(self):
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+_start_times: tuple[float, float] = None
+_elapsed_times: tuple[float, float] = (0.0, 0.0)
+_timings: dict[str, _Timing] = {}
+_counters: dict[str, int] = {}
+_nested_times: list[list[float]] = []
+
+def start():
+    """Starts profiling, discarding everything measured before.
+    Until it's stopped, `measure`, `measure_iterator` and `count` record what they receive."""
+    global _start_times
+    _timings.clear()
+    _counters.clear()
+    _start_times = (time.perf_counter(), time.process_time())
+
+def stop():
+    """Stops profiling. Whatever was measured remains available until profiling is started again."""
+    global _start_times, _elapsed_times
+    _elapsed_times = _get_elapsed_times()
+    _start_times = None
+
+def is_started():
+    """Returns `True` if profiling is currently started."""
+    return _start_times != None
+
+def measure(step: str):
+    """Returns a context manager which adds the wall and CPU time spent inside of it to the `step`.
+    Time spent in other measurements made while it's active is only added to theirs.
+    If profiling isn't started, nothing is measured."""
+    return _measure(step) if _start_times != None else _NULL_CONTEXT
+
+def measure_iterator(step: str, iterable: Iterable[T]) -> Iterable[T]:
+    """Wraps the `iterable` so the time spent getting each of its items is added to the `step`.
+    If profiling isn't started, the `iterable` is returned as is."""
+    return _measure_iterator(step, iter(iterable)) if _start_times != None else iterable
+
+def count(counter: str, amount: int = 1):
+    """Adds the `amount` to the `counter`, if profiling is started."""
+    if _start_times != None:
+        _counters[counter] = _counters.get(counter, 0) + amount
+
+def get_report():
+    """Returns everything measured and counted so far as a JSON compatible dictionary.
+    Time spent outside of every step is reported in a step of its own."""
+    (wall_time, cpu_time) = _get_elapsed_times()
+    timings = { step: {
+            _CALLS_FIELD: timing.calls,
+            _WALL_TIME_FIELD: timing.wall_time,
+            _CPU_TIME_FIELD: timing.cpu_time }
+        for step, timing in _timings.items() }
+    timings[_OTHER_STEP] = {
+        _CALLS_FIELD: 1,
+        _WALL_TIME_FIELD: max(wall_time - sum(timing.wall_time for timing in _timings.values()), 0.0),
+        _CPU_TIME_FIELD: max(cpu_time - sum(timing.cpu_time for timing in _timings.values()), 0.0) }
+    return {
+        _TOTAL_FIELD: { _WALL_TIME_FIELD: wall_time, _CPU_TIME_FIELD: cpu_time },
+        _TIMINGS_FIELD: timings,
+        _COUNTERS_FIELD: dict(_counters) }
+
+def write_report():
+    """Writes the report returned by `get_report` to the console as tables."""
+    report = get_report()
+    total = report[_TOTAL_FIELD]
+    timing_rows = [ [ step, str(timing[_CALLS_FIELD]), _format_time(timing[_WALL_TIME_FIELD]), _format_time(timing[_CPU_TIME_FIELD]) ]
+        for step, timing in report[_TIMINGS_FIELD].items() ]
+    timing_rows += [ [ _TOTAL_STEP, "", _format_time(total[_WALL_TIME_FIELD]), _format_time(total[_CPU_TIME_FIELD]) ] ]
+    console.write_table([ _STEP_HEADER, _CALLS_HEADER, _WALL_TIME_HEADER, _CPU_TIME_HEADER ], timing_rows)
+    
+    if len(report[_COUNTERS_FIELD]) > 0:
+        counter_rows = [ [ counter, str(amount) ] for counter, amount in report[_COUNTERS_FIELD].items() ]
+        console.write_table([ _COUNTER_HEADER, _AMOUNT_HEADER ], counter_rows)
+
+def save_report(filepath: str):
+    """Saves the report returned by `get_report` to the `filepath` as JSON."""
+    try:
+        with open(filepath, "w", encoding=FILE_ENCODING) as file:
+            json.dump(get_report(), file, indent=4)
+    except PermissionError as error:
+        raise ExpectedError(_PERMISSION_ERROR.format(filepath)) from error
+    console.write(_REPORT_SAVED_MESSAGE.format(filepath))
+
+@contextmanager
+def _measure(step: str):
+    _nested_times.append([ 0.0, 0.0 ])
+    (wall_start, cpu_start) = (time.perf_counter(), time.process_time())
+    try:
+        yield
+    finally:
+        (wall_time, cpu_time) = (time.perf_counter() - wall_start, time.process_time() - cpu_start)
+        (nested_wall_time, nested_cpu_time) = _nested_times.pop()
+        if len(_nested_times) > 0:
+            _nested_times[-1][0] += wall_time
+            _nested_times[-1][1] += cpu_time
+        
+        timing = _timings.setdefault(step, _Timing())
+        timing.calls += 1
+        timing.wall_time += wall_time - nested_wall_time
+        timing.cpu_time += cpu_time - nested_cpu_time
+
+def _measure_iterator(step: str, iterator: Iterable[T]):
+    # measured one item at a time, so whatever the consumer does between items isn't added to the step
+    while True:
+        with _measure(step):
+            item = next(iterator, _END)
+        if item is _END:
+            return
+        yield item
+
+def _get_elapsed_times():
+    if _start_times == None:
+        return _elapsed_times
+    return (time.perf_counter() - _start_times[0], time.process_time() - _start_times[1])
+
+def _format_time(seconds: float):
+    return f"{seconds * 1000:.1f}"
@@ -1,11 +1,13 @@
 import web
-from typing import Callable
-from core import ExpectedError, Sieve, Operand
+from core import ExpectedError, Sieve, Operand, PatternColumns
 from web import Expiration
 from . import base_validation, class_, gem
 from .constants import Field
 
 _URL = "https://repoe-fork.github.io/base_items.min.json"
+_COLUMNS_NAME = "columns@1"
+_BASE_OPERANDS = [ Operand.CLASS, Operand.DROP_LEVEL ]
+_TAG_OPERANDS = [ Operand.CLASS, Operand.DROP_LEVEL, Operand.BASE_TYPE ]
 
 _BASE_NAME_NOT_FOUND_ERROR = """The base item name '{0}' could not be identified when attempting to get its class name.
 
@@ -13,7 +15,7 @@ _BASE_NAME_NOT_FOUND_ERROR = """The base item name '{0}' could not be identified
 
 def get_bases(sieve: Sieve) -> set[str]:
     """Returns the set of base type names that match the `sieve` received."""
-    bases = _get_sieved_bases(sieve, _get_pattern_for_bases)
+    bases = _get_sieved_bases(sieve, _BASE_OPERANDS)
     return { base_info[Field.NAME] for base_info in bases.values() }
 
 def get_class_for_base(base_name: str) -> str:
@@ -37,7 +39,7 @@ def get_domains_and_tags(sieve: Sieve) -> tuple[set[str], set[str]]:
     that match the `sieve` received."""
     tags = set()
     domains = set()
-    bases = _get_sieved_bases(sieve, _get_pattern_for_tags)
+    bases = _get_sieved_bases(sieve, _TAG_OPERANDS)
     for base_info in bases.values():
         domains.add(base_info[Field.DOMAIN])
         tags.update(base_info[Field.TAGS])
@@ -57,22 +59,21 @@ def _get_formatted_base_info(base_info: dict[str]):
     base_info[Field.FILTER_ITEM_CLASS] = filter_item_class
     return base_info
 
-def _get_sieved_bases(sieve: Sieve, pattern_generator: Callable[[dict[str]], dict[str]]):
+def _get_sieved_bases(sieve: Sieve, operands: list[Operand]):
     bases = _get_bases()
+    columns: PatternColumns = web.get_derived(_URL, _COLUMNS_NAME, _create_columns, Expiration.MONTHLY, _format_bases_info)
+    mask = sieve.filter({ operand: columns[operand] for operand in operands })
     return { base_name: base_info
-        for base_name, base_info in bases.items()
-        if pattern_generator(base_info) in sieve }
+        for (base_name, base_info), is_sieved in zip(bases.items(), mask)
+        if is_sieved }
 
-def _get_pattern_for_tags(base_info: dict[str]):
+def _create_columns(bases: dict[str]):
+    # keyed by the operands' values because the cache can't store enums
+    base_infos = list(bases.values())
     return {
-        Operand.CLASS: base_info[Field.FILTER_ITEM_CLASS],
-        Operand.DROP_LEVEL: base_info[Field.DROP_LEVEL],
-        Operand.BASE_TYPE: base_info[Field.NAME] }
-
-def _get_pattern_for_bases(base_info: dict[str]):
-    return {
-        Operand.CLASS: base_info[Field.FILTER_ITEM_CLASS],
-        Operand.DROP_LEVEL: base_info[Field.DROP_LEVEL] }
+        Operand.CLASS.value: [ base_info[Field.FILTER_ITEM_CLASS] for base_info in base_infos ],
+        Operand.DROP_LEVEL.value: [ base_info[Field.DROP_LEVEL] for base_info in base_infos ],
+        Operand.BASE_TYPE.value: [ base_info[Field.NAME] for base_info in base_infos ] }
 
 def _get_searchable_base_name(name: str, bases: dict[str]):
     if name in bases:
@@ -4,15 +4,11 @@ from .constants import Field, ROYALE_PATTERN
 from .matchable import Matchable
 
 _URL = "https://repoe-fork.github.io/gems.min.json"
+_BASE_GEM_IDS_NAME = "base_gem_ids@1"
 
 def is_base_gem(metadata_id: str):
     """Returns `True` if the `metadata_id` received corresponds to a base gem. `False` otherwise."""
-    for gem_info in _get_gems().values():
-        id_matches = metadata_id == gem_info[Field.BASE_ITEM][Field.ID]
-        is_gem_base = gem_info[Field.DISPLAY_NAME] == gem_info[Field.BASE_ITEM][Field.DISPLAY_NAME]
-        if id_matches and is_gem_base:
-            return True
-    return False
+    return metadata_id in _get_base_gem_ids()
 
 def try_get_gem_base(name: str):
     """Returns the base gem name of a gem called `name`.
@@ -27,6 +23,14 @@ def try_get_gem_base(name: str):
 def _get_gems() -> dict[str]:
     return web.get(_URL, Expiration.MONTHLY, formatter=_format_gems_info)
 
+def _get_base_gem_ids() -> set[str]:
+    return web.get_derived(_URL, _BASE_GEM_IDS_NAME, _create_base_gem_ids, Expiration.MONTHLY, _format_gems_info)
+
+def _create_base_gem_ids(gems: dict[str]):
+    return { gem_info[Field.BASE_ITEM][Field.ID]
+        for gem_info in gems.values()
+        if gem_info[Field.DISPLAY_NAME] == gem_info[Field.BASE_ITEM][Field.DISPLAY_NAME] }
+
 def _format_gems_info(gems_json: dict[str, dict]):
     return {
         gem_info[Field.DISPLAY_NAME]: gem_info
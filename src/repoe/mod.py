@@ -5,16 +5,21 @@ from core import Sieve, Operand
 from .constants import Field
 
 _URL = "https://repoe-fork.github.io/mods.min.json"
+_MOD_KEYS_BY_DOMAIN_NAME = "mod_keys_by_domain@1"
 _VALID_GENERATION_TYPES = [ "prefix", "suffix" ]
 
 def get_mods(sieve: Sieve) -> set[str]:
     """Returns the names of mods that can roll on items that match the `sieve` received."""
     mods: dict[str] = web.get(_URL, Expiration.MONTHLY, formatter=_format_mods)
+    mod_keys_by_domain: dict[str, list[str]] = web.get_derived(
+        _URL, _MOD_KEYS_BY_DOMAIN_NAME, _group_mod_keys_by_domain, Expiration.MONTHLY, _format_mods)
     (domains, tags) = base.get_domains_and_tags(sieve)
+    domain_mods = [ mods[mod_key] for domain in domains for mod_key in mod_keys_by_domain.get(domain, []) ]
+    mask = sieve.filter({ Operand.ITEM_LEVEL: [ mod_info[Field.REQUIRED_LEVEL] for mod_info in domain_mods ] })
     return {
         mod_info[Field.NAME]
-        for mod_info in mods.values()
-        if _is_mod_info_valid_to_return(mod_info, domains, tags, sieve) }
+        for mod_info, is_sieved in zip(domain_mods, mask)
+        if is_sieved and _can_spawn(mod_info, tags) }
 
 def _format_mods(mods_json: dict[str]):
     return {
@@ -22,17 +27,18 @@ def _format_mods(mods_json: dict[str]):
         for mod_key, mod_info in mods_json.items()
         if _is_mod_info_valid_to_format(mod_info) }
 
+def _group_mod_keys_by_domain(mods: dict[str]):
+    # only the keys are kept, so the mods aren't stored twice
+    mod_keys_by_domain: dict[str, list[str]] = {}
+    for mod_key, mod_info in mods.items():
+        mod_keys_by_domain.setdefault(mod_info[Field.DOMAIN], []).append(mod_key)
+    return mod_keys_by_domain
+
 def _is_mod_info_valid_to_format(mod_info: dict[str]):
     return mod_info[Field.NAME] != "" and \
         mod_info[Field.GENERATION_TYPE] in _VALID_GENERATION_TYPES
 
-def _is_mod_info_valid_to_return(mod_info: dict[str], domains: set[str], tags: set[str], sieve: Sieve):
-    if mod_info[Field.DOMAIN] not in domains:
-        return False
-
-    if { Operand.ITEM_LEVEL: mod_info[Field.REQUIRED_LEVEL] } not in sieve:
-        return False
-
+def _can_spawn(mod_info: dict[str], tags: set[str]):
     for weight in mod_info[Field.SPAWN_WEIGHTS]:
         if weight[Field.WEIGHT] > 0 and weight[Field.TAG] in tags:
             return True
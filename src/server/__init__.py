@@ -0,0 +1,2 @@
+"""Contains functionality to run commands from a long-running process through a local socket."""
+from .functions import serve, send, split_port
@@ -0,0 +1,153 @@
+import json, os, socket, socketserver, secrets, hmac
+from typing import Callable
+from core import ExpectedError, ERROR_EXIT_CODE
+
+_HOST = "127.0.0.1" # only processes in the same computer can connect
+_DEFAULT_PORT = 52080
+_PORT_OPTION = "--port"
+_ENCODING = "utf-8"
+_REQUEST_TIMEOUT = 10 # seconds, so an idle connection can't keep the server from handling other requests
+# kept in the user's home directory: on Windows, where file modes are ignored, only the user can access it through its permissions
+_TOKEN_FILENAME = ".pfg_server_{0}.token"
+_TOKEN_BYTES = 32
+_TOKEN_FILE_MODE = 0o600 # readable and writable by the user running the server only, elsewhere
+_ARGS_FIELD = "args"
+_CWD_FIELD = "cwd"
+_TOKEN_FIELD = "token"
+_OUTPUT_FIELD = "output"
+_EXIT_CODE_FIELD = "exit_code"
+
+_PORT_ERROR = "The " + _PORT_OPTION + " option expects a port number between 1 and 65535, but '{0}' was provided."
+_CONNECTION_ERROR = "Could not connect to a PFG server on port {0}. Start one first by running [cyan]pfg -serve[/]."
+_INVALID_REQUEST_ERROR = "The request received is not valid. Requests must be a single line of JSON with 'args', 'cwd' and 'token' fields."
+_INVALID_TOKEN_ERROR = "The request received was not sent by the user running the PFG server, so it was refused."
+_INVALID_CWD_ERROR = "The working directory '{0}' sent in the request does not exist on the server."
+_INVALID_RESPONSE_ERROR = "The response received from the PFG server on port {0} is not valid."
+_DISCONNECTED_ERROR = "The PFG server on port {0} closed the connection before responding."
+
+type RequestHandler = Callable[[list[str]], tuple[str, int]]
+
+class _Server(socketserver.TCPServer):
+    """Handles requests one at a time, which changing to the working directory of each of them relies on.
+    Only requests carrying the token written to the token file of its port are handled. The file is kept in the home
+    directory of the user running the server, is only accessible to them, and it's removed once the server is closed."""
+    # on Windows, reusing the address allows other processes to listen on the same port
+    allow_reuse_address = os.name != "nt"
+
+    def __init__(self, port: int, handle: RequestHandler):
+        super().__init__((_HOST, port), _RequestHandler)
+        self.handle = handle
+        self.token = secrets.token_hex(_TOKEN_BYTES)
+        _write_token(self.server_address[1], self.token)
+    
+    def server_close(self):
+        super().server_close()
+        # the token isn't set when the port couldn't be bound, in which case the file belongs to another server
+        if hasattr(self, "token"):
+            _remove_token(self.server_address[1])
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: _Server
+    timeout = _REQUEST_TIMEOUT
+
+    def handle(self):
+        try:
+            raw_request = self.rfile.readline()
+            if len(raw_request) == 0: # the client disconnected without sending anything
+                return
+            response = _get_response(raw_request, self.server.handle, self.server.token)
+            self.wfile.write(json.dumps(response).encode(_ENCODING) + b"\n")
+        except OSError:
+            pass # the client timed out or disconnected, so there's no one to respond to
+
+def serve(port: int, handle: RequestHandler):
+    """Handles the requests sent via `send` to the `port`, one at a time, until a `KeyboardInterrupt` is raised.
+    `handle` receives the arguments sent in each request and returns the output and exit code to send back.
+    Requests are handled from the working directory of the process that sent them, and only if it's run by the same user."""
+    with _Server(port, handle) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+def send(port: int, args: list[str]) -> tuple[str, int]:
+    """Sends the `args` to a process running `serve` on the `port` and returns the output and exit code it sends back.
+    The request carries the token the server wrote to its token file, so it can only be sent by the same user."""
+    try:
+        request = { _ARGS_FIELD: args, _CWD_FIELD: os.getcwd(), _TOKEN_FIELD: _read_token(port) }
+        connection = socket.create_connection((_HOST, port))
+    except OSError as error:
+        raise ExpectedError(_CONNECTION_ERROR.format(port)) from error
+    
+    with connection:
+        raw_response = _exchange(connection, request, port)
+    try:
+        response = json.loads(raw_response)
+        return (response[_OUTPUT_FIELD], response[_EXIT_CODE_FIELD])
+    except (ValueError, KeyError, TypeError) as error:
+        raise ExpectedError(_INVALID_RESPONSE_ERROR.format(port)) from error
+
+def split_port(args: list[str]):
+    """Returns the port passed via `--port` at the start of the `args`, or the default port if none was passed,
+    alongside the rest of the `args`."""
+    if len(args) == 0 or args[0] != _PORT_OPTION:
+        return (_DEFAULT_PORT, args)
+    
+    port = args[1] if len(args) > 1 else ""
+    if not port.isdecimal() or not 0 < int(port) < 65536:
+        raise ExpectedError(_PORT_ERROR.format(port))
+    return (int(port), args[2:])
+
+def _exchange(connection: socket.socket, request: dict, port: int):
+    try:
+        connection.sendall(json.dumps(request).encode(_ENCODING) + b"\n")
+        with connection.makefile("rb") as file:
+            raw_response = file.readline()
+    except OSError as error:
+        raise ExpectedError(_DISCONNECTED_ERROR.format(port)) from error
+    
+    if len(raw_response) == 0:
+        raise ExpectedError(_DISCONNECTED_ERROR.format(port))
+    return raw_response
+
+def _get_response(raw_request: bytes, handle: RequestHandler, token: str):
+    try:
+        request = json.loads(raw_request)
+        (args, cwd, request_token) = (request[_ARGS_FIELD], request[_CWD_FIELD], request[_TOKEN_FIELD])
+    except (ValueError, KeyError, TypeError):
+        return { _OUTPUT_FIELD: _INVALID_REQUEST_ERROR, _EXIT_CODE_FIELD: ERROR_EXIT_CODE }
+    
+    if not isinstance(request_token, str) or not hmac.compare_digest(request_token.encode(_ENCODING), token.encode(_ENCODING)):
+        return { _OUTPUT_FIELD: _INVALID_TOKEN_ERROR, _EXIT_CODE_FIELD: ERROR_EXIT_CODE }
+    
+    previous_cwd = os.getcwd()
+    try:
+        os.chdir(cwd)
+    except (OSError, TypeError):
+        return { _OUTPUT_FIELD: _INVALID_CWD_ERROR.format(cwd), _EXIT_CODE_FIELD: ERROR_EXIT_CODE }
+    
+    try:
+        (output, exit_code) = handle(args)
+    finally:
+        os.chdir(previous_cwd)
+    return { _OUTPUT_FIELD: output, _EXIT_CODE_FIELD: exit_code }
+
+def _get_token_filepath(port: int):
+    return os.path.join(os.path.expanduser("~"), _TOKEN_FILENAME.format(port))
+
+def _write_token(port: int, token: str):
+    filepath = _get_token_filepath(port)
+    if os.path.isfile(filepath):
+        os.remove(filepath) # left behind by a server which didn't close, and its mode might not be the expected one
+    descriptor = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, _TOKEN_FILE_MODE)
+    with os.fdopen(descriptor, "w", encoding=_ENCODING) as file:
+        file.write(token)
+
+def _read_token(port: int):
+    with open(_get_token_filepath(port), "r", encoding=_ENCODING) as file:
+        return file.read()
+
+def _remove_token(port: int):
+    filepath = _get_token_filepath(port)
+    if os.path.isfile(filepath):
+        os.remove(filepath)
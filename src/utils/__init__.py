@@ -1,2 +1,3 @@
 """Contains miscellaneous functions used by multiple packages."""
-from .functions import get_execution_dir, get_random_str, b64_decode, b64_encode, parse_key_value_list
\ No newline at end of file
+from .functions import get_execution_dir, get_random_str, b64_decode, b64_encode, parse_key_value_list
+from .lazy_mapping import LazyMapping
\ No newline at end of file
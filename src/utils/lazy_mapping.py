@@ -0,0 +1,23 @@
+from typing import Callable, Iterator, Mapping
+
+class LazyMapping[K, V](Mapping[K, V]):
+    """A read-only mapping whose values are created by calling their loader the first time they are requested.
+    Checking if a key is in the mapping or iterating over its keys never calls a loader."""
+
+    def __init__(self, loaders: dict[K, Callable[[], V]]):
+        self._loaders = loaders
+        self._values: dict[K, V] = {}
+
+    def __getitem__(self, key: K) -> V:
+        if key not in self._values:
+            self._values[key] = self._loaders[key]()
+        return self._values[key]
+
+    def __contains__(self, key: object):
+        return key in self._loaders
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._loaders)
+
+    def __len__(self):
+        return len(self._loaders)
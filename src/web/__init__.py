@@ -1,3 +1,3 @@
 """Contains functions used to interact with the web."""
-from .cache import Expiration, clear_cache
-from .functions import get, download
\ No newline at end of file
+from .cache import Expiration, clear_cache, get_memory_cache, load_memory_cache, get_version, start_tracking, stop_tracking, remove_stale_items
+from .functions import get, get_derived, prefetch, download
\ No newline at end of file
@@ -1,3 +1,3 @@
 """Contains functionality used to cache web requests."""
 from .expiration import Expiration
-from .functions import add, try_get, clear_cache
\ No newline at end of file
+from .functions import add, try_get, contains, get_validators, renew, add_derived, try_get_derived, clear_cache, get_memory_cache, load_memory_cache, get_version, start_tracking, stop_tracking, remove_stale_items
\ No newline at end of file
@@ -1,9 +1,12 @@
-import os, json, shutil
-from core import FILE_ENCODING
+import os, shutil
 from .file_entry import FileEntry
+from .file_format import FileFormat
 from .expiration import Expiration
+from . import file_format
 
 _ENTRIES_FILENAME = "_entries.json"
+_DERIVED_URL_TEMPLATE = "{0}#{1}@{2}"
+_DERIVED_URL_SEPARATOR = "#"
 
 class FileCache:
     """Caches data in storage."""
@@ -27,8 +30,10 @@ class FileCache:
             return False
         
         if entry.is_stale():
-            del self._entries[url]
-            os.remove(filepath)
+            # stale items which can be revalidated are kept, in case the server reports they didn't change
+            if not entry.can_revalidate():
+                del self._entries[url]
+                os.remove(filepath)
             return False
         
         return True
@@ -37,18 +42,56 @@ class FileCache:
         """Attempts to get an item previously added to the cache via it's `url`."""        
         entry = self._entries[url]
         filepath = os.path.join(self._dir, entry.filename)
-        return _load_file(filepath, entry.is_json)
+        return file_format.load(filepath, entry.format)
+
+    def try_get(self, url: str):
+        """Returns the item with the `url` if it's in the cache, or `None` otherwise.
+        Items whose file can't be loaded are removed along with everything derived from them, as if they had never been added."""
+        return self._try_load(url) if url in self else None
     
-    def add(self, url: str, expiration: Expiration, data: str | dict | list):
+    def get_version(self, url: str):
+        """Returns an identifier that changes every time the item with the `url` is added again,
+        or `None` if there's no item with the `url` in the cache."""
+        return self._entries[url].filename if url in self else None
+
+    def get_derived_url(self, url: str, name: str):
+        """Returns the URL under which data derived from the current version of the item with the `url` is added, by `name`."""
+        return _DERIVED_URL_TEMPLATE.format(url, name, self.get_version(url))
+
+    def get_validators(self, url: str) -> tuple[str | None, str | None]:
+        """Returns the `ETag` and `Last-Modified` header values the item with the `url` was added with, even if it's stale.
+        Either is `None` if it wasn't provided, or if there's no item with the `url` on disk."""
+        entry = self._entries.get(url)
+        if entry == None or not os.path.isfile(os.path.join(self._dir, entry.filename)):
+            return (None, None)
+        return (entry.etag, entry.last_modified)
+
+    def add(self, url: str, expiration: Expiration, data: str | dict | list, etag: str = None, last_modified: str = None):
         """Adds a new `data` item to the cache, which can be obtained later via it's URL.
-        * `expiration` determines how long the item will be considered valid for."""
-        is_json = not isinstance(data, str)
-        entry = FileEntry.create(url, expiration, is_json)
-        filepath = os.path.join(self._dir, entry.filename)
-        
-        os.makedirs(self._dir, exist_ok=True)
-        _save_file(filepath, data, is_json)
+        * `expiration` determines how long the item will be considered valid for.
+        * `etag` and `last_modified` are the values of the headers with the same name the item was received with, if any."""
+        # data derived from the previous version of the item can't be used anymore
+        self._remove_derived(url)
+        self._add(FileEntry.create(url, expiration, file_format.get_format(data), etag, last_modified), data)
+
+    def renew(self, url: str, expiration: Expiration):
+        """Makes the item with the `url` valid for the `expiration` again, along with everything derived from it, and returns it.
+        Its version doesn't change, so anything generated from it can still be reused.
+        If the item can't be loaded anymore, it's removed and `None` is returned instead."""
+        if (data := self._try_load(url)) == None:
+            return None
+        entry = self._entries[url]
+        entry.renew(expiration)
+        for derived_entry in self._get_derived_entries(url):
+            derived_entry.expiration_date = entry.expiration_date
         self._update_entries(entry)
+        return data
+
+    def add_derived(self, source_url: str, url: str, data: str | dict | list | set):
+        """Adds `data` derived from the item with the `source_url` under the `url` returned by `get_derived_url`.
+        It expires along with that item, and it's removed when that item is added again."""
+        entry = FileEntry.create_derived(url, self._entries[source_url], file_format.get_format(data))
+        self._add(entry, data)
 
     def clear(self):
         """Removes all cache files and entries from disk.
@@ -59,25 +102,50 @@ class FileCache:
         shutil.rmtree(self._dir)
         return True
 
+    def _add(self, entry: FileEntry, data: str | dict | list | set):
+        filepath = os.path.join(self._dir, entry.filename)
+        os.makedirs(self._dir, exist_ok=True)
+        file_format.save(filepath, data, entry.format)
+        self._update_entries(entry)
+
+    def _try_load(self, url: str):
+        try:
+            return self[url]
+        except file_format.LOAD_ERRORS:
+            self._remove(url)
+            return None
+
+    def _remove(self, url: str):
+        self._remove_derived(url)
+        filepath = os.path.join(self._dir, self._entries.pop(url).filename)
+        if os.path.isfile(filepath):
+            os.remove(filepath)
+        self._save_entries()
+
+    def _remove_derived(self, url: str):
+        for derived_entry in self._get_derived_entries(url):
+            filepath = os.path.join(self._dir, self._entries.pop(derived_entry.url).filename)
+            if os.path.isfile(filepath):
+                os.remove(filepath)
+
+    def _get_derived_entries(self, url: str):
+        prefix = url + _DERIVED_URL_SEPARATOR
+        return [ entry for entry_url, entry in self._entries.items() if entry_url.startswith(prefix) ]
+
     def _load_entries(self):
         if not os.path.isfile(self._entries_filepath):
             return {}
-        raw_entries: list[dict[str, str]] = _load_file(self._entries_filepath)
-        entries = [ FileEntry.from_dict(entry) for entry in raw_entries ]
+        try:
+            raw_entries: list[dict[str, str]] = file_format.load(self._entries_filepath, FileFormat.JSON)
+            entries = [ FileEntry.from_dict(entry) for entry in raw_entries ]
+        except (*file_format.LOAD_ERRORS, KeyError):
+            return {} # the items of an unreadable index can't be found, so they're downloaded again
         return { entry.url: entry for entry in entries }
 
     def _update_entries(self, entry: FileEntry):
         self._entries[entry.url] = entry
+        self._save_entries()
+
+    def _save_entries(self):
         raw_entries = [ entry.to_dict() for entry in self._entries.values() ]
-        _save_file(self._entries_filepath, raw_entries)
-
-def _save_file(filepath: str, data: str | dict | list, is_json: bool = True):
-    with open(filepath, "w", encoding=FILE_ENCODING) as file:
-        if is_json:
-            json.dump(data, file, indent=4)
-        else:
-            file.write(data)
-
-def _load_file(filepath: str, is_json: bool = True):
-    with open(filepath, "r", encoding=FILE_ENCODING) as file:
-        return json.load(file) if is_json else file.read()
\ No newline at end of file
+        file_format.save(self._entries_filepath, raw_entries, FileFormat.JSON)
\ No newline at end of file
@@ -1,40 +1,60 @@
 import utils
 from datetime import datetime
 from .expiration import Expiration
+from .file_format import FileFormat
 
 _EXPIRATION_FORMAT = "%d-%m-%Y"
 _URL_FIELD = "url"
-_IS_JSON_FIELD = "is_json"
+_IS_JSON_FIELD = "is_json" # replaced by the format field, but still read from older entries
+_FORMAT_FIELD = "format"
 _FILENAME_FIELD = "filename"
 _EXPIRATION_DATE_FIELD = "expiration_date"
+_ETAG_FIELD = "etag"
+_LAST_MODIFIED_FIELD = "last_modified"
 
 class FileEntry:
     """Represents metadata that is used to parse entries in a `FileCache`."""
 
-    def __init__(self, url: str, expiration_date: datetime, is_json: bool, filename: str):
+    def __init__(
+        self,
+        url: str,
+        expiration_date: datetime,
+        format: FileFormat,
+        filename: str,
+        etag: str | None = None,
+        last_modified: str | None = None):
         """This constructor is used internally by this class and should be avoided.
         Use `FileEntry.create` or `FileEntry.from_dict` instead."""
         self.url = url
-        self.is_json = is_json
+        self.format = format
         self.filename = filename
         self.expiration_date = expiration_date
+        self.etag = etag
+        self.last_modified = last_modified
 
     @classmethod
-    def create(cls, url: str, expiration: Expiration, is_json: bool):
-        """Creates a new `FileEntry`."""
-        filename = _get_filename(is_json)
+    def create(cls, url: str, expiration: Expiration, format: FileFormat, etag: str | None = None, last_modified: str | None = None):
+        """Creates a new `FileEntry` for an item stored in the `format` specified.
+        `etag` and `last_modified` are the values of the headers with the same name the item was received with, if any."""
+        filename = _get_filename(format)
         expiration_date = datetime.now() + expiration.value
-        return FileEntry(url, expiration_date, is_json, filename)
+        return FileEntry(url, expiration_date, format, filename, etag, last_modified)
+
+    @classmethod
+    def create_derived(cls, url: str, source: "FileEntry", format: FileFormat):
+        """Creates a new `FileEntry` for an item derived from the one in the `source` entry, which expires along with it."""
+        return FileEntry(url, source.expiration_date, format, _get_filename(format))
 
     @classmethod
     def from_dict(cls, raw_entry: dict[str]):
         """Creates a new `FileEntry` from the raw data in `raw_entry`.
         This operation is the inverse of `FileEntry.to_dict`."""
         url: str = raw_entry[_URL_FIELD]
-        is_json: bool = raw_entry[_IS_JSON_FIELD]
+        format = FileFormat(raw_entry[_FORMAT_FIELD]) if _FORMAT_FIELD in raw_entry \
+            else FileFormat.JSON if raw_entry[_IS_JSON_FIELD] else FileFormat.TEXT
         filename: str = raw_entry[_FILENAME_FIELD]
         expiration_date: datetime = datetime.strptime(raw_entry[_EXPIRATION_DATE_FIELD], _EXPIRATION_FORMAT)
-        return FileEntry(url, expiration_date, is_json, filename)
+        return FileEntry(url, expiration_date, format, filename, raw_entry.get(_ETAG_FIELD), raw_entry.get(_LAST_MODIFIED_FIELD))
 
     def to_dict(self):
         """Creates a new `dict` containing all the data in the `FileEntry`."""
@@ -42,14 +62,23 @@ class FileEntry:
             _URL_FIELD: self.url,
             _EXPIRATION_DATE_FIELD: self.expiration_date.strftime(_EXPIRATION_FORMAT),
             _FILENAME_FIELD: self.filename,
-            _IS_JSON_FIELD: self.is_json }
+            _FORMAT_FIELD: self.format.value,
+            _ETAG_FIELD: self.etag,
+            _LAST_MODIFIED_FIELD: self.last_modified }
     
+    def renew(self, expiration: Expiration):
+        """Makes the `FileEntry` valid for the `expiration` again, as if it had just been created."""
+        self.expiration_date = datetime.now() + expiration.value
+
+    def can_revalidate(self):
+        """Returns `True` if the `FileEntry` was created with values which can be sent to check whether its item changed.
+        `False` otherwise."""
+        return self.etag != None or self.last_modified != None
+
     def is_stale(self):
         """Returns `True` if the `FileEntry` is stale because it's been too long since it was added.
         `False` otherwise."""
         return datetime.now() >= self.expiration_date
 
-def _get_filename(is_json: bool):
-    name = utils.get_random_str()
-    extension = "json" if is_json else "txt"
-    return name + f".{extension}"
\ No newline at end of file
+def _get_filename(format: FileFormat):
+    return utils.get_random_str() + f".{format.value}"
\ No newline at end of file
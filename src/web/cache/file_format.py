@@ -0,0 +1,77 @@
+import json, marshal, os
+from enum import StrEnum
+from typing import Callable
+from core import FILE_ENCODING
+
+type Data = str | dict | list
+
+_TEMP_FILEPATH_TEMPLATE = "{0}.{1}.tmp" # the process id keeps workers writing the same file from clashing
+
+LOAD_ERRORS = (EOFError, ValueError, TypeError)
+"""The errors raised by `load` when a file is truncated or corrupted, or was written by a different version of Python."""
+
+class FileFormat(StrEnum):
+    """Represents the way an item is stored in a `FileCache`'s file. Its value is used as the file's extension.
+    It's recorded by entry, because items hold either text or structured data and items saved as JSON by previous versions are still loaded."""
+    TEXT = "txt"
+    JSON = "json"
+    MARSHAL = "marshal"
+
+def get_format(data: Data):
+    """Returns the format new items with the `data` are stored in.
+    Text is stored as is, and anything else with `marshal`, which loads about twice as fast as JSON and takes a third of the space."""
+    return FileFormat.TEXT if isinstance(data, str) else FileFormat.MARSHAL
+
+def save(filepath: str, data: Data, format: FileFormat):
+    """Saves the `data` to the `filepath` in the `format` specified.
+    It's written to a temporary file next to it first, which then replaces it in a single step,
+    so other processes sharing the cache never load it partially written."""
+    temp_filepath = _TEMP_FILEPATH_TEMPLATE.format(filepath, os.getpid())
+    try:
+        _SAVERS[format](temp_filepath, data)
+        os.replace(temp_filepath, filepath)
+    finally:
+        if os.path.isfile(temp_filepath):
+            os.remove(temp_filepath)
+
+def load(filepath: str, format: FileFormat) -> Data:
+    """Loads the data saved to the `filepath` in the `format` specified.
+    Raises one of the `LOAD_ERRORS` if the file can't be loaded."""
+    return _LOADERS[format](filepath)
+
+def _save_text(filepath: str, data: str):
+    with open(filepath, "w", encoding=FILE_ENCODING) as file:
+        file.write(data)
+
+def _load_text(filepath: str):
+    with open(filepath, "r", encoding=FILE_ENCODING) as file:
+        return file.read()
+
+def _save_json(filepath: str, data: dict | list):
+    with open(filepath, "w", encoding=FILE_ENCODING) as file:
+        json.dump(data, file, indent=4)
+
+def _load_json(filepath: str):
+    with open(filepath, "r", encoding=FILE_ENCODING) as file:
+        return json.load(file)
+
+def _save_marshal(filepath: str, data: dict | list):
+    with open(filepath, "wb") as file:
+        file.write(marshal.dumps(data))
+
+def _load_marshal(filepath: str):
+    # reading the whole file first is much faster than letting marshal read from it
+    with open(filepath, "rb") as file:
+        return marshal.loads(file.read())
+
+_SAVERS: dict[FileFormat, Callable[[str, Data], None]] = {
+    FileFormat.TEXT: _save_text,
+    FileFormat.JSON: _save_json,
+    FileFormat.MARSHAL: _save_marshal,
+}
+
+_LOADERS: dict[FileFormat, Callable[[str], Data]] = {
+    FileFormat.TEXT: _load_text,
+    FileFormat.JSON: _load_json,
+    FileFormat.MARSHAL: _load_marshal,
+}
@@ -6,27 +6,101 @@ _CACHE_DIR = "cache"
 
 _file_cache: FileCache = None
 _memory_cache: dict[str, str | dict | list] = None
+_tracked_urls: set[str] = None
 
 def try_get(url: str):
     """Get an item previously added to the cache via it's `url`.
     If the item cannot be found, `None` is returned instead."""
     (_memory_cache, _file_cache) = _get_caches()
+    _track(url)
 
     if url in _memory_cache:
         return _memory_cache[url]
 
-    if url in _file_cache:
-        _memory_cache[url] = _file_cache[url]
-        return _memory_cache[url]
+    if (data := _file_cache.try_get(url)) != None:
+        _memory_cache[url] = data
+    return data
 
-    return None
+def contains(url: str):
+    """Returns whether the item with the `url` can be obtained via `try_get`, without loading it from disk."""
+    (_memory_cache, _file_cache) = _get_caches()
+    return url in _memory_cache or url in _file_cache
     
-def add(url: str, expiration: Expiration, data: str | dict | list):
+def add(url: str, expiration: Expiration, data: str | dict | list, etag: str = None, last_modified: str = None):
     """Adds a new `data` item to the cache, which can be obtained later via it's URL.
-    * `expiration` determines how long the item will be considered valid for."""
+    * `expiration` determines how long the item will be considered valid for.
+    * `etag` and `last_modified` are the values of the headers with the same name the item was received with, if any.
+    Once the item is stale, they can be sent to the server to check whether it changed. See `get_validators`."""
     (_memory_cache, _file_cache) = _get_caches()
+    _track(url)
     _memory_cache[url] = data
-    _file_cache.add(url, expiration, data)
+    _file_cache.add(url, expiration, data, etag, last_modified)
+
+def get_validators(url: str):
+    """Returns a tuple with the `ETag` and `Last-Modified` header values the item with the `url` was added with, even if it's stale.
+    Either is `None` if it wasn't provided, or if the item isn't cached on disk."""
+    (_, _file_cache) = _get_caches()
+    return _file_cache.get_validators(url)
+
+def renew(url: str, expiration: Expiration):
+    """Makes the item with the `url` valid for the `expiration` again and returns it, for when the server reports it didn't change.
+    Its version doesn't change, so data generated from it can still be reused.
+    If the item can't be loaded anymore, it's removed and `None` is returned instead."""
+    (_memory_cache, _file_cache) = _get_caches()
+    _track(url)
+    if (data := _file_cache.renew(url, expiration)) != None:
+        _memory_cache[url] = data
+    return data
+
+def try_get_derived(url: str, name: str):
+    """Gets the data derived from the item with the `url` which was added with the `name`,
+    as long as the item wasn't added again since. If the data cannot be found, `None` is returned instead."""
+    (_, _file_cache) = _get_caches()
+    return try_get(_file_cache.get_derived_url(url, name))
+
+def add_derived(url: str, name: str, data: dict | list | set):
+    """Adds `data` derived from the item with the `url`, which can be obtained later via `try_get_derived` with the same `name`.
+    It's kept on disk as long as the item is, and only in memory if the item isn't cached on disk."""
+    (_memory_cache, _file_cache) = _get_caches()
+    derived_url = _file_cache.get_derived_url(url, name)
+    _track(derived_url)
+    _memory_cache[derived_url] = data
+    if url in _file_cache:
+        _file_cache.add_derived(url, derived_url, data)
+
+def remove_stale_items():
+    """Removes items which are no longer cached on disk from memory, either because they went stale or were deleted.
+    Long-running processes should call this before reusing the memory cache."""
+    (_memory_cache, _file_cache) = _get_caches()
+    for url in [ url for url in _memory_cache if url not in _file_cache ]:
+        del _memory_cache[url]
+
+def get_version(url: str):
+    """Returns an identifier that changes every time the item with the `url` is added to the cache again.
+    If the item is not cached on disk or it's stale, `None` is returned instead."""
+    (_, _file_cache) = _get_caches()
+    return _file_cache.get_version(url)
+
+def start_tracking():
+    """Starts keeping track of the URLs of every item requested or added to the cache until `stop_tracking` is called."""
+    global _tracked_urls
+    _tracked_urls = set()
+
+def stop_tracking():
+    """Stops tracking URLs and returns the version of every item tracked since `start_tracking` was called, by URL.
+    See `get_version` for more information on versions."""
+    global _tracked_urls
+    (urls, _tracked_urls) = (_tracked_urls or set(), None)
+    return { url: get_version(url) for url in urls }
+
+def get_memory_cache():
+    """Returns a copy of every item in the memory cache by URL, which can be loaded in other processes via `load_memory_cache`."""
+    return dict(_memory_cache or {})
+
+def load_memory_cache(items: dict[str, str | dict | list]):
+    """Adds the `items` obtained via `get_memory_cache` to this process' memory cache, without writing them to disk."""
+    global _memory_cache
+    _memory_cache = (_memory_cache or {}) | items
 
 def clear_cache():
     """Removes all cache files and entries from disk.
@@ -34,6 +108,10 @@ def clear_cache():
     (_, _file_cache) = _get_caches()
     return _file_cache.clear()
 
+def _track(url: str):
+    if _tracked_urls != None:
+        _tracked_urls.add(url)
+
 def _get_caches():
     global _memory_cache, _file_cache
     _memory_cache = _memory_cache or {}
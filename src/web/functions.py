@@ -1,6 +1,7 @@
-import os, requests
+import os, profiler, threading
 from typing import Callable
-from requests import ReadTimeout, ConnectTimeout, HTTPError, Response, Timeout, ConnectionError
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
 from core import ExpectedError
 from io import BufferedWriter
 from . import cache, Expiration
@@ -8,8 +9,18 @@ from . import cache, Expiration
 _DOWNLOAD_CHUNK_SIZE = 1024 * 8 # eight megabytes
 _TEMP_DOWNLOAD_PREFIX = "temp_"
 _CONTENT_TYPE_HEADER = "Content-Type"
+_ETAG_HEADER = "ETag"
+_LAST_MODIFIED_HEADER = "Last-Modified"
+_IF_NONE_MATCH_HEADER = "If-None-Match"
+_IF_MODIFIED_SINCE_HEADER = "If-Modified-Since"
+_NOT_MODIFIED_STATUS_CODE = 304
 _JSON_CONTENT_TYPE = "application/json"
 _TIMEOUT = 30 # seconds
+_MAX_POOLED_HOSTS = 8
+_MAX_REQUESTS_PER_HOST = 4 # the connection pool and the prefetch workers are sized after it, so no request waits on another
+_HTTP_REQUESTS_COUNTER = "http requests"
+_CACHE_HITS_COUNTER = "web cache hits"
+_NOT_MODIFIED_COUNTER = "http not modified responses"
 _HEADERS = { "User-Agent": "PoE Filter Generator https://github.com/ajoscram/PoE-Filter-Generator/" }
 
 _HTTP_ERROR = """An HTTP error occurred while requesting data from this URL:
@@ -28,6 +39,10 @@ One of the following things is likely happening here:
 - The server where data is being requested from is currently down."""
 _UNEXISTENT_DIRECTORY_ERROR = "'{0}' does not correspond to an existing directory on this computer."
 
+_session = None
+_session_lock = threading.Lock()
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+
 def get(
     url: str,
     expiration: Expiration = Expiration.IMMEDIATE,
@@ -39,13 +54,52 @@ def get(
     - `expiration` determines the amount of time before deleting the data received from the cache.
     - `formatter` applies a transformation function to the data received before caching and returning.
     - If it fails with an HTTP error and its code is a key in the `custom_http_errors` dictionary,
-    the custom error message is displayed instead."""
-    if (data := cache.try_get(url)) == None:
-        response = _get_response(url, custom_http_errors)
-        data = response.json() if _is_json(response) else response.text
-        data = formatter(data)
-        cache.add(url, expiration, data)
-    return data
+    the custom error message is displayed instead.
+    - Once the cached data is stale, it's only downloaded again if the server reports it changed since.
+    Otherwise, it's renewed for the `expiration` without running the `formatter` again."""
+    if (data := cache.try_get(url)) != None:
+        profiler.count(_CACHE_HITS_COUNTER)
+        return data
+    
+    response = _get_response(url, custom_http_errors, headers=_get_revalidation_headers(url))
+    return _cache_response(url, response, expiration, formatter, custom_http_errors)
+
+def prefetch(
+    formatters_by_url: dict[str, Callable[[str | dict | list], str | dict | list]],
+    expiration: Expiration = Expiration.IMMEDIATE,
+    custom_http_errors: dict[int, str] = None):
+    """Requests every URL in `formatters_by_url` which isn't cached yet concurrently, so calling `get` on them later on
+    doesn't wait for each request one after the other. Only the requests are concurrent: the data received is formatted
+    by the formatter of its URL and cached in the calling thread, in the same way `get` does with the rest of the parameters."""
+    urls = [ url for url in formatters_by_url if not cache.contains(url) ]
+    if len(urls) == 0:
+        return
+    
+    headers_by_url = { url: _get_revalidation_headers(url) for url in urls }
+    with ThreadPoolExecutor(min(len(urls), _MAX_REQUESTS_PER_HOST)) as executor:
+        futures = { url: executor.submit(_get_response, url, custom_http_errors, headers=headers_by_url[url]) for url in urls }
+        for url, future in futures.items():
+            _cache_response(url, future.result(), expiration, formatters_by_url[url], custom_http_errors)
+
+def get_derived(
+    url: str,
+    name: str,
+    deriver: Callable[[str | dict | list], dict | list | set],
+    expiration: Expiration = Expiration.IMMEDIATE,
+    formatter: Callable[[str | dict | list], str | dict | list] = lambda data: data,
+    custom_http_errors: dict[int, str] = None):
+    """Gets the data from the `url` like `get` does, and returns the result of passing it to the `deriver`.
+    The result is cached next to the data, so the `deriver` only runs again once the data is downloaded again.
+    - `name` identifies the result among others derived from the same data. It should include a version tag which
+    is bumped whenever the `deriver` or `formatter` change, so results from previous versions aren't reused.
+    - The rest of the parameters are passed to `get`."""
+    data = get(url, expiration, formatter, custom_http_errors)
+    if (derived := cache.try_get_derived(url, name)) != None:
+        return derived
+    
+    derived = deriver(data)
+    cache.add_derived(url, name, derived)
+    return derived
 
 def download(url: str, directory: str, filename: str, custom_http_errors: dict[int, str] = None):
     """Downloads a file and places it in `directory` with the `filename` passed in.
@@ -56,8 +110,8 @@ def download(url: str, directory: str, filename: str, custom_http_errors: dict[i
         raise ExpectedError(_UNEXISTENT_DIRECTORY_ERROR.format(directory))
     temp_filepath = os.path.join(directory, _TEMP_DOWNLOAD_PREFIX + filename)
     
-    response = _get_response(url, custom_http_errors, stream=True)
-    with open(temp_filepath, 'wb') as file:
+    # the body is only read after the request is made, so the host's semaphore is held until it's been read in full
+    with _get_host_semaphore(url), _request(url, custom_http_errors, stream=True) as response, open(temp_filepath, 'wb') as file:
         for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
             _try_write_chunk(file, chunk)
     
@@ -66,18 +120,53 @@ def download(url: str, directory: str, filename: str, custom_http_errors: dict[i
         os.remove(final_filepath)
     os.rename(temp_filepath, final_filepath)
 
-def _get_response(url: str, custom_http_errors: dict[int, str] = None, stream = False):
+def _cache_response(
+    url: str,
+    response,
+    expiration: Expiration,
+    formatter: Callable[[str | dict | list], str | dict | list],
+    custom_http_errors: dict[int, str]):
+    
+    if response.status_code == _NOT_MODIFIED_STATUS_CODE:
+        profiler.count(_NOT_MODIFIED_COUNTER)
+        if (data := cache.renew(url, expiration)) != None:
+            return data
+        # the cached item couldn't be loaded and was removed, so it's requested again without validators
+        response = _get_response(url, custom_http_errors)
+
+    data = response.json() if _is_json(response) else response.text
+    data = formatter(data)
+    cache.add(url, expiration, data, response.headers.get(_ETAG_HEADER), response.headers.get(_LAST_MODIFIED_HEADER))
+    return data
+
+def _get_revalidation_headers(url: str):
+    (etag, last_modified) = cache.get_validators(url)
+    headers = {}
+    if etag != None:
+        headers[_IF_NONE_MATCH_HEADER] = etag
+    if last_modified != None:
+        headers[_IF_MODIFIED_SINCE_HEADER] = last_modified
+    return headers
+
+def _get_response(url: str, custom_http_errors: dict[int, str] = None, headers: dict[str, str] = None):
+    # the body is read while the request is made, so the host's semaphore is only held until it's made
+    with _get_host_semaphore(url):
+        return _request(url, custom_http_errors, headers=headers)
+
+def _request(url: str, custom_http_errors: dict[int, str] = None, stream = False, headers: dict[str, str] = None):
+    import requests # imported here because it's slow to import and most runs are served from the cache
+    profiler.count(_HTTP_REQUESTS_COUNTER)
     try:
         custom_http_errors = custom_http_errors or {}
-        response = requests.get(url, headers=_HEADERS, stream=stream, timeout=_TIMEOUT)
+        response = _get_session().get(url, headers=_HEADERS | (headers or {}), stream=stream, timeout=_TIMEOUT)
         response.raise_for_status()
         return response
-    except HTTPError as error:
+    except requests.HTTPError as error:
         status_code = error.response.status_code
         if status_code in custom_http_errors:
             raise ExpectedError(custom_http_errors[status_code]) from error
         raise ExpectedError(_HTTP_ERROR.format(url, error)) from error
-    except (ConnectTimeout, ReadTimeout, Timeout, ConnectionError) as error:
+    except (requests.ConnectTimeout, requests.ReadTimeout, requests.Timeout, requests.ConnectionError) as error:
         raise ExpectedError(_CONNECTION_ERROR.format(url)) from error
 
 def _try_write_chunk(file_writer: BufferedWriter, chunk):
@@ -87,5 +176,35 @@ def _try_write_chunk(file_writer: BufferedWriter, chunk):
     file_writer.flush()
     os.fsync(file_writer.fileno())
 
-def _is_json(response: Response):
-    return _JSON_CONTENT_TYPE in response.headers.get(_CONTENT_TYPE_HEADER)
\ No newline at end of file
+def _is_json(response: "requests.Response"):
+    return _JSON_CONTENT_TYPE in response.headers.get(_CONTENT_TYPE_HEADER)
+
+def _get_session():
+    # connections are kept alive and reused by every request, compressed responses are decoded by requests itself
+    global _session
+    with _session_lock:
+        if _session == None:
+            import requests
+            adapter = requests.adapters.HTTPAdapter(pool_connections=_MAX_POOLED_HOSTS, pool_maxsize=_MAX_REQUESTS_PER_HOST)
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+def _get_host_semaphore(url: str):
+    host = urlsplit(url).netloc
+    with _session_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(_MAX_REQUESTS_PER_HOST)
+        return _host_semaphores[host]
+
+def _reset_session():
+    global _session, _session_lock, _host_semaphores
+    _session = None
+    _session_lock = threading.Lock()
+    _host_semaphores = {}
+
+# forked worker processes open connections of their own instead of sharing the parent's sockets,
+# and can't be left waiting on locks held by threads which only exist in the parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_session)
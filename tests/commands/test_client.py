@@ -0,0 +1,25 @@
+import pytest, server, sys
+from pytest import MonkeyPatch
+from commands import client
+from core import ERROR_EXIT_CODE
+from test_utilities import FunctionMock
+
+_OUTPUT = "output"
+_ARGS = [ "input.filter", ".handler" ]
+
+def test_execute_should_send_the_args_and_write_the_output(monkeypatch: MonkeyPatch, capsys: pytest.CaptureFixture):
+    PORT = "1234"
+    send_mock = FunctionMock(monkeypatch, server.send, (_OUTPUT, 0))
+
+    client.execute([ "--port", PORT ] + _ARGS)
+
+    assert send_mock.received(int(PORT), _ARGS)
+    assert capsys.readouterr().out == _OUTPUT
+
+def test_execute_given_the_server_failed_should_exit_with_its_exit_code(monkeypatch: MonkeyPatch):
+    _ = FunctionMock(monkeypatch, server.send, (_OUTPUT, ERROR_EXIT_CODE))
+    sys_exit_mock = FunctionMock(monkeypatch, sys.exit)
+
+    client.execute(_ARGS)
+
+    assert sys_exit_mock.received(ERROR_EXIT_CODE)
@@ -0,0 +1,8 @@
+import commands, importlib, pytest
+
+@pytest.mark.parametrize("name", list(commands.COMMANDS))
+def test_commands_should_be_named_after_their_module(name: str):
+    module = importlib.import_module(f"commands.{name}")
+
+    assert module.NAME == name
+    assert commands.COMMANDS[name] == module.execute
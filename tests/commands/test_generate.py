@@ -1,11 +1,18 @@
-import pytest
+import pytest, json, builtins, console, memo, profiler, web, ggg, ninja
+from ninja import BaseQueryType
 from commands import generate
 from commands.generate import _HANDLER_NOT_FOUND_ERROR, _HANDLER_NOT_PROVIDED_ERROR, _TOO_LITTLE_ARGUMENTS_ERROR
+from commands.generate import _FILTER_SAVED_MESSAGE, _FILTER_UNCHANGED_MESSAGE
+from commands.generate import _MANIFEST_OPTION, _MANIFEST_NOT_FOUND_ERROR, _INVALID_MANIFEST_ERROR
+from commands.generate import _JOBS_OPTION, _MANIFEST_ARGUMENT_COUNT_ERROR, _INVALID_JOBS_ERROR
+from commands.generate import _PROFILE_OPTION, _PARSE_STEP, _SAVE_STEP, _HANDLE_STEP, _BLOCKS_COUNTER
+from concurrent.futures import ThreadPoolExecutor
+from commands.generate import _HandlerInvocation, _generate_filter
 from core import Delimiter, ExpectedError, Filter, Block
 from handlers.context import Context
 from handlers import Handler
 from pytest import MonkeyPatch
-from test_utilities import create_filter, FunctionMock
+from test_utilities import create_filter, FunctionMock, OpenMock
 
 class _MockHandler(Handler):
     def __init__(self):
@@ -48,6 +55,98 @@ def test_execute_given_a_handler_name_should_apply_it_and_save_the_new_filter(
     assert mock_handler.options_handled == OPTIONS
     assert save_filter_mock.get_invocation_count() == 1
 
+@pytest.mark.parametrize("changed, message", [ (True, _FILTER_SAVED_MESSAGE), (False, _FILTER_UNCHANGED_MESSAGE) ])
+def test_execute_should_report_whether_the_output_changed(
+    monkeypatch: MonkeyPatch, filter: Filter, mock_handler: _MockHandler, changed: bool, message: str):
+    
+    _ = FunctionMock(monkeypatch, Filter.save, changed, target=Filter)
+    write_mock = FunctionMock(monkeypatch, console.write, target=console)
+
+    generate.execute([ filter.filepath, Delimiter.HANDLER_START + mock_handler.name ])
+
+    assert write_mock.received(message.format(filter.filepath), done=True)
+
+def test_execute_given_only_per_block_handlers_should_stream_the_filter(monkeypatch: MonkeyPatch, filter: Filter):
+    OUTPUT_FILEPATH = "output_filepath"
+    HANDLER_NAME = "per_block_handler"
+    monkeypatch.setattr(generate, 'HANDLERS', { HANDLER_NAME: Handler(lambda block, _: block.lines, Context, is_per_block=True) })
+    written_blocks: list[Block] = []
+    _ = FunctionMock(monkeypatch, Filter.load_rules, filter, target=Filter)
+    read_blocks_mock = FunctionMock(monkeypatch, Filter.read_blocks, lambda _: iter(filter.blocks), target=Filter)
+    _ = FunctionMock(monkeypatch, Filter.write_blocks, lambda _, blocks: written_blocks.extend(blocks), target=Filter)
+
+    generate.execute([ filter.filepath, OUTPUT_FILEPATH, Delimiter.HANDLER_START + HANDLER_NAME ])
+
+    assert read_blocks_mock.received(filter.filepath)
+    assert [ str(block) for block in written_blocks ] == [ str(block) for block in filter.blocks ]
+
+def test_execute_given_per_block_handlers_and_the_same_output_filepath_should_stream_the_filter(
+    monkeypatch: MonkeyPatch, filter: Filter):
+    
+    HANDLER_NAME = "per_block_handler"
+    monkeypatch.setattr(generate, 'HANDLERS', { HANDLER_NAME: Handler(lambda block, _: block.lines, Context, is_per_block=True) })
+    _ = FunctionMock(monkeypatch, Filter.load_rules, filter, target=Filter)
+    read_blocks_mock = FunctionMock(monkeypatch, Filter.read_blocks, lambda _: iter(filter.blocks), target=Filter)
+    write_blocks_mock = FunctionMock(monkeypatch, Filter.write_blocks, lambda _, blocks: list(blocks), target=Filter)
+
+    generate.execute([ filter.filepath, Delimiter.HANDLER_START + HANDLER_NAME ])
+
+    assert read_blocks_mock.received(filter.filepath)
+    assert write_blocks_mock.received(filter.filepath)
+
+def test_execute_given_a_streamed_econ_chain_should_prefetch_the_query_types_of_its_rules(monkeypatch: MonkeyPatch, tmp_path):
+    INPUT_FILEPATH = tmp_path / "input.filter"
+    INPUT_FILEPATH.write_text(
+        f"Show\n    BaseType == \"x\" {Delimiter.RULE_START}econ cur 1\n\n"
+        f"Show\n    BaseType == \"x\" {Delimiter.RULE_START}econ div 1 {Delimiter.RULE_SEPARATOR}strict 2")
+    monkeypatch.setattr(memo.functions, "_entries", {})
+    monkeypatch.setattr(memo.functions, "_added_entries", {})
+    _ = FunctionMock(monkeypatch, memo.save, target=memo)
+    _ = FunctionMock(monkeypatch, ggg.get_league_name, "league")
+    _ = FunctionMock(monkeypatch, ninja.get_base_types, { "base type" })
+    prefetch_mock = FunctionMock(monkeypatch, ninja.prefetch)
+    read_blocks = Filter.read_blocks
+    read_blocks_mock = FunctionMock(monkeypatch, Filter.read_blocks, lambda filepath: read_blocks(filepath), target=Filter)
+
+    generate.execute([ str(INPUT_FILEPATH), str(tmp_path / "output.filter"),
+        Delimiter.HANDLER_START + "econ", Delimiter.HANDLER_START + "strict", "3" ])
+
+    assert read_blocks_mock.get_invocation_count() == 1 # the filter was streamed
+    assert prefetch_mock.received({ BaseQueryType.CURRENCY, BaseQueryType.DIVINATION_CARD }, "league")
+
+def test_execute_given_the_profile_option_should_report_every_step(
+    monkeypatch: MonkeyPatch, filter: Filter, mock_handler: _MockHandler):
+    
+    REPORT_FILEPATH = "report.json"
+    _ = FunctionMock(monkeypatch, Filter.save, target=Filter)
+    _ = FunctionMock(monkeypatch, profiler.write_report, target=profiler)
+    save_report_mock = FunctionMock(monkeypatch, profiler.save_report, target=profiler)
+
+    generate.execute([ _PROFILE_OPTION, REPORT_FILEPATH, filter.filepath, Delimiter.HANDLER_START + mock_handler.name ])
+
+    report = profiler.get_report()
+    assert save_report_mock.received(REPORT_FILEPATH)
+    assert not profiler.is_started()
+    assert report["counters"][_BLOCKS_COUNTER] == len(filter.blocks)
+    assert { _PARSE_STEP, _SAVE_STEP, _HANDLE_STEP.format(mock_handler.name) } <= report["timings"].keys()
+
+def test_execute_given_the_profile_option_without_a_report_file_should_count_the_streamed_blocks_without_saving_it(
+    monkeypatch: MonkeyPatch, filter: Filter):
+    
+    HANDLER_NAME = "per_block_handler"
+    monkeypatch.setattr(generate, 'HANDLERS', { HANDLER_NAME: Handler(lambda block, _: block.lines, Context, is_per_block=True) })
+    _ = FunctionMock(monkeypatch, Filter.load_rules, filter, target=Filter)
+    _ = FunctionMock(monkeypatch, Filter.read_blocks, lambda _: iter(filter.blocks), target=Filter)
+    _ = FunctionMock(monkeypatch, Filter.write_blocks, lambda _, blocks: list(blocks), target=Filter)
+    write_report_mock = FunctionMock(monkeypatch, profiler.write_report, target=profiler)
+    save_report_mock = FunctionMock(monkeypatch, profiler.save_report, target=profiler)
+
+    generate.execute([ _PROFILE_OPTION, filter.filepath, Delimiter.HANDLER_START + HANDLER_NAME ])
+
+    assert write_report_mock.get_invocation_count() == 1
+    assert save_report_mock.get_invocation_count() == 0
+    assert profiler.get_report()["counters"][_BLOCKS_COUNTER] == len(filter.blocks)
+
 def test_execute_given_less_than_2_args_should_raise():
     ARGS = [ "one" ]
 
@@ -71,4 +170,279 @@ def test_execute_given_an_unknown_handler_name_should_raise(filter: Filter):
     with pytest.raises(ExpectedError) as error:
         generate.execute(ARGS)
     
-    assert error.value.message == _HANDLER_NOT_FOUND_ERROR.format(HANDLER_NAME)
\ No newline at end of file
+    assert error.value.message == _HANDLER_NOT_FOUND_ERROR.format(HANDLER_NAME)
+
+def test_execute_given_a_manifest_should_apply_shared_handlers_once_and_save_every_output(monkeypatch: MonkeyPatch):
+    handled: list[str] = []
+    def create_handler(name: str):
+        def handle(block: Block, _):
+            handled.append(name)
+            return block.lines
+        return Handler(handle, Context)
+    monkeypatch.setattr(generate, 'HANDLERS', { name: create_handler(name) for name in [ "shared", "first", "second" ] })
+    MANIFEST = { "input": "input.filter", "outputs": [
+        { "path": "first.filter", "handlers": [ ".shared", ".first" ] },
+        { "path": "second.filter", "handlers": [ ".shared", ".second" ] } ] }
+    _ = OpenMock(monkeypatch, json.dumps(MANIFEST))
+    write_blocks_mock = FunctionMock(monkeypatch, Filter.write_blocks, target=Filter)
+
+    generate.execute([ _MANIFEST_OPTION, "manifest.json" ])
+
+    assert handled == [ "shared", "first", "second" ]
+    assert write_blocks_mock.received("first.filter")
+    assert write_blocks_mock.received("second.filter")
+
+def test_execute_given_a_manifest_should_not_let_outputs_modify_each_other(monkeypatch: MonkeyPatch, filter: Filter):
+    def comment_out(block: Block, _):
+        block.lines[0].comment_out()
+        return block.lines
+    monkeypatch.setattr(generate, 'HANDLERS', {
+        "comment_out": Handler(comment_out, Context, is_per_block=True),
+        "keep": Handler(lambda block, _: block.lines, Context, is_per_block=True) })
+    MANIFEST = { "input": filter.filepath, "outputs": [
+        { "path": "commented.filter", "handlers": [ ".comment_out" ] },
+        { "path": "kept.filter", "handlers": [ ".keep" ] } ] }
+    _ = OpenMock(monkeypatch, json.dumps(MANIFEST))
+    saved: dict[str, str] = {}
+    _ = FunctionMock(monkeypatch, Filter.write_blocks,
+        lambda filepath, blocks: saved.update({ filepath: "".join(str(block) for block in blocks) }), target=Filter)
+
+    generate.execute([ _MANIFEST_OPTION, "manifest.json" ])
+
+    assert saved["commented.filter"] != str(filter.blocks[0])
+    assert saved["kept.filter"] == str(filter.blocks[0])
+
+def test_execute_given_a_manifest_and_jobs_should_generate_every_branch_in_a_worker(monkeypatch: MonkeyPatch, filter: Filter):
+    handled: list[str] = []
+    def create_handler(name: str):
+        def handle(block: Block, _):
+            handled.append(name)
+            return block.lines
+        return Handler(handle, Context)
+    monkeypatch.setattr(generate, 'HANDLERS', { name: create_handler(name) for name in [ "shared", "first", "second" ] })
+    # performing this setattr is fine because it is an import from another module
+    monkeypatch.setattr(generate, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    MANIFEST = { "input": filter.filepath, "outputs": [
+        { "path": "first.filter", "handlers": [ ".shared", ".first" ] },
+        { "path": "second.filter", "handlers": [ ".shared", ".second" ] } ] }
+    _ = OpenMock(monkeypatch, json.dumps(MANIFEST))
+    saved: dict[str, str] = {}
+    _ = FunctionMock(monkeypatch, Filter.write_blocks,
+        lambda filepath, blocks: saved.update({ filepath: "".join(str(block) for block in blocks) }), target=Filter)
+
+    generate.execute([ _MANIFEST_OPTION, "manifest.json", _JOBS_OPTION, "2" ])
+
+    assert sorted(handled) == [ "first", "second", "shared" ]
+    assert saved == { "first.filter": str(filter.blocks[0]), "second.filter": str(filter.blocks[0]) }
+
+def test_execute_given_a_manifest_and_jobs_should_initialize_the_contexts_of_every_branch_before_starting_workers(
+    monkeypatch: MonkeyPatch, filter: Filter):
+    
+    events: list[str] = []
+    def create_handler(name: str):
+        def initialize_context(filter: Filter, options: list[str]):
+            events.append(f"initialize {name}")
+            return Context(filter, options)
+        def handle(block: Block, _):
+            events.append(f"handle {name}")
+            return block.lines
+        return Handler(handle, initialize_context, is_per_block=True)
+    monkeypatch.setattr(generate, 'HANDLERS', { name: create_handler(name) for name in [ "first", "second" ] })
+    # performing this setattr is fine because it is an import from another module
+    monkeypatch.setattr(generate, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    MANIFEST = { "input": filter.filepath, "outputs": [
+        { "path": "first.filter", "handlers": [ ".first" ] },
+        { "path": "second.filter", "handlers": [ ".second" ] } ] }
+    _ = OpenMock(monkeypatch, json.dumps(MANIFEST))
+    _ = FunctionMock(monkeypatch, Filter.write_blocks, lambda _, blocks: list(blocks), target=Filter)
+
+    generate.execute([ _MANIFEST_OPTION, "manifest.json", _JOBS_OPTION, "2" ])
+
+    assert events[:2] == [ "initialize first", "initialize second" ]
+    assert sorted(events[2:]) == [ "handle first", "handle second", "initialize first", "initialize second" ]
+
+def test_execute_given_a_manifest_and_jobs_with_chained_branches_should_apply_each_chain_in_its_worker(
+    monkeypatch: MonkeyPatch, filter: Filter):
+    
+    handled: list[str] = []
+    def create_handler(name: str):
+        def handle(block: Block, _):
+            handled.append(name)
+            return block.lines
+        return Handler(handle, Context)
+    monkeypatch.setattr(generate, 'HANDLERS', { name: create_handler(name) for name in [ "a", "b", "c", "d" ] })
+    # performing this setattr is fine because it is an import from another module
+    monkeypatch.setattr(generate, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    MANIFEST = { "input": filter.filepath, "outputs": [
+        { "path": "first.filter", "handlers": [ ".a", ".b", ".c" ] },
+        { "path": "second.filter", "handlers": [ ".a", ".b", ".d" ] } ] }
+    _ = OpenMock(monkeypatch, json.dumps(MANIFEST))
+    saved: list[str] = []
+    _ = FunctionMock(monkeypatch, Filter.write_blocks, lambda filepath, blocks: saved.append(filepath), target=Filter)
+
+    generate.execute([ _MANIFEST_OPTION, "manifest.json", _JOBS_OPTION, "2" ])
+
+    assert handled[:2] == [ "a", "b" ]
+    assert sorted(handled[2:]) == [ "c", "d" ]
+    assert sorted(saved) == [ "first.filter", "second.filter" ]
+
+def test_execute_given_a_manifest_and_jobs_and_a_branch_fails_should_raise_its_error(monkeypatch: MonkeyPatch, filter: Filter):
+    ERROR_MESSAGE = "error message"
+    def fail(block: Block, _):
+        raise ExpectedError(ERROR_MESSAGE)
+    monkeypatch.setattr(generate, 'HANDLERS', {
+        "fail": Handler(fail, Context),
+        "keep": Handler(lambda block, _: block.lines, Context) })
+    # performing this setattr is fine because it is an import from another module
+    monkeypatch.setattr(generate, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    MANIFEST = { "input": filter.filepath, "outputs": [
+        { "path": "failed.filter", "handlers": [ ".fail" ] },
+        { "path": "kept.filter", "handlers": [ ".keep" ] } ] }
+    _ = OpenMock(monkeypatch, json.dumps(MANIFEST))
+    _ = FunctionMock(monkeypatch, Filter.write_blocks, lambda _, blocks: list(blocks), target=Filter)
+
+    with pytest.raises(ExpectedError) as error:
+        generate.execute([ _MANIFEST_OPTION, "manifest.json", _JOBS_OPTION, "2" ])
+    
+    assert error.value.message == ERROR_MESSAGE
+
+@pytest.mark.parametrize("outputs", [
+    [ { "path": "only.filter", "handlers": [ ".shared" ] } ],
+    [ { "path": "shared.filter", "handlers": [ ".shared" ] }, { "path": "first.filter", "handlers": [ ".shared", ".first" ] } ] ])
+def test_execute_given_a_manifest_and_jobs_whose_tree_ends_in_a_single_branch_should_generate_it_without_workers(
+    monkeypatch: MonkeyPatch, filter: Filter, outputs: list[dict]):
+    
+    handled: list[str] = []
+    def create_handler(name: str):
+        def handle(block: Block, _):
+            handled.append(name)
+            return block.lines
+        return Handler(handle, Context)
+    monkeypatch.setattr(generate, 'HANDLERS', { name: create_handler(name) for name in [ "shared", "first" ] })
+    # performing this setattr is fine because it is an import from another module
+    monkeypatch.setattr(generate, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    _ = OpenMock(monkeypatch, json.dumps({ "input": filter.filepath, "outputs": outputs }))
+    saved: dict[str, str] = {}
+    _ = FunctionMock(monkeypatch, Filter.write_blocks,
+        lambda filepath, blocks: saved.update({ filepath: "".join(str(block) for block in blocks) }), target=Filter)
+
+    generate.execute([ _MANIFEST_OPTION, "manifest.json", _JOBS_OPTION, "2" ])
+
+    assert handled == [ output["handlers"][-1].lstrip(Delimiter.HANDLER_START) for output in outputs ]
+    assert saved == { output["path"]: str(filter.blocks[0]) for output in outputs }
+
+@pytest.mark.parametrize("args, message", [
+    ([ "manifest.json", "--unknown", "2" ], _MANIFEST_ARGUMENT_COUNT_ERROR),
+    ([ "manifest.json", _JOBS_OPTION ], _MANIFEST_ARGUMENT_COUNT_ERROR),
+    ([ "manifest.json", _JOBS_OPTION, "0" ], _INVALID_JOBS_ERROR.format("0")),
+    ([ "manifest.json", _JOBS_OPTION, "many" ], _INVALID_JOBS_ERROR.format("many")) ])
+def test_execute_given_invalid_manifest_arguments_should_raise(args: list[str], message: str):
+    with pytest.raises(ExpectedError) as error:
+        generate.execute([ _MANIFEST_OPTION ] + args)
+    
+    assert error.value.message == message
+
+def test_execute_given_an_unexistent_manifest_should_raise(monkeypatch: MonkeyPatch):
+    MANIFEST_FILEPATH = "manifest.json"
+    _ = FunctionMock(monkeypatch, builtins.open, FileNotFoundError)
+
+    with pytest.raises(ExpectedError) as error:
+        generate.execute([ _MANIFEST_OPTION, MANIFEST_FILEPATH ])
+    
+    assert error.value.message == _MANIFEST_NOT_FOUND_ERROR.format(MANIFEST_FILEPATH)
+
+@pytest.mark.parametrize("manifest", [ "not json", "[]", '{ "input": "input.filter" }', '{ "input": "input.filter", "outputs": [] }' ])
+def test_execute_given_an_invalid_manifest_should_raise(monkeypatch: MonkeyPatch, manifest: str):
+    MANIFEST_FILEPATH = "manifest.json"
+    _ = OpenMock(monkeypatch, manifest)
+
+    with pytest.raises(ExpectedError) as error:
+        generate.execute([ _MANIFEST_OPTION, MANIFEST_FILEPATH ])
+    
+    assert error.value.message == _INVALID_MANIFEST_ERROR.format(MANIFEST_FILEPATH)
+
+def test_generate_filter_given_consecutive_per_block_handlers_should_apply_them_in_a_single_pass(monkeypatch: MonkeyPatch):
+    handled: list[tuple[str, int]] = []
+    def create_handler(name: str):
+        def handle(block: Block, _):
+            handled.append((name, block.line_number))
+            return block.lines
+        return Handler(handle, Context, is_per_block=True)
+    monkeypatch.setattr(generate, 'HANDLERS', { "first": create_handler("first"), "second": create_handler("second") })
+    FILTER = create_filter("Show\nShow\nShow")
+
+    _ = _generate_filter(FILTER, [ _create_invocation("first"), _create_invocation("second") ])
+
+    assert handled == [ ("first", 1), ("first", 2), ("second", 1), ("first", 3), ("second", 2), ("second", 3) ]
+
+def test_generate_filter_given_per_block_handlers_should_match_applying_them_one_by_one():
+    TEXT = """Show #.multi
+        Class == "Currency" #.strict 2
+        #.multi
+        BaseType == "Chaos Orb"
+    Hide #.tag category tag
+        Class == "Gems"
+    Show #.strict 3.tag category tag"""
+    INVOCATIONS = [ _create_invocation("multi"), _create_invocation("strict", "3"), _create_invocation("tag", "category", "other") ]
+    
+    fused_filter = _generate_filter(create_filter(TEXT), INVOCATIONS)
+    sequential_filter = create_filter(TEXT)
+    for invocation in INVOCATIONS:
+        sequential_filter = _generate_filter(sequential_filter, [ invocation ])
+    
+    assert [ str(block) for block in fused_filter.blocks ] == [ str(block) for block in sequential_filter.blocks ]
+    assert [ block.line_number for block in fused_filter.blocks ] == [ block.line_number for block in sequential_filter.blocks ]
+
+def test_generate_filter_given_a_memoized_handler_and_an_unchanged_block_should_reuse_its_output(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(memo.functions, "_entries", {})
+    monkeypatch.setattr(memo.functions, "_added_entries", {})
+    handled_line_numbers: list[int] = []
+    def handle(block: Block, _):
+        handled_line_numbers.append(block.line_number)
+        block.hide()
+        return block.lines
+    monkeypatch.setattr(generate, 'HANDLERS', { "rule": Handler(handle, Context, is_per_block=True, is_memoized=True) })
+    TEXT = f"Show {Delimiter.RULE_START}rule\nShow\nShow {Delimiter.RULE_START}rule other"
+    
+    _ = _generate_filter(create_filter(TEXT), [ _create_invocation("rule") ])
+    filter = _generate_filter(create_filter(TEXT), [ _create_invocation("rule") ])
+
+    # blocks without the handler's rules are always handled
+    assert handled_line_numbers == [ 1, 2, 3, 2 ]
+    assert [ str(block).split()[0] for block in filter.blocks ] == [ "Hide", "Hide", "Hide" ]
+
+def test_generate_filter_given_a_memoized_handler_used_uncached_web_items_should_not_reuse_its_output(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(memo.functions, "_entries", {})
+    monkeypatch.setattr(memo.functions, "_added_entries", {})
+    _ = FunctionMock(monkeypatch, web.stop_tracking, { "https://www.site.com/": None }, target=web)
+    handled_line_numbers: list[int] = []
+    def handle(block: Block, _):
+        handled_line_numbers.append(block.line_number)
+        return block.lines
+    monkeypatch.setattr(generate, 'HANDLERS', { "rule": Handler(handle, Context, is_per_block=True, is_memoized=True) })
+    TEXT = f"Show {Delimiter.RULE_START}rule"
+
+    _ = _generate_filter(create_filter(TEXT), [ _create_invocation("rule") ])
+    _ = _generate_filter(create_filter(TEXT), [ _create_invocation("rule") ])
+
+    assert handled_line_numbers == [ 1, 1 ]
+    assert memo.get_added_entries() == {}
+
+def test_generate_filter_given_the_league_changed_should_not_reuse_the_econ_output_memoized_for_another_league(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(memo.functions, "_entries", {})
+    monkeypatch.setattr(memo.functions, "_added_entries", {})
+    _ = FunctionMock(monkeypatch, ninja.prefetch)
+    _ = FunctionMock(monkeypatch, ggg.get_league_name, (league for league in [ "old league", "new league" ]))
+    _ = FunctionMock(monkeypatch, ninja.get_base_types, lambda _, league, *__: { league })
+    TEXT = f"Show\n    BaseType == \"x\" {Delimiter.RULE_START}econ cur 1"
+
+    old_filter = _generate_filter(create_filter(TEXT), [ _create_invocation("econ") ])
+    new_filter = _generate_filter(create_filter(TEXT), [ _create_invocation("econ") ])
+
+    assert '"old league"' in str(old_filter.blocks[0])
+    assert '"new league"' in str(new_filter.blocks[0])
+
+def _create_invocation(handler_name: str, *options: str):
+    invocation = _HandlerInvocation(handler_name)
+    invocation.options = list(options)
+    return invocation
\ No newline at end of file
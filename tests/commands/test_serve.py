@@ -0,0 +1,47 @@
+import pytest, server, web, console
+from pytest import MonkeyPatch
+from core import ExpectedError, ERROR_EXIT_CODE
+from commands import serve, generate
+from commands.serve import _generate, _TOO_MANY_ARGS_ERROR
+from test_utilities import FunctionMock
+
+_ARGS = [ "input.filter", ".handler" ]
+
+def test_execute_should_serve_generate_requests_on_the_port_passed(monkeypatch: MonkeyPatch):
+    PORT = "1234"
+    serve_mock = FunctionMock(monkeypatch, server.serve)
+
+    serve.execute([ "--port", PORT ])
+
+    assert serve_mock.received(int(PORT), _generate)
+
+@pytest.mark.parametrize("args, extra_args", [ ([ "extra" ], "extra"), ([ "--port", "1234", "extra", "args" ], "extra args") ])
+def test_execute_given_arguments_other_than_the_port_should_raise(monkeypatch: MonkeyPatch, args: list[str], extra_args: str):
+    serve_mock = FunctionMock(monkeypatch, server.serve)
+
+    with pytest.raises(ExpectedError) as error:
+        serve.execute(args)
+    
+    assert error.value.message == _TOO_MANY_ARGS_ERROR.format(extra_args)
+    assert serve_mock.get_invocation_count() == 0
+
+def test_generate_should_return_the_output_of_the_generate_command(monkeypatch: MonkeyPatch):
+    MESSAGE = "generated"
+    _ = FunctionMock(monkeypatch, web.remove_stale_items, target=web)
+    generate_mock = FunctionMock(monkeypatch, generate.execute, lambda _: console.write(MESSAGE), target=generate)
+
+    (output, exit_code) = _generate(_ARGS)
+
+    assert generate_mock.received(_ARGS)
+    assert MESSAGE in output
+    assert exit_code == 0
+
+def test_generate_given_the_generate_command_fails_should_return_the_error(monkeypatch: MonkeyPatch):
+    ERROR_MESSAGE = "error message"
+    _ = FunctionMock(monkeypatch, web.remove_stale_items, target=web)
+    _ = FunctionMock(monkeypatch, generate.execute, ExpectedError(ERROR_MESSAGE), target=generate)
+
+    (output, exit_code) = _generate(_ARGS)
+
+    assert ERROR_MESSAGE in output
+    assert exit_code == ERROR_EXIT_CODE
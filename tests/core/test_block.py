@@ -1,4 +1,4 @@
-from core import Delimiter, Block, Operand, Operator
+from core import Delimiter, Block, Line, Operand, Operator
 
 _LINE_NUMBER = 1
 _DEFAULT_BLOCK_LINES = [ Operand.SHOW, f"{Operand.CLASS} {Operator.EQUALS} \"Currency\"", f"{Operand.BASE_TYPE} {Operator.EQUALS} \"Jeweller's Orb\"" ]
@@ -25,6 +25,40 @@ def test_extract_given_lines_that_represent_two_blocks_and_a_line_number_should_
     assert len(blocks[0].lines) == len(_DEFAULT_BLOCK_LINES)
     assert len(blocks[1].lines) == len(ANOTHER_BLOCK)
 
+def test_extract_given_line_objects_should_reuse_and_renumber_them():
+    LINE = Line(f"{Operand.SHOW} {Delimiter.RULE_START}rule", _LINE_NUMBER)
+    NEW_LINE_NUMBER = 5
+
+    blocks = Block.extract([ LINE ], NEW_LINE_NUMBER)
+
+    assert blocks[0].lines[0] is LINE
+    assert LINE.number == NEW_LINE_NUMBER
+    assert LINE.rules[0].line_number == NEW_LINE_NUMBER
+
+def test_extract_given_the_same_line_object_twice_should_copy_it():
+    LINE = Line(Operand.SHOW, _LINE_NUMBER)
+
+    blocks = Block.extract([ LINE, LINE ])
+
+    assert blocks[0].lines[0] is LINE
+    assert blocks[1].lines[0] is not LINE
+    assert str(blocks[1].lines[0]) == str(LINE)
+    assert blocks[1].lines[0].number == _LINE_NUMBER + 1
+
+def test_stream_should_yield_each_block_as_soon_as_it_is_complete():
+    yielded_lines: list[str] = []
+    def raw_lines():
+        for raw_line in _DEFAULT_BLOCK_LINES + [ Operand.HIDE ]:
+            yielded_lines.append(raw_line)
+            yield raw_line
+
+    blocks = Block.stream(raw_lines())
+    first_block = next(blocks)
+
+    assert len(first_block.lines) == len(_DEFAULT_BLOCK_LINES)
+    assert len(yielded_lines) == len(_DEFAULT_BLOCK_LINES) + 1
+    assert len(list(blocks)) == 1
+
 def test_hide_should_set_show_to_hide():
     block = _create_block(Operand.SHOW)
 
@@ -108,6 +142,29 @@ def test_get_rules_given_a_line_with_rules_should_return_rules_with_that_name():
 
     assert len(rules) == 2
 
+def test_get_rules_given_multiple_names_should_return_rules_in_line_order():
+    block = _create_block(f"{Operand.SHOW} {Delimiter.RULE_START}b", f"{Delimiter.RULE_START}a {Delimiter.RULE_SEPARATOR}b")
+
+    rules = block.get_rules([ "a", "b" ])
+
+    assert [ rule.name for rule in rules ] == [ "b", "a", "b" ]
+
+def test_get_rules_given_a_line_was_commented_out_should_not_return_its_rules():
+    RULE_NAME = "rule"
+    block = _create_block(Operand.SHOW, f"{Operand.CLASS} {Delimiter.RULE_START}{RULE_NAME}")
+    _ = block.get_rules(RULE_NAME)
+
+    block.comment_out()
+
+    assert block.get_rules(RULE_NAME) == []
+
+def test_get_rule_names_should_return_the_names_of_every_rule():
+    block = _create_block(f"{Operand.SHOW} {Delimiter.RULE_START}a {Delimiter.RULE_SEPARATOR}b", f"{Delimiter.RULE_START}a")
+
+    names = block.get_rule_names()
+
+    assert list(names) == [ "a", "b" ]
+
 def test_get_raw_lines_should_return_equivalent_raw_lines():
     block = _create_block(*_DEFAULT_BLOCK_LINES)
 
@@ -116,6 +173,16 @@ def test_get_raw_lines_should_return_equivalent_raw_lines():
     for raw_line in _DEFAULT_BLOCK_LINES:
         assert raw_line in raw_lines
 
+def test_copy_should_return_a_block_that_can_be_modified_without_affecting_the_original():
+    block = _create_block(*_DEFAULT_BLOCK_LINES)
+
+    copy = block.copy()
+    copy.hide()
+
+    assert copy.line_number == block.line_number
+    assert all(line._block is copy for line in copy.lines)
+    assert block.get_raw_lines() == list(_DEFAULT_BLOCK_LINES)
+
 def test_get_sieve_should_return_a_sieve_that_validates_the_lines_in_the_block():
     block = _create_block(*_DEFAULT_BLOCK_LINES, f"{Delimiter.COMMENT_START} a line without an operand")
 
@@ -125,6 +192,29 @@ def test_get_sieve_should_return_a_sieve_that_validates_the_lines_in_the_block()
     assert { Operand.CLASS: "Currency" } in sieve
     assert { Operand.CLASS: "Something else" } not in sieve
 
+def test_get_sieve_given_the_block_did_not_change_should_reuse_the_sieve():
+    block = _create_block(*_DEFAULT_BLOCK_LINES)
+
+    sieve = block.get_sieve()
+
+    assert block.get_sieve() is sieve
+
+def test_get_sieve_given_the_block_changed_should_create_a_new_sieve():
+    block = _create_block(*_DEFAULT_BLOCK_LINES)
+    _ = block.get_sieve()
+
+    block.upsert(Operand.CLASS, [ '"Gems"' ])
+
+    assert { Operand.CLASS: "Gems" } in block.get_sieve()
+
+def test_get_sieve_given_a_line_was_commented_out_should_exclude_it():
+    block = _create_block(*_DEFAULT_BLOCK_LINES)
+    _ = block.get_sieve()
+
+    block.lines[1].comment_out()
+
+    assert { Operand.CLASS: "Something else" } in block.get_sieve()
+
 def test_str_overload_should_contain_the_raw_lines():
     block = _create_block(*_DEFAULT_BLOCK_LINES)
 
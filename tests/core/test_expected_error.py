@@ -1,3 +1,4 @@
+import pickle
 from core import ExpectedError
 
 MESSAGE = "message"
@@ -18,4 +19,12 @@ def test_str_overload_should_contain_all_information_passed():
 
     assert MESSAGE in error_string
     assert str(LINE_NUMBER) in error_string
-    assert FILEPATH in error_string
\ No newline at end of file
+    assert FILEPATH in error_string
+def test_pickle_should_keep_all_information_passed():
+    error = ExpectedError(MESSAGE, filepath=FILEPATH)
+
+    unpickled_error: ExpectedError = pickle.loads(pickle.dumps(error))
+
+    assert unpickled_error.message == MESSAGE
+    assert unpickled_error.line_number == None
+    assert unpickled_error.filepath == FILEPATH
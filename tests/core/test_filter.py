@@ -1,8 +1,9 @@
-import builtins, pytest, os
+import builtins, pytest, os, stat
 from pytest import MonkeyPatch
-from core.filter import _FILE_EXISTS_ERROR, _FILE_NOT_FOUND_ERROR, _PERMISSION_ERROR
-from core import Filter, ExpectedError, Block, FILE_ENCODING
-from test_utilities import FunctionMock, OpenMock
+from core.filter import _FILE_EXISTS_ERROR, _FILE_NOT_FOUND_ERROR, _PERMISSION_ERROR, _TEMP_FILEPATH_TEMPLATE
+from core import Filter, ExpectedError, Block, FILE_ENCODING, filter_cache
+from core import Delimiter, Operand
+from test_utilities import FunctionMock, OpenMock, create_filter
 
 _INPUT_FILEPATH = "input_filepath"
 _OUTPUT_FILEPATH = "output_filepath"
@@ -17,6 +18,45 @@ def test_load_given_a_valid_filepath_should_return_a_filter(monkeypatch: MonkeyP
     assert filter.filepath == _INPUT_FILEPATH
     assert [ str(line) for line in filter.blocks[0].lines ] == _LINES
 
+def test_get_rules_should_return_the_rules_in_every_block_in_order():
+    filter = create_filter(
+    f"""{Operand.SHOW} {Delimiter.RULE_START}a 1
+        {Delimiter.RULE_START}b 2
+    {Operand.HIDE}
+    {Operand.SHOW} {Delimiter.RULE_START}a 3""")
+
+    rules = filter.get_rules([ "a", "b" ])
+
+    assert [ rule.description for rule in rules ] == [ "1", "2", "3" ]
+
+def test_get_blocks_should_return_only_the_blocks_with_the_rule():
+    filter = create_filter(
+    f"""{Operand.SHOW}
+    {Operand.HIDE} {Delimiter.RULE_START}rule""")
+
+    blocks = filter.get_blocks("rule")
+
+    assert blocks == [ filter.blocks[1] ]
+
+def test_get_blocks_given_a_rule_was_commented_out_should_not_return_its_block():
+    filter = create_filter(f"{Operand.SHOW} {Delimiter.RULE_START}rule")
+    _ = filter.get_blocks("rule")
+
+    filter.blocks[0].comment_out()
+
+    assert filter.get_blocks("rule") == []
+
+def test_copy_should_return_a_filter_that_can_be_modified_without_affecting_the_original():
+    filter = create_filter(f"{Operand.SHOW} {Delimiter.RULE_START}rule\n{Operand.SHOW}")
+
+    copy = filter.copy()
+    copy.blocks[0].hide()
+
+    assert copy.filepath == filter.filepath
+    assert copy.get_blocks("rule") == [ copy.blocks[0] ]
+    assert [ str(block) for block in copy.blocks[1:] ] == [ str(block) for block in filter.blocks[1:] ]
+    assert filter.blocks[0].lines[0].operand == Operand.SHOW
+
 _OPEN_FILE_EXCEPTIONS = [ (FileNotFoundError, _FILE_NOT_FOUND_ERROR), (PermissionError, _PERMISSION_ERROR) ]
 @pytest.mark.parametrize("error_to_raise, error_message", _OPEN_FILE_EXCEPTIONS)
 def test_load_given_file_is_not_found_should_raise(
@@ -29,19 +69,108 @@ def test_load_given_file_is_not_found_should_raise(
     assert error.value.message == error_message
     assert error.value.filepath == _INPUT_FILEPATH
 
+def test_load_given_a_cache_directory_should_load_through_the_cache(monkeypatch: MonkeyPatch):
+    CACHE_DIR = "cache_dir"
+    BLOCKS = create_filter("Show").blocks
+    cache_load_mock = FunctionMock(monkeypatch, filter_cache.load, BLOCKS, target=filter_cache)
+
+    filter = Filter.load(_INPUT_FILEPATH, CACHE_DIR)
+
+    assert cache_load_mock.received(_INPUT_FILEPATH, CACHE_DIR)
+    assert filter.blocks == BLOCKS
+
+@pytest.mark.parametrize("error_to_raise, error_message", _OPEN_FILE_EXCEPTIONS)
+def test_load_given_a_cache_directory_and_file_is_not_found_should_raise(
+    monkeypatch: MonkeyPatch, error_to_raise: Exception, error_message: str):
+    _ = FunctionMock(monkeypatch, filter_cache.load, error_to_raise, target=filter_cache)
+
+    with pytest.raises(ExpectedError) as error:
+        _ = Filter.load(_INPUT_FILEPATH, "cache_dir")
+    
+    assert error.value.message == error_message
+
 def test_save_should_save_the_lines_in_the_filter(monkeypatch: MonkeyPatch):
     DIRECTORY = "directory"
     FILTER = Filter(_INPUT_FILEPATH, Block.extract(_LINES))
+    TEMP_FILEPATH = _TEMP_FILEPATH_TEMPLATE.format(_OUTPUT_FILEPATH, os.getpid())
     open_mock = OpenMock(monkeypatch, _LINES)
     dirname_mock = FunctionMock(monkeypatch, os.path.dirname, DIRECTORY)
     makedirs_mock = FunctionMock(monkeypatch, os.makedirs)
+    replace_mock = FunctionMock(monkeypatch, os.replace, target=os)
 
     FILTER.save(_OUTPUT_FILEPATH)
 
     assert dirname_mock.received(_OUTPUT_FILEPATH)
     assert makedirs_mock.received(DIRECTORY, exist_ok=True)
-    assert open_mock.received(_OUTPUT_FILEPATH, "w", encoding=FILE_ENCODING)
+    assert open_mock.received(TEMP_FILEPATH, "w", encoding=FILE_ENCODING)
     assert open_mock.file.got_written(str(FILTER.blocks[0]))
+    assert replace_mock.received(TEMP_FILEPATH, _OUTPUT_FILEPATH)
+
+def test_write_blocks_given_the_blocks_fail_to_be_generated_should_leave_the_file_untouched(tmp_path):
+    FILEPATH = tmp_path / "output.filter"
+    FILEPATH.write_text("original")
+    def generate_blocks():
+        yield Block.extract(_LINES)[0]
+        raise ExpectedError("error")
+
+    with pytest.raises(ExpectedError):
+        Filter.write_blocks(str(FILEPATH), generate_blocks())
+    
+    assert FILEPATH.read_text() == "original"
+    assert os.listdir(tmp_path) == [ FILEPATH.name ]
+
+@pytest.mark.skipif(os.name == "nt", reason="file modes other than read-only aren't supported on Windows")
+def test_write_blocks_given_the_file_exists_should_keep_its_mode(tmp_path):
+    FILEPATH = tmp_path / "output.filter"
+    FILEPATH.write_text("original")
+    MODE = 0o604
+    os.chmod(FILEPATH, MODE)
+
+    changed = Filter.write_blocks(str(FILEPATH), Block.extract(_LINES))
+
+    assert changed
+    assert stat.S_IMODE(os.stat(FILEPATH).st_mode) == MODE
+
+def test_save_given_the_file_has_the_same_contents_should_not_rewrite_it(tmp_path):
+    FILEPATH = str(tmp_path / "output.filter")
+    filter = Filter(_INPUT_FILEPATH, Block.extract(_LINES))
+    filter.save(FILEPATH)
+    modified_time = os.stat(FILEPATH).st_mtime_ns
+
+    changed = filter.save(FILEPATH)
+
+    assert not changed
+    assert os.stat(FILEPATH).st_mtime_ns == modified_time
+
+@pytest.mark.parametrize("contents", [ "Hide", "\n".join(_LINES).replace("1", "3") ])
+def test_save_given_the_file_has_different_contents_should_rewrite_it(tmp_path, contents: str):
+    FILEPATH = tmp_path / "output.filter"
+    FILEPATH.write_text(contents)
+    filter = Filter(_INPUT_FILEPATH, Block.extract(_LINES))
+
+    changed = filter.save(str(FILEPATH))
+
+    assert changed
+    assert FILEPATH.read_text() == str(filter.blocks[0])
+
+def test_load_rules_should_only_load_the_lines_with_the_rules_and_keep_their_line_numbers(tmp_path):
+    FILEPATH = tmp_path / "input.filter"
+    FILEPATH.write_text(
+        f"Show {Delimiter.RULE_START}a 1\n    BaseType \"b\"\n\n"
+        f"Show {Delimiter.RULE_START}c 2\n    Rarity Unique {Delimiter.RULE_START}b 3 {Delimiter.RULE_SEPARATOR}a 4")
+
+    filter = Filter.load_rules(str(FILEPATH), "a")
+
+    assert [ (rule.line_number, rule.description) for rule in filter.get_rules("a") ] == [ (1, "1"), (5, "4") ]
+    assert len(filter.blocks) == 2
+
+def test_read_blocks_should_yield_blocks_lazily(monkeypatch: MonkeyPatch):
+    _ = OpenMock(monkeypatch, _LINES)
+
+    blocks = Filter.read_blocks(_INPUT_FILEPATH)
+
+    assert [ str(line) for line in next(blocks).lines ] == _LINES
+    assert next(blocks, None) is None
 
 _WRITE_FILE_EXCEPTIONS = [ (FileExistsError, _FILE_EXISTS_ERROR), (PermissionError, _PERMISSION_ERROR) ]
 @pytest.mark.parametrize("exception_to_raise, error_message", _WRITE_FILE_EXCEPTIONS)
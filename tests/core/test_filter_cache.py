@@ -0,0 +1,87 @@
+import os, pytest
+from pathlib import Path
+from pytest import MonkeyPatch
+from core import filter_cache, Block
+from test_utilities import FunctionMock
+
+_TEXT = """Show #.strict 2
+    Class == "Currency" # comment
+    BaseType == "Chaos Orb" "Divine Orb"
+# section
+
+Hide
+    SetFontSize 45"""
+
+@pytest.fixture()
+def filepath(tmp_path: Path):
+    filepath = tmp_path / "input.filter"
+    filepath.write_text(_TEXT)
+    return str(filepath)
+
+@pytest.fixture()
+def cache_dir(tmp_path: Path):
+    return str(tmp_path / "cache")
+
+def test_load_given_the_file_is_not_cached_should_parse_it_and_cache_it(filepath: str, cache_dir: str):
+    blocks = filter_cache.load(filepath, cache_dir)
+
+    assert "\n".join(str(block) for block in blocks) == _TEXT
+    assert len(os.listdir(cache_dir)) == 1
+
+def test_load_given_the_file_did_not_change_should_not_parse_it(monkeypatch: MonkeyPatch, filepath: str, cache_dir: str):
+    _ = filter_cache.load(filepath, cache_dir)
+    stream_mock = FunctionMock(monkeypatch, Block.stream, target=Block)
+
+    blocks = filter_cache.load(filepath, cache_dir)
+
+    assert stream_mock.get_invocation_count() == 0
+    assert "\n".join(str(block) for block in blocks) == _TEXT
+    assert [ block.line_number for block in blocks ] == [ 1, 6 ]
+    assert blocks[0].get_rules("strict")[0].line_number == 1
+    assert all(line._block is block for block in blocks for line in block.lines)
+
+def test_load_given_only_the_modification_time_changed_should_not_parse_it(
+    monkeypatch: MonkeyPatch, filepath: str, cache_dir: str):
+    
+    _ = filter_cache.load(filepath, cache_dir)
+    os.utime(filepath, ns=(0, 0))
+    stream_mock = FunctionMock(monkeypatch, Block.stream, target=Block)
+
+    blocks = filter_cache.load(filepath, cache_dir)
+
+    assert stream_mock.get_invocation_count() == 0
+    assert "\n".join(str(block) for block in blocks) == _TEXT
+
+def test_load_given_the_file_changed_should_parse_it_again(filepath: str, cache_dir: str):
+    NEW_TEXT = "Show\n    Class == \"Gems\""
+    _ = filter_cache.load(filepath, cache_dir)
+    Path(filepath).write_text(NEW_TEXT)
+
+    blocks = filter_cache.load(filepath, cache_dir)
+
+    assert "\n".join(str(block) for block in blocks) == NEW_TEXT
+
+def test_load_given_the_cache_is_corrupted_should_parse_the_file(filepath: str, cache_dir: str):
+    _ = filter_cache.load(filepath, cache_dir)
+    for filename in os.listdir(cache_dir):
+        Path(cache_dir, filename).write_bytes(b"corrupted")
+
+    blocks = filter_cache.load(filepath, cache_dir)
+
+    assert "\n".join(str(block) for block in blocks) == _TEXT
+
+def test_load_given_the_cache_cannot_be_replaced_should_keep_the_previous_one_whole(
+    monkeypatch: MonkeyPatch, filepath: str, cache_dir: str):
+    
+    _ = filter_cache.load(filepath, cache_dir)
+    cache_filenames = os.listdir(cache_dir)
+    cached_bytes = Path(cache_dir, cache_filenames[0]).read_bytes()
+    NEW_TEXT = _TEXT.replace("45", "40")
+    Path(filepath).write_text(NEW_TEXT)
+    _ = FunctionMock(monkeypatch, os.replace, PermissionError, target=os)
+
+    blocks = filter_cache.load(filepath, cache_dir)
+
+    assert "\n".join(str(block) for block in blocks) == NEW_TEXT
+    assert os.listdir(cache_dir) == cache_filenames
+    assert Path(cache_dir, cache_filenames[0]).read_bytes() == cached_bytes
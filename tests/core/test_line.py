@@ -1,6 +1,7 @@
 import pytest
 from core import ExpectedError, Line, Operand, Delimiter, Operator, BLOCK_STARTERS
 from core.line import _MULTILINE_STRING_ERROR
+from core.rule import _EMPTY_RULE_ERROR
 
 _LINE_NUMBER = 1
 
@@ -36,6 +37,53 @@ def test_constructor_given_a_valid_line_text_should_parse_it_into_its_parts(
     assert value in line.values or value == ''
     assert line.comment == comment
 
+_TOKENIZED_LINES = [
+    ('BaseType == "Chaos Orb" "Exalted Orb"', "BaseType", "==", [ '"Chaos Orb"', '"Exalted Orb"' ], ""),
+    ('BaseType=="Chaos Orb"', 'BaseType=="Chaos', "", [ 'Orb' ], ""),
+    ('BaseType "unclosed value', "BaseType", "", [ "unclosed", "value" ], ""),
+    ('BaseType "" "a"b "c', "BaseType", "", [ '""', '"a"', "b", "c" ], ""),
+    ("AreaLevel >=2 -1 --2 a-b _c", "AreaLevel", ">=2", [ "-1", "-2", "a", "-b", "_c" ], ""),
+    ("SetFontSize !45 , 32#comment", "SetFontSize", "!45", [ "32" ], "#comment"),
+    ("Show#comment", "Show", "", [], "#comment"),
+    ("Rarity < Rare # #two comments", "Rarity", "<", [ "Rare" ], "# #two comments"),
+]
+@pytest.mark.parametrize("text, operand, operator, values, comment", _TOKENIZED_LINES)
+def test_constructor_given_an_edge_case_should_tokenize_it_as_expected(
+    text: str, operand: str, operator: str, values: list[str], comment: str):
+    
+    line = Line(text, _LINE_NUMBER)
+
+    assert line.operand == operand
+    assert line.operator == operator
+    assert line.values == values
+    assert line.comment == comment
+
+@pytest.mark.parametrize("text", [ "", "   ", f"\t{Delimiter.COMMENT_START}  a   spaced   comment", f"  {Delimiter.RULE_START}rule  description" ])
+def test_constructor_given_a_comment_or_empty_line_should_keep_its_text(text: str):
+    line = Line(text, _LINE_NUMBER)
+
+    assert str(line) == text.rstrip()
+    assert line.indentation + line.comment == text.rstrip()
+    assert not line.has_filter_info()
+
+def test_constructor_given_an_invalid_rule_should_raise_only_once_rules_are_accessed():
+    line = Line(f"{Operand.SHOW} {Delimiter.RULE_START}", _LINE_NUMBER)
+
+    with pytest.raises(ExpectedError) as error:
+        _ = line.rules
+    
+    assert line.operand == Operand.SHOW
+    assert error.value.message == _EMPTY_RULE_ERROR
+
+def test_constructor_given_repeated_parts_should_share_them_between_lines():
+    TEXT = f'{Operand.BASE_TYPE} {Operator.EQUALS} "Chaos Orb"'
+
+    first_line = Line(TEXT, _LINE_NUMBER)
+    second_line = Line(TEXT, _LINE_NUMBER + 1)
+
+    assert first_line.operand is second_line.operand
+    assert first_line.values[0] is second_line.values[0]
+
 @pytest.mark.parametrize("operand, expected", [ (BLOCK_STARTERS[0], True), ("not_a_block_starter", False) ])
 def test_is_block_starter_given_an_operand_should_return_as_expected(operand: str, expected: bool):
     line = Line(operand, _LINE_NUMBER)
@@ -121,6 +169,15 @@ def test_comment_out_should_comment_out_the_line():
     assert line.values == []
     assert TEXT in line.comment
 
+def test_setters_should_update_the_text():
+    line = Line(f"{Operand.CLASS} {Operator.EQUALS} \"Currency\" {Delimiter.COMMENT_START} comment", _LINE_NUMBER)
+
+    line.operand = Operand.BASE_TYPE
+    line.operator = Operator.GREATER_EQUALS
+    line.values = [ '"Chaos Orb"' ]
+
+    assert str(line) == f"{Operand.BASE_TYPE} {Operator.GREATER_EQUALS} \"Chaos Orb\" {Delimiter.COMMENT_START} comment"
+
 def test_str_overload_should_return_the_input_text():
     TEXT = f"operand == value {Delimiter.COMMENT_START} a comment"
     line = Line(TEXT, _LINE_NUMBER)
@@ -1,6 +1,6 @@
-import pytest
-from core import ExpectedError, Operator, Operand
-from core.sieve import _BOOL_OPERATOR_ERROR, _INT_OPERATOR_ERROR, _INT_VALUE_ERROR, _STR_OPERATOR_ERROR, _BOOL_VALUE_ERROR
+import pytest, gc
+from core import ExpectedError, Operator, Operand, Line, Sieve
+from core.sieve import _Condition, _BOOL_OPERATOR_ERROR, _INT_OPERATOR_ERROR, _INT_VALUE_ERROR, _STR_OPERATOR_ERROR, _BOOL_VALUE_ERROR
 from test_utilities import create_sieve_for_text
 
 _STR_OPERAND = "StrOperand"
@@ -116,9 +116,8 @@ def test_in_operator_given_int_value_doesnt_apply_should_return_false():
     assert _PATTERN not in sieve
 
 def test_in_operator_given_invalid_int_operator_should_raise():
-    INVALID_OPERATOR = "invalid_operator"
-    sieve = create_sieve_for_text(f'{_INT_OPERAND} {Operator.LESS} {_INT_VALUE}')
-    sieve._lines_by_operand[_INT_OPERAND][0].operator = INVALID_OPERATOR
+    INVALID_OPERATOR = "|"
+    sieve = create_sieve_for_text(f'{_INT_OPERAND} {INVALID_OPERATOR} {_INT_VALUE}')
 
     with pytest.raises(ExpectedError) as error:
         _PATTERN in sieve
@@ -142,4 +141,52 @@ def test_in_operator_given_multiple_lines_with_the_same_operator_should_check_al
         {_STR_OPERAND} {Operator.EQUALS} {_STR_VALUE}
         {_STR_OPERAND} {Operator.EQUALS} "another value"''')
     
-    assert _PATTERN not in sieve
\ No newline at end of file
+    assert _PATTERN not in sieve
+def test_in_operator_given_values_of_different_types_should_compare_each_one_against_the_same_line():
+    sieve = create_sieve_for_text(f'{_INT_OPERAND} {Operator.EQUALS} {_INT_VALUE}')
+
+    assert { _INT_OPERAND: _INT_VALUE } in sieve
+    assert { _INT_OPERAND: str(_INT_VALUE) } in sieve
+    assert { _INT_OPERAND: _INT_VALUE + 1 } not in sieve
+    assert { _INT_OPERAND: "another value" } not in sieve
+
+def test_filter_given_a_list_of_patterns_should_return_whether_each_one_is_contained():
+    sieve = create_sieve_for_text(
+    f'''{_STR_OPERAND} {Operator.EQUALS} "{_STR_VALUE}"
+        {_INT_OPERAND} {Operator.GREATER_EQUALS} {_INT_VALUE}''')
+    PATTERNS = [
+        { _STR_OPERAND: _STR_VALUE, _INT_OPERAND: _INT_VALUE },
+        { _STR_OPERAND: "another value", _INT_OPERAND: _INT_VALUE },
+        { _INT_OPERAND: _INT_VALUE - 1 },
+        { _BOOL_OPERAND: _BOOL_VALUE },
+        { _STR_OPERAND: None } ]
+
+    mask = sieve.filter(PATTERNS)
+
+    assert mask == [ pattern in sieve for pattern in PATTERNS ] == [ True, False, False, True, False ]
+
+def test_filter_given_columns_should_return_whether_each_pattern_is_contained():
+    sieve = create_sieve_for_text(
+    f'''{_INT_OPERAND} {Operator.GREATER} {_INT_VALUE}
+        {_BOOL_OPERAND} {Operator.EQUALS} {_BOOL_VALUE}''')
+    COLUMNS = {
+        _INT_OPERAND: [ _INT_VALUE, _INT_VALUE + 1, _INT_VALUE + 1 ],
+        _BOOL_OPERAND: [ _BOOL_VALUE, _BOOL_VALUE, not _BOOL_VALUE ] }
+
+    mask = sieve.filter(COLUMNS)
+
+    assert mask == [ False, True, False ]
+
+def test_filter_given_no_patterns_should_return_an_empty_mask():
+    sieve = create_sieve_for_text(f'{_INT_OPERAND} {Operator.GREATER} {_INT_VALUE}')
+
+    assert sieve.filter([]) == []
+    assert sieve.filter({}) == []
+
+def test_sieve_should_not_keep_references_to_its_lines():
+    line = Line(f'{_STR_OPERAND} {Operator.EQUALS} "{_STR_VALUE}"', 1)
+
+    sieve = Sieve([ line ])
+
+    assert _PATTERN in sieve
+    assert not any(isinstance(referrer, _Condition) for referrer in gc.get_referrers(line))
@@ -1,10 +1,10 @@
 import pytest, ggg, ninja
-from handlers import econ, Context
+from handlers import econ
 from pytest import MonkeyPatch
-from ninja import ValueRange, BaseQueryType
+from ninja import ValueRange, BaseQueryType, MiscQueryType
 from core import ExpectedError, Operator, Operand, Delimiter
 from test_utilities import FunctionMock, create_filter
-from handlers.econ import _BASE_QUERY_TYPES_BY_MNEMONIC, _CLUSTER_JEWEL_ENCHANT_MNEMONIC, _LOWER_BOUND_NAME, _RULE_BOUNDS_ERROR, _RULE_MNEMONIC_ERROR, _UPPER_BOUND_NAME, NAME as ECON, _RULE_PARAMETER_COUNT_ERROR
+from handlers.econ import EconContext, _UNIQUE_BASE_QUERY_TYPES, _BASE_QUERY_TYPES_BY_MNEMONIC, _CLUSTER_JEWEL_ENCHANT_MNEMONIC, _LOWER_BOUND_NAME, _RULE_BOUNDS_ERROR, _RULE_MNEMONIC_ERROR, _UPPER_BOUND_NAME, NAME as ECON, _RULE_PARAMETER_COUNT_ERROR
 
 _LEAGUE_NAME = "league_name"
 _NON_INT = "non_int"
@@ -14,6 +14,24 @@ _BASE_QUERY_TYPE = BaseQueryType.CURRENCY # chosen arbitrarily
 def get_league_name_mock(monkeypatch: MonkeyPatch):
     return FunctionMock(monkeypatch, ggg.get_league_name, _LEAGUE_NAME)
 
+@pytest.fixture(autouse=True)
+def prefetch_mock(monkeypatch: MonkeyPatch):
+    return FunctionMock(monkeypatch, ninja.prefetch)
+
+def test_context_should_prefetch_every_query_type_used_in_the_filter_once(prefetch_mock: FunctionMock):
+    FILTER = create_filter("\n".join([
+        f"{Delimiter.RULE_START}{ECON} {_get_mnemonic(_BASE_QUERY_TYPE)} 1",
+        f"{Delimiter.RULE_START}{ECON} {_get_mnemonic(_BASE_QUERY_TYPE)} 2 {Delimiter.RULE_SEPARATOR}{ECON} uni 1",
+        f"{Delimiter.RULE_START}{ECON} {_CLUSTER_JEWEL_ENCHANT_MNEMONIC} 1",
+        f"{Delimiter.RULE_START}{ECON} unknown_mnemonic 1",
+        f"{Delimiter.RULE_START}{ECON}" ]))
+
+    _ = EconContext(FILTER, [])
+
+    expected_query_types = { _BASE_QUERY_TYPE, MiscQueryType.CLUSTER_JEWEL } | _UNIQUE_BASE_QUERY_TYPES
+    assert prefetch_mock.received(expected_query_types, _LEAGUE_NAME)
+    assert prefetch_mock.get_invocation_count() == 1
+
 def test_handle_given_a_valid_mnemonic_should_set_the_base_types_to_the_block(monkeypatch: MonkeyPatch):
     LOWER_BOUND = 1
     UPPER_BOUND = 4
@@ -22,7 +40,7 @@ def test_handle_given_a_valid_mnemonic_should_set_the_base_types_to_the_block(mo
     FILTER = create_filter(f"{Operand.BASE_TYPE} {Delimiter.RULE_START}{ECON} {MNEMONIC} {LOWER_BOUND} {UPPER_BOUND}")
     ninja_mock = FunctionMock(monkeypatch, ninja.get_base_types, BASE_TYPES)
 
-    lines = econ.handle(FILTER.blocks[0], Context(FILTER, []))
+    lines = econ.handle(FILTER.blocks[0], EconContext(FILTER, []))
 
     assert ninja_mock.received(_BASE_QUERY_TYPE, _LEAGUE_NAME, ValueRange(LOWER_BOUND, UPPER_BOUND))
     for base_type in BASE_TYPES:
@@ -36,7 +54,7 @@ def test_handle_given_multiple_rules_in_the_same_block_should_aggregate_all_of_t
     FILTER = create_filter(f"{Operand.BASE_TYPE} {Delimiter.RULE_START}{ECON} {FIRST_MNEMONIC} 1 {Delimiter.RULE_SEPARATOR}{ECON} {SECOND_MNEMONIC} 1")
     _ = FunctionMock(monkeypatch, ninja.get_base_types, (x for x in [ FIRST_BASE_TYPES, SECOND_BASE_TYPES ]))
 
-    lines = econ.handle(FILTER.blocks[0], Context(FILTER, []))
+    lines = econ.handle(FILTER.blocks[0], EconContext(FILTER, []))
 
     for base_type in FIRST_BASE_TYPES | SECOND_BASE_TYPES:
             assert f'"{base_type}"' in lines[0]
@@ -48,7 +66,7 @@ def test_handle_given_a_cluster_jewel_mnemonic_should_set_the_enchantment_passiv
     FILTER = create_filter(f"{Operand.ENCHANTMENT_PASSIVE_NODE} {Delimiter.RULE_START}{ECON} {_CLUSTER_JEWEL_ENCHANT_MNEMONIC} {LOWER_BOUND} {UPPER_BOUND}")
     ninja_mock = FunctionMock(monkeypatch, ninja.get_cluster_enchants, ENCHANTS)
 
-    lines = econ.handle(FILTER.blocks[0], Context(FILTER, []))
+    lines = econ.handle(FILTER.blocks[0], EconContext(FILTER, []))
 
     assert ninja_mock.received(_LEAGUE_NAME, ValueRange(LOWER_BOUND, UPPER_BOUND))
     for base_type in ENCHANTS:
@@ -60,7 +78,7 @@ def test_handle_given_incorrect_rule_params_count_should_raise(param_count: int)
     FILTER = create_filter(f"{Delimiter.RULE_START}{ECON} {' '.join(PARAMS)}")
 
     with pytest.raises(ExpectedError) as error:
-        _ = econ.handle(FILTER.blocks[0], Context(FILTER, []))
+        _ = econ.handle(FILTER.blocks[0], EconContext(FILTER, []))
     
     assert error.value.message == _RULE_PARAMETER_COUNT_ERROR.format(param_count)
     assert error.value.line_number == FILTER.blocks[0].lines[0].number
@@ -70,7 +88,7 @@ def test_handle_given_unknown_mnemonic_should_raise():
     FILTER = create_filter(f"{Delimiter.RULE_START}{ECON} {UNKNOWN_MNEMONIC} 1")
 
     with pytest.raises(ExpectedError) as error:
-        _ = econ.handle(FILTER.blocks[0], Context(FILTER, []))
+        _ = econ.handle(FILTER.blocks[0], EconContext(FILTER, []))
     
     assert error.value.message == _RULE_MNEMONIC_ERROR.format(UNKNOWN_MNEMONIC)
     assert error.value.line_number == FILTER.blocks[0].lines[0].number
@@ -84,7 +102,7 @@ def test_handle_given_non_int_rule_params_should_raise(param_1: str, param_2: st
     FILTER = create_filter(f"{Delimiter.RULE_START}{ECON} {MNEMONIC} {param_1} {param_2}")
 
     with pytest.raises(ExpectedError) as error:
-        _ = econ.handle(FILTER.blocks[0], Context(FILTER, []))
+        _ = econ.handle(FILTER.blocks[0], EconContext(FILTER, []))
 
     assert error.value.message == _RULE_BOUNDS_ERROR.format(bound_name, _NON_INT)
     assert error.value.line_number == FILTER.blocks[0].lines[0].number
@@ -94,9 +112,9 @@ def test_handle_given_no_base_types_are_found_should_comment_out_the_block(monke
     FILTER = create_filter(f"{Operand.REPLICA} {Operator.EQUALS} True {Delimiter.RULE_START}{ECON} {MNEMONIC} 1")
     _ = FunctionMock(monkeypatch, ninja.get_base_types, set())
 
-    lines = econ.handle(FILTER.blocks[0], Context(FILTER, []))
+    lines = econ.handle(FILTER.blocks[0], EconContext(FILTER, []))
 
-    assert lines[0].startswith(Delimiter.COMMENT_RULE_START)
+    assert str(lines[0]).startswith(Delimiter.COMMENT_RULE_START)
 
 def _get_mnemonic(query_type: BaseQueryType):
     return next(mnemonic
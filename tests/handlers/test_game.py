@@ -13,7 +13,7 @@ def test_handle_given_mod_param_should_upsert_on_HasExplicitMod(monkeypatch: Mon
     lines = game.handle(filter.blocks[0], Context(filter, None))
 
     assert len(lines) == 2
-    assert lines[1] == f'{Operand.HAS_EXPLICIT_MOD} {Operator.EQUALS} "{MOD}"'
+    assert str(lines[1]) == f'{Operand.HAS_EXPLICIT_MOD} {Operator.EQUALS} "{MOD}"'
 
 def test_handle_given_base_param_should_upsert_on_BaseType(monkeypatch: MonkeyPatch):
     BASE_TYPE_NAME = "some base"
@@ -23,7 +23,7 @@ def test_handle_given_base_param_should_upsert_on_BaseType(monkeypatch: MonkeyPa
     lines = game.handle(filter.blocks[0], Context(filter, None))
 
     assert len(lines) == 2
-    assert lines[1] == f'{Operand.BASE_TYPE} {Operator.EQUALS} "{BASE_TYPE_NAME}"'
+    assert str(lines[1]) == f'{Operand.BASE_TYPE} {Operator.EQUALS} "{BASE_TYPE_NAME}"'
 
 def test_handle_given_unknown_param_should_raise():
     UNKNOWN_PARAM = "unknown_param"
@@ -0,0 +1,9 @@
+import handlers, importlib, pytest
+
+@pytest.mark.parametrize("name", list(handlers.HANDLERS))
+def test_handlers_should_be_registered_with_the_name_of_their_rule(name: str):
+    handler = handlers.HANDLERS[name]
+    # handlers implemented as packages define their name in the package instead
+    module_name = handler.handle.__module__.removesuffix(".functions")
+    
+    assert importlib.import_module(module_name).NAME == name
@@ -14,7 +14,7 @@ def test_handle_given_an_index_section_and_subsection_should_write_them():
         {Delimiter.RULE_START}{_SECTION_RULE_NAME} {SECTION_NAME}
         {Delimiter.RULE_START}{_SUBSECTION_RULE_NAME} {SUBSECTION_NAME}""")
     
-    text = '\n'.join(index.handle(filter.blocks[0], IndexContext(filter, [])))
+    text = '\n'.join(str(line) for line in index.handle(filter.blocks[0], IndexContext(filter, [])))
 
     assert text.count(_INDEX_HEADER) == 1
     assert text.count(_INDEX_HINT) == 1
@@ -34,7 +34,7 @@ def test_handle_given_enough_sections_to_cause_id_padding_should_add_the_padding
         f"{Delimiter.RULE_START}{_SUBSECTION_RULE_NAME} subsection_{i+1}" for i in range(10))
     filter = create_filter(filter_contents)
     
-    text = '\n'.join(index.handle(filter.blocks[0], IndexContext(filter, [])))
+    text = '\n'.join(str(line) for line in index.handle(filter.blocks[0], IndexContext(filter, [])))
 
     assert text.count(EXPECTED_SECTION_ID) == 2 # the section and the index
     assert text.count(EXPECTED_SUBSECTION_ID) == 2 # the section and the index
@@ -48,7 +48,7 @@ def test_handle_given_multiple_subsections_should_render_the_numbers_appropriate
         {Delimiter.RULE_START}{_SUBSECTION_RULE_NAME} first_subsection
         {Delimiter.RULE_START}{_SUBSECTION_RULE_NAME} second_subsection""")
     
-    text = '\n'.join(index.handle(filter.blocks[0], IndexContext(filter, [])))
+    text = '\n'.join(str(line) for line in index.handle(filter.blocks[0], IndexContext(filter, [])))
 
     assert text.count(EXPECTED_SECOND_SUBSECTION_ID) == 2 # the section and the index
 
@@ -56,7 +56,7 @@ def test_handle_given_index_with_description_should_add_it():
     DESCRIPTION = "description"
     filter = create_filter(f"{Delimiter.RULE_START}{_INDEX_RULE_NAME} {DESCRIPTION}")
 
-    text = '\n'.join(index.handle(filter.blocks[0], IndexContext(filter, [])))
+    text = '\n'.join(str(line) for line in index.handle(filter.blocks[0], IndexContext(filter, [])))
 
     assert DESCRIPTION in text
 
@@ -1,4 +1,4 @@
-import sys, main, pytest, console
+import sys, os, subprocess, main, pytest, console
 from pytest import MonkeyPatch
 from test_utilities import FunctionMock
 from core import ExpectedError, Delimiter, ERROR_EXIT_CODE
@@ -82,4 +82,14 @@ def _mock_COMMANDS_and_get_mock(monkeypatch: MonkeyPatch, command_name: str):
     # performing this setattr is fine because it is an import from another module
     monkeypatch.setattr(main, "COMMANDS", mock_commands_dict)
     
-    return mock
\ No newline at end of file
+    return mock
+
+def test_main_import_should_not_import_the_dependencies_of_every_command():
+    # runs in a new interpreter because modules imported by other tests remain imported
+    SCRIPT = "import sys, main; print(' '.join(name for name in sys.argv[1:] if name in sys.modules))"
+    HEAVY_MODULES = [ "requests", "rich.markdown", "handlers", "ninja", "repoe", "web", "commands.generate" ]
+    src_dir = os.path.dirname(main.__file__)
+
+    result = subprocess.run([ sys.executable, "-c", SCRIPT ] + HEAVY_MODULES, cwd=src_dir, capture_output=True, text=True)
+
+    assert result.stdout.strip() == ""
@@ -4,6 +4,7 @@ from console import functions
 from core import ExpectedError, Delimiter
 from test_utilities import FunctionMock
 from rich.markdown import Markdown
+from rich.table import Table
 from rich.console import Console
 from console.functions import _COMMANDS_FOLDER_NAME, _DONE_MESSAGE, _EXPECTED_ERROR_TEMPLATE, _HANDLERS_FOLDER_NAME, _HINT_MESSAGE, _UNKNOWN_ERROR_MESSAGE, _DEFAULT_HINT_TERM, _WIKI_PAGE_URL
 
@@ -41,6 +42,16 @@ def test_write_given_done_should_prepend_the_done_value(console_print_mock: Func
 
     assert console_print_mock.received(_DONE_MESSAGE)
 
+def test_write_table_should_print_a_table_with_the_headers_and_rows(console_print_mock: FunctionMock):
+    HEADERS = [ "first", "second" ]
+    ROWS = [ [ "1", "2" ], [ "3", "4" ] ]
+
+    console.write_table(HEADERS, ROWS)
+
+    table: Table = console_print_mock.get_arg(Table)
+    assert [ column.header for column in table.columns ] == HEADERS
+    assert table.row_count == len(ROWS)
+
 def test_err_given_an_exception_should_write_the_unknown_error_message(
     console_print_mock: FunctionMock, console_print_exception_mock: FunctionMock):
 
@@ -0,0 +1,81 @@
+import pytest, os, json, memo, utils, web
+from pytest import MonkeyPatch
+from memo.functions import _LINES_FIELD, _VERSIONS_FIELD
+from test_utilities import FunctionMock, OpenMock, create_filter
+
+_KEY = "key"
+_LINES = [ "Show", "    Class == \"Currency\"" ]
+_URL = "https://www.site.com/"
+_VERSION = "version"
+
+@pytest.fixture(autouse=True)
+def setup(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(memo.functions, "_entries", {})
+    monkeypatch.setattr(memo.functions, "_added_entries", {})
+
+def test_get_key_given_different_invocations_or_blocks_should_return_different_keys():
+    BLOCK = create_filter("Show").blocks[0]
+    OTHER_BLOCK = create_filter("Hide").blocks[0]
+
+    key = memo.get_key(".econ", BLOCK)
+
+    assert key == memo.get_key(".econ", create_filter("Show").blocks[0])
+    assert key != memo.get_key(".econ hc", BLOCK)
+    assert key != memo.get_key(".econ", OTHER_BLOCK)
+    assert key != memo.get_key(".econ", BLOCK, "league")
+
+def test_try_get_given_the_versions_did_not_change_should_return_the_lines(monkeypatch: MonkeyPatch):
+    _ = FunctionMock(monkeypatch, web.get_version, _VERSION, target=web)
+    memo.add(_KEY, _LINES, { _URL: _VERSION })
+
+    lines = memo.try_get(_KEY)
+
+    assert lines == _LINES
+
+def test_try_get_given_a_version_changed_should_return_none(monkeypatch: MonkeyPatch):
+    _ = FunctionMock(monkeypatch, web.get_version, "new version", target=web)
+    memo.add(_KEY, _LINES, { _URL: _VERSION })
+
+    lines = memo.try_get(_KEY)
+
+    assert lines == None
+
+def test_try_get_given_the_memo_file_is_corrupted_should_return_none(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(memo.functions, "_entries", None)
+    _ = FunctionMock(monkeypatch, os.path.isfile, True, target=os.path)
+    _ = OpenMock(monkeypatch, "not json")
+
+    lines = memo.try_get(_KEY)
+
+    assert lines == None
+
+def test_add_entries_should_make_entries_from_other_processes_available(monkeypatch: MonkeyPatch):
+    _ = FunctionMock(monkeypatch, web.get_version, _VERSION, target=web)
+    memo.add(_KEY, _LINES, { _URL: _VERSION })
+    entries = memo.get_added_entries()
+    monkeypatch.setattr(memo.functions, "_entries", {})
+
+    memo.add_entries(entries)
+
+    assert memo.try_get(_KEY) == _LINES
+
+def test_save_should_only_write_the_entries_that_are_still_current(monkeypatch: MonkeyPatch):
+    _ = FunctionMock(monkeypatch, utils.get_execution_dir, "directory")
+    _ = FunctionMock(monkeypatch, os.makedirs, target=os)
+    _ = FunctionMock(monkeypatch, web.get_version, lambda url: _VERSION if url == _URL else None, target=web)
+    _ = OpenMock(monkeypatch)
+    json_dump_mock = FunctionMock(monkeypatch, json.dump)
+    memo.add(_KEY, _LINES, { _URL: _VERSION })
+    memo.add("stale key", _LINES, { "https://another.url": _VERSION })
+
+    memo.save()
+
+    assert json_dump_mock.received({ _KEY: { _LINES_FIELD: _LINES, _VERSIONS_FIELD: { _URL: _VERSION } } })
+    assert memo.get_added_entries() == {}
+
+def test_save_given_no_entries_were_added_should_not_write(monkeypatch: MonkeyPatch):
+    json_dump_mock = FunctionMock(monkeypatch, json.dump)
+
+    memo.save()
+
+    assert json_dump_mock.get_invocation_count() == 0
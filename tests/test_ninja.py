@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-import pytest, ninja, repoe
+import pytest, ninja, repoe, web
 from pytest import MonkeyPatch
 from ninja import ValueRange
 from ninja.constants import *
@@ -258,4 +258,16 @@ def test_get_base_types_given_item_level_for_wombgift_should_return_depending_on
 
     base_types = ninja.get_base_types(BaseQueryType.WOMBGIFT, _LEAGUE_NAME, SIEVE, _RANGE)
 
-    assert (_BASE_TYPE in base_types) == (level == web_get_mock.result.level)
\ No newline at end of file
+    assert (_BASE_TYPE in base_types) == (level == web_get_mock.result.level)
+
+def test_prefetch_should_request_the_url_of_every_query_type_with_its_formatter(monkeypatch: MonkeyPatch):
+    QUERY_TYPES = [ BaseQueryType.CURRENCY, BaseQueryType.UNIQUE_MAP, MiscQueryType.CLUSTER_JEWEL ]
+    formatters_by_url = {}
+    monkeypatch.setattr(web, "prefetch", lambda formatters, *_: formatters_by_url.update(formatters))
+
+    ninja.prefetch(QUERY_TYPES, _LEAGUE_NAME)
+
+    assert len(formatters_by_url) == len(QUERY_TYPES)
+    for query_type in QUERY_TYPES:
+        url = next(url for url in formatters_by_url if url.endswith(f"type={query_type}"))
+        assert _LEAGUE_NAME in url
\ No newline at end of file
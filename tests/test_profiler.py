@@ -0,0 +1,135 @@
+import pytest, json, profiler, console, builtins
+from types import SimpleNamespace
+from pytest import MonkeyPatch
+from core import ExpectedError
+from profiler.functions import _TOTAL_FIELD, _TIMINGS_FIELD, _COUNTERS_FIELD, _CALLS_FIELD, _WALL_TIME_FIELD, _OTHER_STEP, _TOTAL_STEP
+from profiler.functions import _STEP_HEADER, _CALLS_HEADER, _WALL_TIME_HEADER, _CPU_TIME_HEADER, _COUNTER_HEADER, _AMOUNT_HEADER, _PERMISSION_ERROR
+from test_utilities import FunctionMock
+
+_STEP = "step"
+_NESTED_STEP = "nested step"
+_COUNTER = "counter"
+
+@pytest.fixture(autouse=True)
+def setup():
+    profiler.start()
+    yield
+    profiler.stop()
+
+def test_is_started_should_only_return_true_until_profiling_is_stopped():
+    was_started = profiler.is_started()
+
+    profiler.stop()
+
+    assert was_started
+    assert not profiler.is_started()
+
+def test_measure_given_profiling_was_started_should_record_the_step():
+    with profiler.measure(_STEP):
+        pass
+    with profiler.measure(_STEP):
+        pass
+
+    timings = profiler.get_report()[_TIMINGS_FIELD]
+    
+    assert timings[_STEP][_CALLS_FIELD] == 2
+
+def test_measure_given_profiling_was_stopped_should_not_record_the_step():
+    profiler.stop()
+
+    with profiler.measure(_STEP):
+        pass
+    
+    assert _STEP not in profiler.get_report()[_TIMINGS_FIELD]
+
+def test_measure_given_nested_measurements_should_not_add_their_time_to_the_outer_step(monkeypatch: MonkeyPatch):
+    times = iter(range(100))
+    monkeypatch.setattr(profiler.functions, "time", SimpleNamespace(perf_counter=lambda: next(times), process_time=lambda: 0))
+
+    profiler.start() # 0
+    with profiler.measure(_STEP): # 1 to 6
+        with profiler.measure(_NESTED_STEP): # 2 to 3
+            pass
+        with profiler.measure(_NESTED_STEP): # 4 to 5
+            pass
+
+    timings = profiler.get_report()[_TIMINGS_FIELD] # 7
+
+    assert timings[_NESTED_STEP][_WALL_TIME_FIELD] == 2
+    assert timings[_STEP][_WALL_TIME_FIELD] == 3
+    assert timings[_OTHER_STEP][_WALL_TIME_FIELD] == 2
+
+def test_measure_iterator_should_return_every_item_and_record_a_call_per_item():
+    ITEMS = [ 1, 2, 3 ]
+
+    items = list(profiler.measure_iterator(_STEP, ITEMS))
+
+    assert items == ITEMS
+    assert profiler.get_report()[_TIMINGS_FIELD][_STEP][_CALLS_FIELD] == len(ITEMS) + 1
+
+def test_measure_iterator_given_profiling_was_stopped_should_return_the_iterable():
+    ITEMS = [ 1, 2, 3 ]
+    profiler.stop()
+
+    assert profiler.measure_iterator(_STEP, ITEMS) is ITEMS
+
+def test_count_should_add_the_amount_to_the_counter():
+    profiler.count(_COUNTER)
+    profiler.count(_COUNTER, 2)
+
+    assert profiler.get_report()[_COUNTERS_FIELD] == { _COUNTER: 3 }
+
+def test_start_should_discard_previous_measurements():
+    profiler.count(_COUNTER)
+
+    profiler.start()
+
+    assert profiler.get_report()[_COUNTERS_FIELD] == {}
+
+def test_get_report_after_stopping_should_keep_the_total_time():
+    profiler.stop()
+
+    total = profiler.get_report()[_TOTAL_FIELD]
+
+    assert total == profiler.get_report()[_TOTAL_FIELD]
+
+def test_save_report_should_write_the_report_as_json(tmp_path):
+    FILEPATH = tmp_path / "report.json"
+    profiler.count(_COUNTER)
+
+    profiler.save_report(str(FILEPATH))
+
+    report = json.loads(FILEPATH.read_text())
+    assert report[_COUNTERS_FIELD] == { _COUNTER: 1 }
+
+@pytest.mark.parametrize("counters, expected_tables", [ ({}, 1), ({ _COUNTER: 2 }, 2) ])
+def test_write_report_should_write_the_timings_and_only_write_counters_if_any(
+    monkeypatch: MonkeyPatch, counters: dict[str, int], expected_tables: int):
+    
+    times = iter(range(100))
+    monkeypatch.setattr(profiler.functions, "time", SimpleNamespace(perf_counter=lambda: next(times), process_time=lambda: 0))
+    write_table_mock = FunctionMock(monkeypatch, console.write_table, target=console)
+    profiler.start() # 0
+    with profiler.measure(_STEP): # 1 to 3
+        next(times)
+    for counter, amount in counters.items():
+        profiler.count(counter, amount)
+
+    profiler.write_report() # 4
+
+    assert write_table_mock.get_invocation_count() == expected_tables
+    assert write_table_mock.received([ _STEP_HEADER, _CALLS_HEADER, _WALL_TIME_HEADER, _CPU_TIME_HEADER ], [
+        [ _STEP, "1", "2000.0", "0.0" ],
+        [ _OTHER_STEP, "1", "2000.0", "0.0" ],
+        [ _TOTAL_STEP, "", "4000.0", "0.0" ] ])
+    if expected_tables == 2:
+        assert write_table_mock.received([ _COUNTER_HEADER, _AMOUNT_HEADER ], [ [ _COUNTER, "2" ] ])
+
+def test_save_report_given_permission_was_denied_should_raise(monkeypatch: MonkeyPatch):
+    FILEPATH = "report.json"
+    _ = FunctionMock(monkeypatch, builtins.open, PermissionError)
+
+    with pytest.raises(ExpectedError) as error:
+        profiler.save_report(FILEPATH)
+    
+    assert error.value.message == _PERMISSION_ERROR.format(FILEPATH)
@@ -0,0 +1,228 @@
+import pytest, json, os, socket, server, threading, stat
+from pytest import MonkeyPatch
+from core import ExpectedError, ERROR_EXIT_CODE
+from server.functions import _Server, _RequestHandler, _get_response, _get_token_filepath, _DEFAULT_PORT, _PORT_OPTION, _PORT_ERROR, _CONNECTION_ERROR, _INVALID_REQUEST_ERROR, _INVALID_CWD_ERROR, _INVALID_TOKEN_ERROR, _DISCONNECTED_ERROR, _INVALID_RESPONSE_ERROR
+from test_utilities import FunctionMock
+
+_ARGS = [ "input.filter", ".handler" ]
+_OUTPUT = "output"
+_TOKEN = "token"
+
+@pytest.fixture(autouse=True)
+def expanduser_mock(monkeypatch: MonkeyPatch, tmp_path):
+    return FunctionMock(monkeypatch, os.path.expanduser, str(tmp_path), target=os.path)
+
+def test_send_given_a_server_is_running_should_return_its_output_and_exit_code():
+    received_args: list[list[str]] = []
+    def handle(args: list[str]):
+        received_args.append(args)
+        return (_OUTPUT, ERROR_EXIT_CODE)
+    
+    with _Server(0, handle) as running_server:
+        thread = threading.Thread(target=running_server.handle_request)
+        thread.start()
+        response = server.send(running_server.server_address[1], _ARGS)
+        thread.join()
+    
+    assert response == (_OUTPUT, ERROR_EXIT_CODE)
+    assert received_args == [ _ARGS ]
+
+def test_send_given_the_token_does_not_match_should_return_an_error_without_handling_the_request():
+    received_args: list[list[str]] = []
+    def handle(args: list[str]):
+        received_args.append(args)
+        return (_OUTPUT, 0)
+    
+    with _Server(0, handle) as running_server:
+        port = running_server.server_address[1]
+        with open(_get_token_filepath(port), "w") as file:
+            file.write("another token")
+        thread = threading.Thread(target=running_server.handle_request)
+        thread.start()
+        response = server.send(port, _ARGS)
+        thread.join()
+    
+    assert response == (_INVALID_TOKEN_ERROR, ERROR_EXIT_CODE)
+    assert received_args == []
+
+@pytest.mark.skipif(os.name == "nt", reason="file modes other than read-only aren't supported on Windows")
+def test_server_should_write_its_token_to_a_file_only_its_user_can_access_and_remove_it_once_closed():
+    with _Server(0, lambda _: (_OUTPUT, 0)) as running_server:
+        filepath = _get_token_filepath(running_server.server_address[1])
+        with open(filepath) as file:
+            token = file.read()
+        mode = stat.S_IMODE(os.stat(filepath).st_mode)
+
+    assert token == running_server.token
+    assert mode & (stat.S_IRWXG | stat.S_IRWXO) == 0
+    assert not os.path.exists(filepath)
+
+def test_server_given_a_token_file_was_left_behind_should_replace_it():
+    with _Server(0, lambda _: (_OUTPUT, 0)) as running_server:
+        port = running_server.server_address[1]
+    with open(_get_token_filepath(port), "w") as file:
+        file.write(_TOKEN)
+
+    with _Server(port, lambda _: (_OUTPUT, 0)) as running_server:
+        with open(_get_token_filepath(port)) as file:
+            token = file.read()
+    
+    assert token == running_server.token
+
+def test_serve_given_a_keyboard_interrupt_should_stop_and_remove_its_token_file(monkeypatch: MonkeyPatch):
+    served_ports: list[int] = []
+    def serve_forever(self: _Server):
+        served_ports.append(self.server_address[1])
+        assert os.path.isfile(_get_token_filepath(self.server_address[1]))
+        raise KeyboardInterrupt()
+    monkeypatch.setattr(_Server, "serve_forever", serve_forever)
+
+    server.serve(0, lambda _: (_OUTPUT, 0))
+
+    assert len(served_ports) == 1
+    assert not os.path.exists(_get_token_filepath(served_ports[0]))
+
+def test_server_given_the_port_is_in_use_should_not_remove_the_token_of_the_server_using_it():
+    with _Server(0, lambda _: (_OUTPUT, 0)) as running_server:
+        port = running_server.server_address[1]
+        with pytest.raises(OSError):
+            _ = _Server(port, lambda _: (_OUTPUT, 0))
+
+        assert os.path.isfile(_get_token_filepath(port))
+
+def test_server_given_a_client_disconnects_without_a_request_should_keep_handling_requests():
+    with _Server(0, lambda _: (_OUTPUT, 0)) as running_server:
+        port = running_server.server_address[1]
+        thread = threading.Thread(target=lambda: [ running_server.handle_request() for _ in range(2) ])
+        thread.start()
+        socket.create_connection(("127.0.0.1", port)).close()
+        response = server.send(port, _ARGS)
+        thread.join()
+    
+    assert response == (_OUTPUT, 0)
+
+def test_server_given_a_client_sends_nothing_should_stop_waiting_for_it(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(_RequestHandler, "timeout", 0.1)
+
+    with _Server(0, lambda _: (_OUTPUT, 0)) as running_server:
+        port = running_server.server_address[1]
+        with socket.create_connection(("127.0.0.1", port)) as idle_connection:
+            thread = threading.Thread(target=lambda: [ running_server.handle_request() for _ in range(2) ])
+            thread.start()
+            response = server.send(port, _ARGS)
+            thread.join()
+            idle_response = idle_connection.recv(1)
+    
+    assert response == (_OUTPUT, 0)
+    assert idle_response == b""
+
+@pytest.mark.parametrize("raw_response", [ b"not json\n", b'{ "output": "output" }\n' ])
+def test_send_given_the_server_responds_with_an_invalid_response_should_raise(raw_response: bytes):
+    def respond(listener: socket.socket):
+        (connection, _) = listener.accept()
+        with connection, connection.makefile("rb") as file:
+            _ = file.readline()
+            connection.sendall(raw_response)
+    
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        port = listener.getsockname()[1]
+        with open(_get_token_filepath(port), "w") as file:
+            file.write(_TOKEN)
+        thread = threading.Thread(target=respond, args=[ listener ])
+        thread.start()
+        with pytest.raises(ExpectedError) as error:
+            _ = server.send(port, _ARGS)
+        thread.join()
+    
+    assert error.value.message == _INVALID_RESPONSE_ERROR.format(port)
+
+@pytest.mark.parametrize("reads_request", [ True, False ])
+def test_send_given_the_server_disconnects_before_responding_should_raise(reads_request: bool):
+    def disconnect(listener: socket.socket):
+        (connection, _) = listener.accept()
+        with connection:
+            if reads_request:
+                with connection.makefile("rb") as file:
+                    _ = file.readline()
+    
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        port = listener.getsockname()[1]
+        with open(_get_token_filepath(port), "w") as file:
+            file.write(_TOKEN)
+        thread = threading.Thread(target=disconnect, args=[ listener ])
+        thread.start()
+        with pytest.raises(ExpectedError) as error:
+            _ = server.send(port, _ARGS)
+        thread.join()
+    
+    assert error.value.message == _DISCONNECTED_ERROR.format(port)
+
+@pytest.mark.parametrize("token_file_exists", [ True, False ])
+def test_send_given_no_server_is_running_should_raise(monkeypatch: MonkeyPatch, token_file_exists: bool):
+    PORT = 1234
+    if token_file_exists:
+        with open(_get_token_filepath(PORT), "w") as file:
+            file.write(_TOKEN)
+    _ = FunctionMock(monkeypatch, socket.create_connection, ConnectionRefusedError, target=socket)
+
+    with pytest.raises(ExpectedError) as error:
+        _ = server.send(PORT, _ARGS)
+    
+    assert error.value.message == _CONNECTION_ERROR.format(PORT)
+
+def test_split_port_given_no_port_option_should_return_the_default_port():
+    (port, args) = server.split_port(_ARGS)
+
+    assert port == _DEFAULT_PORT
+    assert args == _ARGS
+
+def test_split_port_given_a_port_option_should_return_the_port_and_the_rest_of_the_args():
+    (port, args) = server.split_port([ _PORT_OPTION, "1234" ] + _ARGS)
+
+    assert port == 1234
+    assert args == _ARGS
+
+@pytest.mark.parametrize("args, port", [ ([ _PORT_OPTION ], ""), ([ _PORT_OPTION, "port" ], "port"), ([ _PORT_OPTION, "0" ], "0"), ([ _PORT_OPTION, "65536" ], "65536") ])
+def test_split_port_given_an_invalid_port_should_raise(args: list[str], port: str):
+    with pytest.raises(ExpectedError) as error:
+        _ = server.split_port(args)
+    
+    assert error.value.message == _PORT_ERROR.format(port)
+
+def test_get_response_given_a_valid_request_should_handle_it_from_the_cwd_received(monkeypatch: MonkeyPatch):
+    CWD = "cwd"
+    chdir_mock = FunctionMock(monkeypatch, os.chdir, target=os)
+    REQUEST = json.dumps({ "args": _ARGS, "cwd": CWD, "token": _TOKEN }).encode()
+
+    response = _get_response(REQUEST, lambda args: (" ".join(args), 0), _TOKEN)
+
+    assert response == { "output": " ".join(_ARGS), "exit_code": 0 }
+    assert chdir_mock.received(CWD)
+    assert chdir_mock.received(os.getcwd())
+
+@pytest.mark.parametrize("request_", [ b"not json", b"[]", b'{ "args": [] }', b'{ "args": [], "cwd": "cwd" }' ])
+def test_get_response_given_an_invalid_request_should_return_an_error(request_: bytes):
+    response = _get_response(request_, lambda _: (_OUTPUT, 0), _TOKEN)
+
+    assert response == { "output": _INVALID_REQUEST_ERROR, "exit_code": ERROR_EXIT_CODE }
+
+def test_get_response_given_the_cwd_does_not_exist_should_return_an_error(monkeypatch: MonkeyPatch):
+    CWD = "cwd"
+    _ = FunctionMock(monkeypatch, os.chdir, FileNotFoundError, target=os)
+    REQUEST = json.dumps({ "args": _ARGS, "cwd": CWD, "token": _TOKEN }).encode()
+
+    response = _get_response(REQUEST, lambda _: (_OUTPUT, 0), _TOKEN)
+
+    assert response == { "output": _INVALID_CWD_ERROR.format(CWD), "exit_code": ERROR_EXIT_CODE }
+
+@pytest.mark.parametrize("token", [ "another token", "", None, 1 ])
+def test_get_response_given_the_token_does_not_match_should_return_an_error_without_changing_directory(
+    monkeypatch: MonkeyPatch, token: str | None | int):
+    
+    chdir_mock = FunctionMock(monkeypatch, os.chdir, target=os)
+    REQUEST = json.dumps({ "args": _ARGS, "cwd": "cwd", "token": token }).encode()
+
+    response = _get_response(REQUEST, lambda _: (_OUTPUT, 0), _TOKEN)
+
+    assert response == { "output": _INVALID_TOKEN_ERROR, "exit_code": ERROR_EXIT_CODE }
+    assert chdir_mock.get_invocation_count() == 0
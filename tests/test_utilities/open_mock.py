@@ -37,8 +37,14 @@ class FileMock:
     def fileno(self):
         return 1
     
+    def close(self):
+        pass
+    
+    def __iter__(self):
+        return iter(self.lines)
+    
     def __enter__(self):
         return self
     
     def __exit__(self, _, __, ___):
-        return self
\ No newline at end of file
+        return False
\ No newline at end of file
@@ -5,12 +5,16 @@ from pytest import MonkeyPatch
 _FORMATTER = "formatter"
 
 class WebGetMock(FunctionMock):
-    """Mocks the `web.get` function, ensuring the `formatter` is applied on the data returned."""
+    """Mocks the `web.get` function, ensuring the `formatter` is applied on the data returned.
+    `web.get_derived` is mocked as well, passing the data this mock returns to its `deriver`.
+    `web.prefetch` does nothing, since every request is served by this mock when it's made."""
 
     def __init__(self, monkeypatch: MonkeyPatch, result):
         """The `result` parameter will be returned from the `web.get` invocation.
         If `formatter` is passed when `web.get` is called, it is applied to the `result` before returning."""
         super().__init__(monkeypatch, web.get, result)
+        monkeypatch.setattr(web, "get_derived", lambda url, _, deriver, *args, **kwargs: deriver(self(url, *args, **kwargs)))
+        monkeypatch.setattr(web, "prefetch", lambda *_, **__: None)
     
     def __call__(self, *args, **kwargs):
         result = super().__call__(*args, **kwargs)
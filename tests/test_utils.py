@@ -77,4 +77,19 @@ def test_parse_key_value_list_given_kvp_format_error_should_raise(key: str, valu
         utils.parse_key_value_list(text, LINE_NUMBER)
 
     assert expected_error.format(text) in error.value.message
-    assert error.value.line_number == LINE_NUMBER
\ No newline at end of file
+    assert error.value.line_number == LINE_NUMBER
+
+def test_lazy_mapping_should_only_load_values_the_first_time_they_are_requested():
+    loaded_keys: list[str] = []
+    def create_loader(key: str):
+        return lambda: loaded_keys.append(key) or key.upper()
+    mapping = utils.LazyMapping({ "a": create_loader("a"), "b": create_loader("b") })
+
+    assert "a" in mapping
+    assert list(mapping) == [ "a", "b" ]
+    assert len(mapping) == 2
+    assert loaded_keys == []
+    assert mapping["a"] == "A"
+    assert mapping["a"] == "A"
+    assert loaded_keys == [ "a" ]
+    assert "c" not in mapping
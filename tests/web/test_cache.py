@@ -1,11 +1,12 @@
-import pytest, os, json, shutil, utils
+import pytest, os, json, marshal, shutil, utils
 from datetime import datetime
 from web import cache, Expiration
 from pytest import MonkeyPatch
 from core import FILE_ENCODING
 from test_utilities import FunctionMock, OpenMock
 from web.cache.file_cache import _ENTRIES_FILENAME
-from web.cache.file_entry import _EXPIRATION_DATE_FIELD, _EXPIRATION_FORMAT, _URL_FIELD, _IS_JSON_FIELD, _FILENAME_FIELD
+from web.cache.file_entry import _EXPIRATION_DATE_FIELD, _EXPIRATION_FORMAT, _URL_FIELD, _IS_JSON_FIELD, _FILENAME_FIELD, _FORMAT_FIELD
+from web.cache.file_format import FileFormat
 
 _JSON_DATA = { "some": "data" }
 _TEXT_DATA = "some text"
@@ -76,18 +77,45 @@ def test_try_get_given_valid_entry_is_not_json_should_return_it_as_text(
 
     assert data == _TEXT_DATA
 
-def test_add_given_json_data_should_save_it_with_its_entry(monkeypatch: MonkeyPatch):
+def test_try_get_given_valid_entry_is_marshalled_should_return_the_data(
+    monkeypatch: MonkeyPatch, open_mock: OpenMock):
+    
+    ENTRY = _create_entry(format=FileFormat.MARSHAL)
+    _ = FunctionMock(monkeypatch, os.path.isfile, True)
+    _ = FunctionMock(monkeypatch, json.load, [ ENTRY ])
+    open_mock.file.lines = [ marshal.dumps(_JSON_DATA) ]
+    open_mock.file.read = lambda: open_mock.file.lines[0]
+
+    data = cache.try_get(ENTRY[_URL_FIELD])
+
+    assert data == _JSON_DATA
+
+def test_contains_given_a_valid_entry_should_return_true_without_loading_its_data(monkeypatch: MonkeyPatch):
+    ENTRY = _create_entry()
+    _ = FunctionMock(monkeypatch, os.path.isfile, True)
+    json_load_mock = FunctionMock(monkeypatch, json.load, [ ENTRY ])
+
+    is_contained = cache.contains(ENTRY[_URL_FIELD])
+
+    assert is_contained
+    assert json_load_mock.get_invocation_count() == 1 # only the entries are loaded
+    assert ENTRY[_URL_FIELD] not in cache.get_memory_cache()
+
+def test_add_given_json_data_should_save_it_marshalled_with_its_entry(monkeypatch: MonkeyPatch, open_mock: OpenMock):
     _ = FunctionMock(monkeypatch, os.makedirs)
+    _ = FunctionMock(monkeypatch, os.replace, target=os)
     json_dump_mock = FunctionMock(monkeypatch, json.dump)
     
     cache.add(_URL, Expiration.DAILY, _JSON_DATA)
 
     assert cache.functions._memory_cache[_URL] == _JSON_DATA
-    assert json_dump_mock.get_invocation_count() == 2
-    assert json_dump_mock.received(_JSON_DATA)
+    assert json_dump_mock.get_invocation_count() == 1
+    assert json_dump_mock.get_arg(list)[0][_FORMAT_FIELD] == FileFormat.MARSHAL
+    assert open_mock.file.got_written(marshal.dumps(_JSON_DATA))
 
 def test_add_given_text_data_should_save_it_with_its_entry(monkeypatch: MonkeyPatch, open_mock: OpenMock):
     _ = FunctionMock(monkeypatch, os.makedirs)
+    _ = FunctionMock(monkeypatch, os.replace, target=os)
     json_dump_mock = FunctionMock(monkeypatch, json.dump)
     
     cache.add(_URL, Expiration.DAILY, _TEXT_DATA)
@@ -98,6 +126,64 @@ def test_add_given_text_data_should_save_it_with_its_entry(monkeypatch: MonkeyPa
     assert open_mock.file.got_written(_TEXT_DATA)
 
 
+def test_get_version_given_the_item_is_not_cached_should_return_none(monkeypatch: MonkeyPatch):
+    _ = FunctionMock(monkeypatch, os.path.isfile, True, target=os.path)
+    _ = FunctionMock(monkeypatch, json.load, [ ])
+
+    version = cache.get_version(_URL)
+
+    assert version == None
+
+def test_stop_tracking_should_return_the_versions_of_the_items_used_since_tracking_started(monkeypatch: MonkeyPatch):
+    ENTRY = _create_entry()
+    _ = FunctionMock(monkeypatch, os.path.isfile, True, target=os.path)
+    _ = FunctionMock(monkeypatch, json.load, (x for x in [ [ ENTRY ], _JSON_DATA ]))
+    _ = cache.try_get("https://untracked.url")
+
+    cache.start_tracking()
+    _ = cache.try_get(_URL)
+    versions = cache.stop_tracking()
+
+    assert versions == { _URL: ENTRY[_FILENAME_FIELD] }
+    assert cache.stop_tracking() == {}
+
+def test_remove_stale_items_should_remove_items_no_longer_cached_on_disk(monkeypatch: MonkeyPatch):
+    _ = FunctionMock(monkeypatch, os.path.isfile, True, target=os.path)
+    _ = FunctionMock(monkeypatch, json.load, [ _create_entry() ])
+    OTHER_URL = "https://another.url"
+    cache.load_memory_cache({ _URL: _JSON_DATA, OTHER_URL: _TEXT_DATA })
+
+    cache.remove_stale_items()
+
+    assert cache.get_memory_cache() == { _URL: _JSON_DATA }
+
+def test_try_get_derived_given_it_was_added_without_its_source_on_disk_should_return_it_from_memory(monkeypatch: MonkeyPatch):
+    _ = FunctionMock(monkeypatch, os.path.isfile, False, target=os.path)
+    json_dump_mock = FunctionMock(monkeypatch, json.dump)
+    NAME = "derived@1"
+
+    cache.add_derived(_URL, NAME, _JSON_DATA)
+
+    assert cache.try_get_derived(_URL, NAME) == _JSON_DATA
+    assert cache.try_get_derived(_URL, "derived@2") == None
+    assert json_dump_mock.get_invocation_count() == 0
+
+def test_get_memory_cache_should_return_a_copy_of_the_items_in_memory():
+    cache.functions._memory_cache = { _URL: _JSON_DATA }
+
+    items = cache.get_memory_cache()
+    items.clear()
+
+    assert cache.functions._memory_cache == { _URL: _JSON_DATA }
+
+def test_load_memory_cache_should_make_the_items_available_without_writing_them(monkeypatch: MonkeyPatch):
+    json_dump_mock = FunctionMock(monkeypatch, json.dump)
+
+    cache.load_memory_cache({ _URL: _TEXT_DATA })
+
+    assert cache.try_get(_URL) == _TEXT_DATA
+    assert json_dump_mock.get_invocation_count() == 0
+
 @pytest.mark.parametrize("cache_exists", [ True, False ])
 def test_clear_cache_should_delete_the_cache_folder_and_return_if_it_did(monkeypatch: MonkeyPatch, cache_exists: bool):
     DIR = "execution_directory"
@@ -112,11 +198,15 @@ def test_clear_cache_should_delete_the_cache_folder_and_return_if_it_did(monkeyp
     assert shutil_rmtree_mock.get_invocation_count() == (1 if cache_exists else 0)
 
 
-def _create_entry(expiration_date: datetime | str = datetime.max, is_json: bool = True):
-    return {
+def _create_entry(expiration_date: datetime | str = datetime.max, is_json: bool = True, format: FileFormat = None):
+    # entries without a format are the ones written by older versions
+    entry = {
         _URL_FIELD: _URL,
         _IS_JSON_FIELD: is_json,
         _FILENAME_FIELD: "some/file.json",
         _EXPIRATION_DATE_FIELD: expiration_date.strftime(_EXPIRATION_FORMAT) \
             if isinstance(expiration_date, datetime) else expiration_date
-    }
\ No newline at end of file
+    }
+    if format != None:
+        entry = { key: value for key, value in entry.items() if key != _IS_JSON_FIELD } | { _FORMAT_FIELD: format.value }
+    return entry
\ No newline at end of file
@@ -0,0 +1,108 @@
+import os, pytest
+from datetime import datetime
+from web import Expiration
+from web.cache.file_cache import FileCache, _ENTRIES_FILENAME
+
+_URL = "https://www.site.com/"
+_NAME = "derived@1"
+_DATA = { "some": [ "data" ] }
+_DERIVED_DATA = { "derived", "data" }
+
+def test_add_given_structured_data_should_load_it_back_in_another_cache(tmp_path):
+    file_cache = FileCache(str(tmp_path))
+
+    file_cache.add(_URL, Expiration.DAILY, _DATA)
+
+    assert FileCache(str(tmp_path))[_URL] == _DATA
+
+def test_add_derived_should_load_it_back_until_its_source_is_added_again(tmp_path):
+    file_cache = FileCache(str(tmp_path))
+    file_cache.add(_URL, Expiration.DAILY, _DATA)
+    derived_url = file_cache.get_derived_url(_URL, _NAME)
+
+    file_cache.add_derived(_URL, derived_url, _DERIVED_DATA)
+
+    assert FileCache(str(tmp_path))[derived_url] == _DERIVED_DATA
+    derived_filename = file_cache.get_version(derived_url)
+    file_cache.add(_URL, Expiration.DAILY, _DATA)
+    assert derived_url not in file_cache
+    assert file_cache.get_derived_url(_URL, _NAME) != derived_url
+    assert derived_filename not in os.listdir(tmp_path)
+
+def test_get_derived_url_given_different_names_should_return_different_urls(tmp_path):
+    file_cache = FileCache(str(tmp_path))
+    file_cache.add(_URL, Expiration.DAILY, _DATA)
+
+    assert file_cache.get_derived_url(_URL, _NAME) != file_cache.get_derived_url(_URL, "derived@2")
+
+@pytest.mark.parametrize("etag, last_modified, expected_to_be_kept", [
+    (None, None, False), ("etag", None, True), (None, "last modified", True) ])
+def test_contains_given_a_stale_item_should_only_keep_it_if_it_can_be_revalidated(
+    tmp_path, etag: str | None, last_modified: str | None, expected_to_be_kept: bool):
+    
+    file_cache = FileCache(str(tmp_path))
+    file_cache.add(_URL, Expiration.DAILY, _DATA, etag, last_modified)
+    file_cache._entries[_URL].expiration_date = datetime.min
+
+    assert _URL not in file_cache
+    assert file_cache.get_validators(_URL) == ((etag, last_modified) if expected_to_be_kept else (None, None))
+
+def test_renew_should_make_the_item_and_its_derived_data_valid_again_without_changing_its_version(tmp_path):
+    file_cache = FileCache(str(tmp_path))
+    file_cache.add(_URL, Expiration.DAILY, _DATA, "etag")
+    derived_url = file_cache.get_derived_url(_URL, _NAME)
+    file_cache.add_derived(_URL, derived_url, _DERIVED_DATA)
+    version = file_cache.get_version(_URL)
+    for entry in file_cache._entries.values():
+        entry.expiration_date = datetime.min
+    
+    data = file_cache.renew(_URL, Expiration.DAILY)
+
+    renewed_cache = FileCache(str(tmp_path))
+    assert data == _DATA
+    assert renewed_cache.get_version(_URL) == version
+    assert renewed_cache[derived_url] == _DERIVED_DATA
+
+@pytest.mark.parametrize("contents", [ b"", b"\xff\x00 not marshalled" ])
+def test_try_get_given_the_file_cannot_be_loaded_should_remove_it_and_return_none(tmp_path, contents: bytes):
+    file_cache = FileCache(str(tmp_path))
+    file_cache.add(_URL, Expiration.DAILY, _DATA)
+    derived_url = file_cache.get_derived_url(_URL, _NAME)
+    file_cache.add_derived(_URL, derived_url, _DERIVED_DATA)
+    filename = file_cache.get_version(_URL)
+    (tmp_path / filename).write_bytes(contents)
+
+    data = file_cache.try_get(_URL)
+
+    reloaded_cache = FileCache(str(tmp_path))
+    assert data == None
+    assert filename not in os.listdir(tmp_path)
+    assert _URL not in reloaded_cache
+    assert derived_url not in reloaded_cache
+
+def test_renew_given_the_file_cannot_be_loaded_should_remove_it_and_return_none(tmp_path):
+    file_cache = FileCache(str(tmp_path))
+    file_cache.add(_URL, Expiration.DAILY, _DATA, "etag")
+    (tmp_path / file_cache.get_version(_URL)).write_bytes(b"")
+
+    data = file_cache.renew(_URL, Expiration.DAILY)
+
+    assert data == None
+    assert file_cache.get_validators(_URL) == (None, None)
+
+@pytest.mark.parametrize("contents", [ '[ { "url": "https://www.si', "{}", '[ { "url": "https://www.site.com/" } ]' ])
+def test_init_given_the_entries_cannot_be_read_should_start_empty(tmp_path, contents: str):
+    (tmp_path / _ENTRIES_FILENAME).write_text(contents)
+
+    file_cache = FileCache(str(tmp_path))
+
+    assert _URL not in file_cache
+    file_cache.add(_URL, Expiration.DAILY, _DATA)
+    assert FileCache(str(tmp_path))[_URL] == _DATA
+
+def test_add_should_not_leave_temporary_files_behind(tmp_path):
+    file_cache = FileCache(str(tmp_path))
+
+    file_cache.add(_URL, Expiration.DAILY, _DATA)
+
+    assert sorted(os.listdir(tmp_path)) == sorted([ _ENTRIES_FILENAME, file_cache.get_version(_URL) ])
@@ -1,10 +1,10 @@
-import pytest, web, requests, os
+import pytest, web, requests, os, threading, time
 from test_utilities import FunctionMock, OpenMock
 from pytest import MonkeyPatch
 from requests import ConnectTimeout, HTTPError, ReadTimeout, Timeout, ConnectionError
-from web.functions import _TIMEOUT, _JSON_CONTENT_TYPE, _CONTENT_TYPE_HEADER, _HEADERS, _HTTP_ERROR as _HTTP_ERROR_TEXT, _CONNECTION_ERROR, _TEMP_DOWNLOAD_PREFIX, _UNEXISTENT_DIRECTORY_ERROR
+from web.functions import _TIMEOUT, _JSON_CONTENT_TYPE, _CONTENT_TYPE_HEADER, _HEADERS, _HTTP_ERROR as _HTTP_ERROR_TEXT, _CONNECTION_ERROR, _TEMP_DOWNLOAD_PREFIX, _UNEXISTENT_DIRECTORY_ERROR, _NOT_MODIFIED_STATUS_CODE, _IF_NONE_MATCH_HEADER, _IF_MODIFIED_SINCE_HEADER, _MAX_REQUESTS_PER_HOST, _MAX_POOLED_HOSTS, _get_host_semaphore, _get_session, _reset_session
 from core import ExpectedError
-from web import cache
+from web import cache, Expiration
 
 class _MockHttpResponse:
     def __init__(self, content_type: str = _JSON_CONTENT_TYPE):
@@ -14,6 +14,12 @@ class _MockHttpResponse:
         self.content = [ "1", "2", None, "3" ] # None here emulates faulty chunks of data
         self.headers = { _CONTENT_TYPE_HEADER: content_type }
     
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.closed = True
+
     def raise_for_status(self):
         pass
     
@@ -32,7 +38,7 @@ _CUSTOM_ERROR_MESSAGE = "custom error message"
 
 @pytest.fixture(autouse=True)
 def request_get_mock(monkeypatch: MonkeyPatch):
-    return FunctionMock(monkeypatch, requests.get, _MOCK_RESPONSE)
+    return FunctionMock(monkeypatch, requests.Session.get, _MOCK_RESPONSE, target=requests.Session)
 
 @pytest.fixture(autouse=True)
 def cache_try_get_mock(monkeypatch: MonkeyPatch):
@@ -42,6 +48,10 @@ def cache_try_get_mock(monkeypatch: MonkeyPatch):
 def cache_add_mock(monkeypatch: MonkeyPatch):
     return FunctionMock(monkeypatch, cache.add, target=cache)
 
+@pytest.fixture(autouse=True)
+def cache_get_validators_mock(monkeypatch: MonkeyPatch):
+    return FunctionMock(monkeypatch, cache.get_validators, (None, None), target=cache)
+
 def test_get_given_a_url_and_headers_should_get_the_json(request_get_mock: FunctionMock):
     response = web.get(_URL)
 
@@ -56,6 +66,25 @@ def test_get_given_text_content_type_should_return_the_text_instead(request_get_
 
     assert response == text_response.text
 
+@pytest.mark.parametrize("cached_result, expected_deriver_calls", [ (None, 1), ({ "derived" }, 0) ])
+def test_get_derived_should_only_derive_the_data_if_the_result_is_not_cached(
+    monkeypatch: MonkeyPatch, cached_result: set[str] | None, expected_deriver_calls: int):
+    
+    NAME = "name@1"
+    deriver_calls = []
+    def deriver(data):
+        deriver_calls.append(data)
+        return { "derived" }
+    try_get_derived_mock = FunctionMock(monkeypatch, cache.try_get_derived, cached_result, target=cache)
+    add_derived_mock = FunctionMock(monkeypatch, cache.add_derived, target=cache)
+
+    result = web.get_derived(_URL, NAME, deriver)
+
+    assert result == { "derived" }
+    assert try_get_derived_mock.received(_URL, NAME)
+    assert deriver_calls == [ _MOCK_RESPONSE.json_response ] * expected_deriver_calls
+    assert add_derived_mock.get_invocation_count() == expected_deriver_calls
+
 def test_get_given_value_is_cached_should_return_the_cached_value(
     cache_try_get_mock: FunctionMock, request_get_mock: FunctionMock):
     
@@ -77,6 +106,130 @@ def test_get_given_a_formatter_should_apply_it_before_adding_it_to_cache_and_ret
     assert response == FORMATTED_DATA
     assert cache_add_mock.received(FORMATTED_DATA)
 
+def test_get_given_the_server_reports_the_cached_data_was_not_modified_should_renew_it_without_formatting(
+    monkeypatch: MonkeyPatch, request_get_mock: FunctionMock, cache_get_validators_mock: FunctionMock, cache_add_mock: FunctionMock):
+    
+    ETAG = "etag"
+    LAST_MODIFIED = "last modified"
+    not_modified_response = _MockHttpResponse()
+    not_modified_response.status_code = _NOT_MODIFIED_STATUS_CODE
+    request_get_mock.result = not_modified_response
+    cache_get_validators_mock.result = (ETAG, LAST_MODIFIED)
+    cache_renew_mock = FunctionMock(monkeypatch, cache.renew, _MOCK_RESPONSE.json_response, target=cache)
+    formatter_calls = []
+
+    response = web.get(_URL, Expiration.DAILY, formatter=formatter_calls.append)
+
+    assert response == _MOCK_RESPONSE.json_response
+    assert request_get_mock.received(_URL, headers=_HEADERS | { _IF_NONE_MATCH_HEADER: ETAG, _IF_MODIFIED_SINCE_HEADER: LAST_MODIFIED })
+    assert cache_renew_mock.received(_URL, Expiration.DAILY)
+    assert formatter_calls == []
+    assert cache_add_mock.get_invocation_count() == 0
+
+def test_get_given_not_modified_data_cannot_be_loaded_from_the_cache_should_request_it_again_without_validators(
+    monkeypatch: MonkeyPatch, request_get_mock: FunctionMock, cache_get_validators_mock: FunctionMock, cache_add_mock: FunctionMock):
+    
+    not_modified_response = _MockHttpResponse()
+    not_modified_response.status_code = _NOT_MODIFIED_STATUS_CODE
+    request_get_mock.result = (response for response in [ not_modified_response, _MOCK_RESPONSE ])
+    cache_get_validators_mock.result = ("etag", None)
+    _ = FunctionMock(monkeypatch, cache.renew, None, target=cache)
+
+    response = web.get(_URL, Expiration.DAILY)
+
+    assert response == _MOCK_RESPONSE.json_response
+    assert request_get_mock.get_invocation_count() == 2
+    assert request_get_mock.received(_URL, headers=_HEADERS)
+    assert cache_add_mock.received(_URL, Expiration.DAILY, _MOCK_RESPONSE.json_response)
+
+def test_prefetch_should_only_request_urls_which_are_not_cached_and_cache_them_formatted(
+    monkeypatch: MonkeyPatch, request_get_mock: FunctionMock, cache_add_mock: FunctionMock):
+    
+    CACHED_URL = "cached url"
+    FORMATTED_DATA = "formatted data"
+    _ = FunctionMock(monkeypatch, cache.contains, lambda url: url == CACHED_URL, target=cache)
+
+    web.prefetch({ _URL: lambda _: FORMATTED_DATA, CACHED_URL: lambda _: FORMATTED_DATA }, Expiration.DAILY)
+
+    assert request_get_mock.get_invocation_count() == 1
+    assert request_get_mock.received(_URL)
+    assert cache_add_mock.get_invocation_count() == 1
+    assert cache_add_mock.received(_URL, Expiration.DAILY, FORMATTED_DATA)
+
+def test_prefetch_given_every_url_is_cached_should_not_request_them(monkeypatch: MonkeyPatch, request_get_mock: FunctionMock):
+    _ = FunctionMock(monkeypatch, cache.contains, True, target=cache)
+
+    web.prefetch({ _URL: lambda data: data })
+
+    assert request_get_mock.get_invocation_count() == 0
+
+def test_get_session_should_reuse_a_session_pooling_as_many_connections_per_host_as_requests_allowed(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(web.functions, "_session", None)
+
+    session = _get_session()
+
+    adapter = session.get_adapter("https://www.site.com/")
+    assert _get_session() is session
+    assert adapter._pool_connections == _MAX_POOLED_HOSTS
+    assert adapter._pool_maxsize == _MAX_REQUESTS_PER_HOST
+
+def test_reset_session_should_discard_the_session_and_host_semaphores(monkeypatch: MonkeyPatch):
+    for name in [ "_session", "_session_lock", "_host_semaphores" ]:
+        monkeypatch.setattr(web.functions, name, getattr(web.functions, name))
+    session = _get_session()
+    semaphore = _get_host_semaphore(_URL)
+
+    _reset_session()
+
+    assert _get_session() is not session
+    assert _get_host_semaphore(_URL) is not semaphore
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="processes can only be forked on POSIX systems")
+def test_fork_should_reset_the_session_in_the_child_process_only():
+    session = _get_session()
+    (read_descriptor, write_descriptor) = os.pipe()
+
+    pid = os.fork()
+    if pid == 0: # the child process reports whether it was reset and exits right away
+        os.write(write_descriptor, b"1" if web.functions._session is None and web.functions._host_semaphores == {} else b"0")
+        os._exit(0)
+    os.close(write_descriptor)
+    with os.fdopen(read_descriptor, "rb") as file:
+        was_reset = file.read() == b"1"
+    _ = os.waitpid(pid, 0)
+
+    assert was_reset
+    assert _get_session() is session
+
+def test_get_host_semaphore_should_be_shared_by_urls_in_the_same_host_only():
+    semaphore = _get_host_semaphore("https://www.site.com/some/path")
+
+    assert _get_host_semaphore("https://www.site.com/another/path?query=1") is semaphore
+    assert _get_host_semaphore("https://www.another-site.com/some/path") is not semaphore
+
+def test_get_given_concurrent_requests_to_the_same_host_should_limit_how_many_are_in_flight(request_get_mock: FunctionMock):
+    in_flight = []
+    max_in_flight = []
+    lock = threading.Lock()
+    def get(url: str, **_):
+        with lock:
+            in_flight.append(url)
+            max_in_flight.append(len(in_flight))
+        time.sleep(0.05)
+        with lock:
+            in_flight.remove(url)
+        return _MOCK_RESPONSE
+    request_get_mock.result = get
+    threads = [ threading.Thread(target=web.get, args=[ f"https://www.site.com/{index}" ]) for index in range(_MAX_REQUESTS_PER_HOST * 3) ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert request_get_mock.get_invocation_count() == _MAX_REQUESTS_PER_HOST * 3
+    assert max(max_in_flight) == _MAX_REQUESTS_PER_HOST
+
 def test_get_given_an_http_error_should_raise(request_get_mock: FunctionMock):
     request_get_mock.result = _HTTP_ERROR
     
@@ -126,6 +279,32 @@ def test_download_should_download_the_resource_in_the_url_and_replace_the_previo
     assert os_remove_mock.received(FILEPATH)
     assert os_rename_mock.received(FILEPATH, FILEPATH)
 
+def test_download_should_hold_the_host_semaphore_until_the_body_is_read_and_closed(
+    monkeypatch: MonkeyPatch, request_get_mock: FunctionMock):
+    
+    URL = "https://www.download-site.com/file"
+    monkeypatch.setattr(web.functions, "_MAX_REQUESTS_PER_HOST", 1)
+    monkeypatch.setattr(web.functions, "_host_semaphores", {})
+    semaphore = _get_host_semaphore(URL)
+    acquired_while_reading: list[bool] = []
+    class _StreamedResponse(_MockHttpResponse):
+        def iter_content(self, chunk_size: int):
+            acquired_while_reading.append(semaphore.acquire(blocking=False))
+            return self.content
+    response = _StreamedResponse()
+    request_get_mock.result = response
+    for function in [ os.path.isdir, os.path.isfile ]:
+        _ = FunctionMock(monkeypatch, function, True, target=os.path)
+    for function in [ os.remove, os.rename ]:
+        _ = FunctionMock(monkeypatch, function, target=os)
+    _ = OpenMock(monkeypatch)
+
+    web.download(URL, _DIRECTORY, _FILENAME)
+
+    assert acquired_while_reading == [ False ]
+    assert response.closed
+    assert semaphore.acquire(blocking=False)
+
 def test_download_given_directory_does_not_exist_should_raise(monkeypatch: MonkeyPatch):
     _ = FunctionMock(monkeypatch, os.path.isdir, False)
 
@@ -0,0 +1,104 @@
+import pytest, json, threading, utils, web
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pytest import MonkeyPatch
+from web import cache, Expiration
+
+_ETAG = '"version 1"'
+_LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+_DATA = { "some": "data" }
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Stands in for a server which supports conditional requests, by recording the ones it receives."""
+    protocol_version = "HTTP/1.1" # keeps connections alive
+    received_headers: list[dict[str, str]] = []
+    client_ports: list[int] = []
+    etag: str | None = _ETAG
+    last_modified: str | None = _LAST_MODIFIED
+
+    def do_GET(self):
+        _RequestHandler.received_headers.append(dict(self.headers))
+        _RequestHandler.client_ports.append(self.client_address[1])
+        if self._is_unmodified():
+            self.send_response(304)
+            self.end_headers()
+            return
+        
+        body = json.dumps(_DATA).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.etag != None:
+            self.send_header("ETag", self.etag)
+        if self.last_modified != None:
+            self.send_header("Last-Modified", self.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _is_unmodified(self):
+        if self.etag != None and self.headers.get("If-None-Match") == self.etag:
+            return True
+        return self.last_modified != None and self.headers.get("If-Modified-Since") == self.last_modified
+
+    def log_message(self, *_):
+        pass
+
+@pytest.fixture(autouse=True)
+def url(monkeypatch: MonkeyPatch, tmp_path):
+    monkeypatch.setattr(utils, "get_execution_dir", lambda *subdirs: str(tmp_path.joinpath(*subdirs)))
+    monkeypatch.setattr(cache.functions, "_file_cache", None)
+    monkeypatch.setattr(cache.functions, "_memory_cache", None)
+    monkeypatch.setattr(_RequestHandler, "received_headers", [])
+    monkeypatch.setattr(_RequestHandler, "client_ports", [])
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/data.json"
+    server.shutdown()
+    server.server_close()
+
+@pytest.mark.parametrize("etag, last_modified", [ (_ETAG, None), (None, _LAST_MODIFIED), (_ETAG, _LAST_MODIFIED) ])
+def test_get_given_stale_data_the_server_did_not_modify_should_renew_it_without_formatting_it_again(
+    monkeypatch: MonkeyPatch, url: str, etag: str | None, last_modified: str | None):
+    
+    monkeypatch.setattr(_RequestHandler, "etag", etag)
+    monkeypatch.setattr(_RequestHandler, "last_modified", last_modified)
+    formatted_data = []
+    formatter = lambda data: formatted_data.append(data) or data
+    _ = web.get(url, Expiration.DAILY, formatter)
+    version = cache.get_version(url)
+    _make_stale(url)
+
+    data = web.get(url, Expiration.DAILY, formatter)
+
+    assert data == _DATA
+    assert formatted_data == [ _DATA ]
+    assert cache.get_version(url) == version
+    assert _RequestHandler.received_headers[-1].get("If-None-Match") == etag
+    assert _RequestHandler.received_headers[-1].get("If-Modified-Since") == last_modified
+
+def test_get_given_stale_data_without_validators_should_download_it_again(monkeypatch: MonkeyPatch, url: str):
+    monkeypatch.setattr(_RequestHandler, "etag", None)
+    monkeypatch.setattr(_RequestHandler, "last_modified", None)
+    _ = web.get(url, Expiration.DAILY)
+    version = cache.get_version(url)
+    _make_stale(url)
+
+    data = web.get(url, Expiration.DAILY)
+
+    assert data == _DATA
+    assert cache.get_version(url) != version
+    assert "If-None-Match" not in _RequestHandler.received_headers[-1]
+
+def test_get_given_several_urls_in_the_same_host_should_reuse_the_connection(url: str):
+    _ = web.get(url)
+    _ = web.get(url + "?another=query")
+
+    assert len(_RequestHandler.client_ports) == 2
+    assert len(set(_RequestHandler.client_ports)) == 1
+
+def _make_stale(url: str):
+    # the data is dropped from memory too, as if it was requested in a later run
+    cache.functions._file_cache._entries[url].expiration_date = datetime.min
+    cache.functions._memory_cache.clear()
@@ -0,0 +1,198 @@
+# Times parsing, every handler and saving on synthetic filters of 1k, 10k and 100k lines, with web requests mocked.
+# Everything the handlers cache on disk is written to a temporary directory, which is deleted afterwards.
+# Optional arguments: the path where the results are saved as JSON (benchmark.json by default),
+# the path to the results of a previous run to compare against, and the maximum regression allowed in percent (20 by default).
+# If a baseline is passed and any step got slower than allowed, the regressions are listed and the script exits with an error code.
+
+import sys
+sys.path.append('./src')
+
+import os, json, time, tempfile, web, utils
+from core import Filter, Block
+from handlers import HANDLERS
+
+_LINE_COUNTS = [ 1000, 10000, 100000 ]
+_REPETITIONS = 3
+_HANDLER_OPTIONS = [ ("import", []), ("alias", []), ("multi", []), ("econ", []), ("game", []) ]
+_PARSE_STEP = "parse"
+_SAVE_STEP = "save"
+
+_CURRENCY_COUNT = 200
+_LEAGUE_COUNT = 16
+_BASE_TYPES = [ f'"Base Type {index}"' for index in range(60) ]
+_GEAR_CLASSES = { "BodyArmour": "Body Armours", "Gloves": "Gloves", "Boots": "Boots", "Helmet": "Helmets" }
+_GEAR_BASE_COUNT = 1000
+
+# rules are only read at the start of a line's comment, so they're never preceded by other comments
+_ALIASES = """#.alias $currency = "Chaos Orb" "Divine Orb" "Exalted Orb", $sound = PlayAlertSound 6 300
+
+"""
+_BLOCK = """Show #.econ cur {1} {2}
+    Class == "Stackable Currency" "Currency"
+    BaseType == $currency {3}
+    #.import styles -> Tier{0}
+    AreaLevel >= {4} #.multi
+    AreaLevel < {4} #.multi
+    SetFontSize 40
+    $sound
+    MinimapIcon 0 Red Star
+
+"""
+_GAME_BLOCK = """Show #.game base
+    Class == "Body Armours" "Gloves" "Boots"
+    DropLevel >= {0}
+    #.import styles -> Tier{1}
+
+"""
+_STYLES = """Show #.name Tier{0}
+    SetTextColor 255 {1} 0 255 #.import colors -> Color{0}
+    SetBackgroundColor 0 0 0 240
+    PlayEffect Red
+
+"""
+_COLORS = """Show #.name Color{0}
+    SetBorderColor {1} 0 0 255
+
+"""
+_TIER_COUNT = 5
+
+_mocked_data = {}
+
+def main(args: list[str]):
+    results_filepath = args[0] if len(args) > 0 else "benchmark.json"
+    baseline_filepath = args[1] if len(args) > 1 else None
+    max_regression = float(args[2]) if len(args) > 2 else 20.0
+
+    web.get = _get_mocked_data
+    web.get_derived = _get_mocked_derived_data
+    web.prefetch = _prefetch_mocked_data
+    with tempfile.TemporaryDirectory() as directory:
+        utils.get_execution_dir = lambda *subdirs: os.path.join(directory, *subdirs)
+        results = { str(line_count): _run(directory, line_count) for line_count in _LINE_COUNTS }
+
+    with open(results_filepath, "w") as file:
+        json.dump(results, file, indent=4)
+    print(f"Results saved to '{results_filepath}'.")
+
+    if baseline_filepath is not None:
+        with open(baseline_filepath, "r") as file:
+            baseline = json.load(file)
+        _compare(results, baseline, max_regression)
+
+def _run(directory: str, line_count: int):
+    filepath = _create_filters(directory, line_count)
+    print(f"{line_count} lines:")
+    results = { _PARSE_STEP: _time(lambda: Filter.load(filepath)) }
+
+    filter = Filter.load(filepath)
+    for handler_name, options in _HANDLER_OPTIONS:
+        results[handler_name] = _time(lambda: _apply_handler(filter, handler_name, options))
+        filter = _apply_handler(filter, handler_name, options)
+
+    output_filepath = os.path.join(directory, "output.filter")
+    results[_SAVE_STEP] = _time(lambda: filter.save(output_filepath))
+
+    for step, seconds in results.items():
+        print(f"\t{step:<8} {seconds * 1000:10.1f} ms")
+    return results
+
+def _apply_handler(filter: Filter, handler_name: str, options: list[str]):
+    # handlers modify the lines they receive, so each repetition works on its own copy
+    filter = filter.copy()
+    handler = HANDLERS[handler_name]
+    context = handler.initialize_context(filter, options)
+    lines = ( line for block in filter.blocks for line in handler.handle(block, context) )
+    return Filter(filter.filepath, list(Block.stream(lines)))
+
+def _time(function):
+    times = []
+    for _ in range(_REPETITIONS):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def _compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], max_regression: float):
+    regressions = [ (line_count, step, baseline[line_count][step], seconds)
+        for line_count, steps in results.items() if line_count in baseline
+        for step, seconds in steps.items() if step in baseline[line_count]
+        if seconds > baseline[line_count][step] * (1 + max_regression / 100) ]
+
+    if len(regressions) == 0:
+        print(f"No step regressed more than {max_regression:.0f}% against the baseline.")
+        return
+
+    print(f"Steps that regressed more than {max_regression:.0f}% against the baseline:")
+    for line_count, step, baseline_seconds, seconds in regressions:
+        change = (seconds / baseline_seconds - 1) * 100
+        print(f"\t{line_count} lines, {step}: {baseline_seconds * 1000:.1f} ms -> {seconds * 1000:.1f} ms (+{change:.0f}%)")
+    sys.exit(1)
+
+def _create_filters(directory: str, line_count: int):
+    # every block imports a style, which imports a color from yet another file
+    with open(os.path.join(directory, "styles.filter"), "w") as file:
+        file.write("".join(_STYLES.format(tier, tier * 50) for tier in range(1, _TIER_COUNT + 1)))
+    with open(os.path.join(directory, "colors.filter"), "w") as file:
+        file.write("".join(_COLORS.format(tier, tier * 50) for tier in range(1, _TIER_COUNT + 1)))
+
+    filepath = os.path.join(directory, f"benchmark_{line_count}.filter")
+    with open(filepath, "w") as file:
+        file.write(_create_filter_text(line_count))
+    return filepath
+
+def _create_filter_text(line_count: int):
+    # currency blocks handled by .econ alternate with gear blocks handled by .game
+    block_line_count = _BLOCK.count("\n") + _GAME_BLOCK.count("\n")
+    blocks = [ _ALIASES ]
+    for index in range(line_count // block_line_count):
+        base_types = " ".join(_BASE_TYPES[:index % len(_BASE_TYPES) + 1])
+        lower = index % 20
+        tier = index % _TIER_COUNT + 1
+        blocks.append(_BLOCK.format(tier, lower, lower + 50, base_types, index % 84))
+        blocks.append(_GAME_BLOCK.format(index % 84 + 1, tier))
+    return "".join(blocks)
+
+def _get_mocked_data(url: str, expiration = None, formatter = lambda data: data, custom_http_errors = None):
+    # formatted once per URL, just like the web cache does
+    if url not in _mocked_data:
+        _mocked_data[url] = formatter(_create_raw_data(url))
+    return _mocked_data[url]
+
+def _get_mocked_derived_data(url: str, name: str, deriver, expiration = None, formatter = lambda data: data, custom_http_errors = None):
+    derived_url = f"{url}#{name}"
+    if derived_url not in _mocked_data:
+        _mocked_data[derived_url] = deriver(_get_mocked_data(url, expiration, formatter))
+    return _mocked_data[derived_url]
+
+def _prefetch_mocked_data(formatters_by_url: dict, expiration = None, custom_http_errors = None):
+    for url, formatter in formatters_by_url.items():
+        _ = _get_mocked_data(url, expiration, formatter)
+
+def _create_raw_data(url: str):
+    if "pathofexile.com" in url:
+        return [ { "id": f"League {index}" } for index in range(_LEAGUE_COUNT) ]
+    if "item_classes" in url:
+        return { class_id: { "name": name } for class_id, name in _GEAR_CLASSES.items() }
+    if "base_items" in url:
+        return _create_base_items_data()
+    return _create_exchange_data()
+
+def _create_base_items_data():
+    # shaped after RePoE's base items, all of them released gear
+    class_ids = list(_GEAR_CLASSES)
+    return { f"Metadata/Items/Armours/Gear{index}": {
+            "name": f"Gear Base {index}",
+            "item_class": class_ids[index % len(class_ids)],
+            "drop_level": index % 84 + 1,
+            "release_state": "released",
+            "domain": "item",
+            "tags": [ "armour", "default" ] }
+        for index in range(_GEAR_BASE_COUNT) }
+
+def _create_exchange_data():
+    return {
+        "lines": [ { "id": str(index), "primaryValue": float(index % 100) } for index in range(_CURRENCY_COUNT) ],
+        "items": [ { "id": str(index), "name": f"Currency {index}" } for index in range(_CURRENCY_COUNT) ] }
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
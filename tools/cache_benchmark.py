@@ -0,0 +1,41 @@
+# Compares the time it takes to save and load web cache items in every file format available.
+# Optional arguments: the amount of records in the generated data (100000 by default) and the amount of repetitions (5 by default).
+# The records are shaped after RePoE's mods, which are the largest items cached.
+
+import sys
+sys.path.append('./src')
+
+import os, timeit, tempfile
+from web.cache import file_format
+from web.cache.file_format import FileFormat
+
+def main(args: list[str]):
+    record_count = int(args[0]) if len(args) > 0 else 100000
+    repetitions = int(args[1]) if len(args) > 1 else 5
+    data = _create_data(record_count)
+
+    print(f"{record_count} records, {repetitions} repetitions")
+    with tempfile.TemporaryDirectory() as directory:
+        for format in [ FileFormat.JSON, FileFormat.MARSHAL ]:
+            filepath = os.path.join(directory, f"data.{format.value}")
+            save_time = timeit.timeit(lambda: file_format.save(filepath, data, format), number=repetitions)
+            load_time = timeit.timeit(lambda: file_format.load(filepath, format), number=repetitions)
+            size = os.path.getsize(filepath)
+            print(f"{format.name.lower():<8} save: {save_time / repetitions * 1000:8.1f} ms   "
+                f"load: {load_time / repetitions * 1000:8.1f} ms   size: {size / 1024 / 1024:6.1f} MiB")
+
+def _create_data(record_count: int):
+    return { f"Mod{index}": {
+            "domain": "item",
+            "generation_type": "prefix" if index % 2 == 0 else "suffix",
+            "groups": [ f"Group{index % 500}" ],
+            "is_essence_only": False,
+            "name": f"of the Mod {index}",
+            "required_level": index % 86,
+            "spawn_weights": [ { "tag": f"tag_{tag}", "weight": tag * 100 } for tag in range(index % 6) ],
+            "stats": [ { "id": f"stat_{index}_{stat}", "max": stat * 10, "min": stat } for stat in range(2) ],
+            "type": f"Type{index % 300}" }
+        for index in range(record_count) }
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
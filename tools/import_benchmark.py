@@ -0,0 +1,35 @@
+# Measures how long it takes to import the modules needed to start the CLI, which is paid on every run.
+# Optional arguments: the amount of repetitions (10 by default) and a maximum median time in milliseconds.
+# If the maximum is passed and the median time exceeds it, the slowest imports are listed and the script exits with an error code.
+
+import sys, re, statistics, subprocess
+
+_MODULE = "main"
+_SRC_DIR = "./src"
+_IMPORT_TIME_REGEX = r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)"
+_SLOWEST_IMPORT_COUNT = 10
+
+def main(args: list[str]):
+    repetitions = int(args[0]) if len(args) > 0 else 10
+    max_milliseconds = float(args[1]) if len(args) > 1 else None
+
+    runs = [ _get_import_times() for _ in range(repetitions) ]
+    median = statistics.median(times[_MODULE] for times in runs) / 1000
+    print(f"'import {_MODULE}' median over {repetitions} runs: {median:.1f} ms")
+
+    if max_milliseconds is not None and median > max_milliseconds:
+        print(f"Exceeded the maximum of {max_milliseconds:.1f} ms. Slowest imports in the last run:")
+        slowest_imports = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+        for name, microseconds in slowest_imports[:_SLOWEST_IMPORT_COUNT]:
+            print(f"\t{microseconds / 1000:8.1f} ms  {name}")
+        sys.exit(1)
+
+def _get_import_times():
+    # maps every module imported to its cumulative import time in microseconds, as reported by -X importtime
+    result = subprocess.run([ sys.executable, "-X", "importtime", "-c", f"import {_MODULE}" ],
+        cwd=_SRC_DIR, capture_output=True, text=True, check=True)
+    return { match.group(4): int(match.group(2))
+        for match in re.finditer(_IMPORT_TIME_REGEX, result.stderr) }
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
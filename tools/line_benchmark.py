@@ -0,0 +1,34 @@
+# Compares the time it takes to parse filter lines with the Line tokenizer against the regular expressions it replaced.
+# Optional arguments: the amount of values in the generated BaseType line (10000 by default) and the amount of repetitions (20 by default).
+
+import sys
+sys.path.append('./src')
+
+import re, timeit
+from core import Line, Operand, Operator
+
+_LINE_REGEX = "^(\\s*)([^\\s#]*)\\s*([<|>|=|!]=?\\d*)?\\s*([^#]+)?(#.*)?$"
+_SINGLE_VALUE_REGEX = '"[^"]*"|-?\\w+'
+
+def main(args: list[str]):
+    value_count = int(args[0]) if len(args) > 0 else 10000
+    repetitions = int(args[1]) if len(args) > 1 else 20
+
+    values = " ".join(f'"Base Type {index}"' for index in range(value_count))
+    text = f"    {Operand.BASE_TYPE} {Operator.EQUALS} {values} # comment"
+
+    regex_time = timeit.timeit(lambda: _parse_with_regex(text), number=repetitions)
+    line = Line("", 1)
+    tokenizer_time = timeit.timeit(lambda: line._set_parts(text), number=repetitions)
+
+    print(f"{value_count} values, {repetitions} repetitions")
+    print(f"regex:     {regex_time / repetitions * 1000:.3f} ms per line")
+    print(f"tokenizer: {tokenizer_time / repetitions * 1000:.3f} ms per line")
+    print(f"speedup:   {regex_time / tokenizer_time:.2f}x")
+
+def _parse_with_regex(text: str):
+    parts = re.search(_LINE_REGEX, text).groups()
+    return parts[:3] + (re.findall(_SINGLE_VALUE_REGEX, parts[3] or ""), parts[4])
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,55 @@
+# Measures the memory used by a loaded filter, by loading a synthetic filter file and tracing the allocations made.
+# Optional arguments: the amount of lines in the generated filter (50000 by default).
+
+import sys
+sys.path.append('./src')
+
+import os, tempfile, tracemalloc
+from core import Filter
+
+_BASE_TYPES = [ "Chaos Orb", "Exalted Orb", "Divine Orb", "Orb of Alchemy", "Vaal Regalia", "Sadist Garb", "Hubris Circlet" ]
+_BLOCK = """Show # $type->currency $tier->t{0} #.strict {1}
+    Class == "Currency" "Stackable Currency"
+    BaseType == {2}
+    AreaLevel >= {3}
+    SetFontSize 45
+    SetTextColor 255 0 0 255
+    SetBorderColor 255 0 0 255
+    PlayAlertSound 6 300
+    PlayEffect Red
+    MinimapIcon 0 Red Star
+
+# ----------------------------------------------------------------------------
+"""
+
+def main(args: list[str]):
+    line_count = int(args[0]) if len(args) > 0 else 50000
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "benchmark.filter")
+        with open(filepath, "w") as file:
+            file.write(_create_filter_text(line_count))
+
+        tracemalloc.start()
+        filter = Filter.load(filepath)
+        for block in filter.blocks:
+            for line in block.lines:
+                _ = line.values, line.rules
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    line_count = sum(len(block.lines) for block in filter.blocks)
+    print(f"{line_count} lines in {len(filter.blocks)} blocks")
+    print(f"current: {current / 1024 / 1024:.2f} MiB ({current / line_count:.0f} bytes per line)")
+    print(f"peak:    {peak / 1024 / 1024:.2f} MiB")
+
+def _create_filter_text(line_count: int):
+    block_line_count = _BLOCK.count("\n")
+    blocks = []
+    for index in range(line_count // block_line_count):
+        base_types = " ".join(f'"{base_type}"' for base_type in _BASE_TYPES[:index % len(_BASE_TYPES) + 1])
+        blocks.append(_BLOCK.format(index % 5 + 1, index % 6, base_types, index % 84))
+    return "".join(blocks)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])